@@ -0,0 +1,174 @@
+"""car_service GET /cars/ uç noktasını sync (threadpool) ve async istek yolunda karşılaştırır.
+
+Async: car_service/main.py'deki gerçek uygulama (lifespan dahil). Sync: dönüşümden önceki
+`def get_filtered_cars` (ES araması + PostgreSQL IN sorgusu, senkron istemciler) bu betikte
+aynen yeniden kurulur; yalnızca ES sayfa boyutu async yolla aynı (`--limit`) tutulur. FastAPI
+sync uç noktaları anyio'nun 40 iş parçacıklı havuzunda çalıştırır. İki uygulama da httpx
+ASGITransport ile süreç içinde, `--concurrency` eşzamanlı istemciyle sürülür.
+
+Elasticsearch yerine benchmarks/standins.py (ağ turu `--es-latency-ms` ile taklit edilir),
+PostgreSQL yerine geçici bir SQLite dosyası kullanılır. Redis sorgu önbelleği iki yolda da
+kapalıdır; her istek arama yolunu çalıştırır. Async yol iki biçimde ölçülür: sync yolla aynı
+işi yapan ES + veritabanı okuması (indeks bayat sayılır) ve varsayılan `_source` yanıtı.
+Arama yedeği her sorguda tüm belgeleri Python'da taradığı için CPU harcar; tek çekirdekte
+sonuçlar ağ turundan çok bu maliyetle sınırlanır (`--es-latency-ms` büyüdükçe fark açılır).
+
+    python benchmarks/bench_async_vs_sync.py --requests 2000 --concurrency 200 --es-latency-ms 8
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+CARS_JSON = os.path.join(ROOT, "car_service", "cars.json")
+DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_async_vs_sync.db")
+os.environ["DB_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+sys.path.insert(0, os.path.join(ROOT, "car_service"))
+sys.path.append(ROOT)  # shared/
+
+import fakeredis.aioredis  # noqa: E402
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI, Query  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+from typing import List, Optional  # noqa: E402
+
+from common import print_table, summarize  # noqa: E402
+from loadtest import CAR_COLUMNS  # noqa: E402
+from standins import StandInElasticsearch, StandInSyncElasticsearch  # noqa: E402
+
+import main  # noqa: E402
+import models  # noqa: E402
+from shared import metrics  # noqa: E402
+
+
+def legacy_app(es_client, limit, concurrency):
+    """Dönüşüm öncesi sync liste uç noktası (Redis önbelleği kapalı)."""
+    # Oturum (ve bağlantısı) `get_db` temizliğinde bırakılır; temizlik de threadpool'da sıra
+    # bekler. Eşzamanlı istek sayısı havuzu (varsayılan 5 + 10) aşınca tüm iş parçacıkları
+    # bağlantı bekler, bağlantıları bırakacak temizlikler çalışamaz ve istekler 30 sn sonra
+    # zaman aşımına düşer. Ölçüm yapılabilsin diye havuz eşzamanlılık kadar büyütülür.
+    engine = create_engine(f"sqlite:///{DB_PATH}", connect_args={"check_same_thread": False},
+                           pool_size=concurrency, max_overflow=0)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    app = FastAPI()
+
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @app.get("/cars/", response_model=List[main.Car])
+    def get_filtered_cars(
+        db: Session = Depends(get_db),
+        car_name: Optional[str] = Query(None),
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+    ):
+        query_body = main.build_search_query(car_name, min_price, max_price)
+        res = es_client.search(index="cars", body=query_body, size=limit)
+        car_ids = [hit["_source"]["id"] for hit in res["hits"]["hits"]]
+
+        # PostgreSQL'den orijinal verileri çek, Elasticsearch'teki sıralamayı koru
+        cars = db.query(models.Car).filter(models.Car.id.in_(car_ids)).all()
+        car_dict = {car.id: car for car in cars}
+        return [car_dict[id] for id in car_ids if id in car_dict]
+
+    return app, engine
+
+
+def query_mix(cars, count, seed):
+    rng = random.Random(seed)
+    companies = sorted({car["company"].lower() for car in cars})
+    queries = []
+    for _ in range(count):
+        params = {"car_name": rng.choice(companies)}
+        if rng.random() < 0.5:
+            low = rng.randrange(0, 1000, 50)
+            params.update(min_price=low, max_price=low + rng.randrange(100, 2000, 100))
+        queries.append(params)
+    return queries
+
+
+async def drive(app, queries, concurrency, limit):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://car", timeout=None) as client:
+        async def send(params):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get("/cars/", params={**params, "limit": limit})
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, response.text
+
+        await send(queries[0])  # ısınma
+        latencies.clear()
+        started = time.perf_counter()
+        await asyncio.gather(*(send(params) for params in queries))
+        return summarize(latencies, time.perf_counter() - started)
+
+
+async def run(args):
+    with open(CARS_JSON, encoding="utf-8") as f:
+        cars = json.load(f)
+    documents = [{name: car.get(name) for name in main.LIST_SOURCE_FIELDS} for car in cars]
+    search = StandInElasticsearch(documents, args.es_latency_ms)
+    server = fakeredis.FakeServer()
+
+    class BenchRedis(fakeredis.aioredis.FakeRedis):
+        def __init__(self, *a, **kwargs):
+            super().__init__(server=server, decode_responses=kwargs.get("decode_responses", False))
+
+    main.AsyncElasticsearch = lambda *a, **kwargs: search
+    main.TimedRedis = metrics.timed_redis(BenchRedis, "car_service")
+    queries = query_mix(cars, args.requests, args.seed)
+
+    rows = []
+    async with main.app.router.lifespan_context(main.app):
+        async with main.SessionLocal() as db:
+            await db.execute(models.Car.__table__.delete())
+            db.add_all([models.Car(**{name: car.get(name) for name in CAR_COLUMNS}) for car in cars])
+            await db.commit()
+        # Sorgu önbelleği kapalı: her istek arama yolunu çalıştırır
+        main.redis_client = None
+
+        app, engine = legacy_app(
+            StandInSyncElasticsearch(documents, args.es_latency_ms), args.limit, args.concurrency
+        )
+        rows.append({"name": "sync def (ES + DB)", **await drive(app, queries, args.concurrency, args.limit)})
+        engine.dispose()
+
+        fresh = main.index_is_fresh
+
+        async def stale():
+            return False
+
+        main.index_is_fresh = stale
+        rows.append({"name": "async def (ES + DB)", **await drive(main.app, queries, args.concurrency, args.limit)})
+        main.index_is_fresh = fresh
+        rows.append({"name": "async def (_source)", **await drive(main.app, queries, args.concurrency, args.limit)})
+
+    print_table(f"GET /cars/ — {args.concurrency} eşzamanlı istemci, ES ağ turu {args.es_latency_ms} ms", rows)
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--es-latency-ms", type=float, default=8.0)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,154 @@
+"""Tarih aralığında boş araç aramasını sentetik bir rezervasyon geçmişiyle ölçer.
+
+Önce: aralıkla kesişen rezervasyonlar taranıp dolu araç kümesi kurulur (bugün
+istemcinin araç araç yaptığı kontrolün sunucu tarafı karşılığı). Sonra: günlük
+doluluk bitmap'leri OR'lanır ve ES'ten gelen aday araçlar bit testiyle elenir.
+Varsayılan olarak Redis BITOP yerine süreç içi bir OR kullanılır; gerçek Redis'e
+karşı ölçmek için `--redis-url` verin (avail:booked:* anahtarları yazılır).
+
+    python benchmarks/bench_availability_search.py --cars 100000 --days 365
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from common import print_table, summarize
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "car_service"))
+
+import availability  # noqa: E402
+
+FIRST_DAY = date(2025, 1, 1)
+
+
+def synthetic_bookings(cars, days, per_car):
+    """Her araç için çakışmayan, 1-10 günlük rastgele rezervasyonlar."""
+    for car_id in range(1, cars + 1):
+        day = random.randrange(10)
+        for _ in range(per_car):
+            day += random.randint(0, days // per_car)
+            length = random.randint(1, 10)
+            if day + length > days:
+                break
+            yield car_id, FIRST_DAY + timedelta(days=day), FIRST_DAY + timedelta(days=day + length)
+            day += length
+
+
+def build_bitmaps(bookings, cars, days):
+    size = (cars >> 3) + 1
+    bitmaps = {FIRST_DAY + timedelta(days=offset): bytearray(size) for offset in range(days)}
+    for car_id, start, end in bookings:
+        for day in availability.days_in(start, end):
+            bitmaps[day][car_id >> 3] |= 0x80 >> (car_id & 7)
+    return {day: bytes(bitmap) for day, bitmap in bitmaps.items()}
+
+
+def local_booked_bitmap(bitmaps, start, end):
+    """Redis BITOP OR'un süreç içi karşılığı."""
+    days = list(availability.days_in(start, end))
+    size = len(bitmaps[days[0]])
+    combined = 0
+    for day in days:
+        combined |= int.from_bytes(bitmaps[day], "big")
+    return combined.to_bytes(size, "big")
+
+
+def scan_free(bookings, candidates, start, end):
+    booked = {car_id for car_id, booking_start, booking_end in bookings
+              if booking_start < end and start < booking_end}
+    return [car_id for car_id in candidates if car_id not in booked]
+
+
+def bitmap_free(bitmap, candidates, limit):
+    free = []
+    for car_id in candidates:
+        if not availability.is_booked(bitmap, car_id):
+            free.append(car_id)
+            if len(free) == limit:
+                break
+    return free
+
+
+def random_range(days):
+    length = random.choice([1, 3, 7, 14, 30, 365])
+    length = min(length, days)
+    start = FIRST_DAY + timedelta(days=random.randrange(days - length + 1))
+    return start, start + timedelta(days=length)
+
+
+async def load_redis(redis_client, bitmaps):
+    pipe = redis_client.pipeline(transaction=False)
+    for day, bitmap in bitmaps.items():
+        pipe.set(availability.day_key(day), bitmap, ex=3600)
+    await pipe.execute()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cars", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--bookings-per-car", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=100, help="sayfa boyutu")
+    parser.add_argument("--candidates", type=float, default=0.3, help="ES filtrelerinden geçen araç oranı")
+    parser.add_argument("--redis-url", help="süreç içi OR yerine gerçek Redis BITOP")
+    args = parser.parse_args()
+
+    random.seed(7)
+    bookings = list(synthetic_bookings(args.cars, args.days, args.bookings_per_car))
+    bitmaps = build_bitmaps(bookings, args.cars, args.days)
+    candidates = sorted(random.sample(range(1, args.cars + 1), int(args.cars * args.candidates)))
+    ranges = [random_range(args.days) for _ in range(args.queries)]
+    print(f"{args.cars} araç, {args.days} gün, {len(bookings)} rezervasyon, {len(candidates)} aday araç")
+
+    rows = []
+    latencies = []
+    started = time.perf_counter()
+    for start, end in ranges[: max(1, args.queries // 10)]:
+        query_started = time.perf_counter()
+        scan_free(bookings, candidates, start, end)[: args.limit]
+        latencies.append(time.perf_counter() - query_started)
+    rows.append({"name": "rezervasyon taraması", **summarize(latencies, time.perf_counter() - started)})
+
+    if args.redis_url:
+        import redis.asyncio as aioredis
+
+        async def run_redis():
+            redis_client = aioredis.from_url(args.redis_url)
+            await load_redis(redis_client, bitmaps)
+            results = []
+            for start, end in ranges:
+                query_started = time.perf_counter()
+                bitmap = await availability.booked_bitmap(redis_client, start, end)
+                bitmap_free(bitmap, candidates, args.limit)
+                results.append(time.perf_counter() - query_started)
+            await redis_client.aclose()
+            return results
+
+        started = time.perf_counter()
+        latencies = asyncio.run(run_redis())
+        rows.append({"name": "Redis BITOP + bit testi", **summarize(latencies, time.perf_counter() - started)})
+    else:
+        latencies = []
+        started = time.perf_counter()
+        for start, end in ranges:
+            query_started = time.perf_counter()
+            bitmap = local_booked_bitmap(bitmaps, start, end)
+            bitmap_free(bitmap, candidates, args.limit)
+            latencies.append(time.perf_counter() - query_started)
+        rows.append({"name": "bitmap OR + bit testi", **summarize(latencies, time.perf_counter() - started)})
+
+    # Doğruluk: iki yöntem aynı boş araçları bulmalı
+    start, end = ranges[0]
+    expected = scan_free(bookings, candidates, start, end)[: args.limit]
+    assert bitmap_free(local_booked_bitmap(bitmaps, start, end), candidates, args.limit) == expected
+
+    print_table(f"Boş araç araması ({args.queries} sorgu, sayfa {args.limit})", rows)
+
+
+if __name__ == "__main__":
+    main()
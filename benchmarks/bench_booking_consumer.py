@@ -0,0 +1,120 @@
+"""booking_consumer.py'nin verim ve gecikmesini prefetch/eşzamanlılık ayarlarına göre ölçer.
+
+RabbitMQ yerine prefetch kuralını uygulayan bellek içi bir broker (stand-in), Redis
+yerine fakeredis kullanılır. Olayın yan etkileri (bitmap, onay olayı, cars güncellemesi)
+sabit bir gecikmeyle taklit edilir. Mesajların bir kısmı bilerek iki kez teslim edilir;
+idempotency anahtarları sayesinde her olay yalnızca bir kez uygulanmalıdır.
+
+    python benchmarks/bench_booking_consumer.py --messages 5000 --apply-ms 3
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+import fakeredis.aioredis
+
+from common import print_table, summarize
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "car_service"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # shared/
+
+from booking_consumer import BookingConsumer  # noqa: E402
+
+
+class StandInMessage:
+    def __init__(self, broker, body):
+        self.broker = broker
+        self.body = body
+        self.headers = {}
+        self.content_type = "application/json"
+        self.delivery_mode = 2
+        self.published_at = time.perf_counter()
+
+    async def ack(self):
+        self.broker.settle(self)
+
+    async def reject(self, requeue=False):
+        self.broker.settle(self)
+
+
+class StandInBroker:
+    """En fazla `prefetch` onaylanmamış mesajı tüketiciye veren kuyruk."""
+
+    def __init__(self, prefetch):
+        self.queue = asyncio.Queue()
+        self.credits = asyncio.Semaphore(prefetch)
+        self.latencies = []
+        self.done = asyncio.Event()
+        self.expected = 0
+
+    def publish(self, body):
+        self.expected += 1
+        self.queue.put_nowait(StandInMessage(self, body))
+
+    def settle(self, message):
+        self.latencies.append(time.perf_counter() - message.published_at)
+        self.credits.release()
+        if len(self.latencies) == self.expected:
+            self.done.set()
+
+    async def consume(self, callback):
+        while True:
+            await self.credits.acquire()
+            message = await self.queue.get()
+            asyncio.create_task(callback(message))
+
+
+async def run(messages, duplicates, prefetch, concurrency, apply_ms):
+    applied = []
+
+    async def apply(redis_client, event):
+        await asyncio.sleep(apply_ms / 1000)
+        applied.append(event["booking_id"])
+
+    broker = StandInBroker(prefetch)
+    consumer = BookingConsumer(fakeredis.aioredis.FakeRedis(), apply, concurrency=concurrency)
+    bodies = [json.dumps({"booking_id": booking_id, "car_id": booking_id, "start_date": "2025-01-01",
+                          "end_date": "2025-01-03", "status": "pending"}).encode()
+              for booking_id in range(messages)]
+    # Outbox'ın en az bir kez teslimatını taklit eden tekrarlar
+    bodies += random.sample(bodies, int(messages * duplicates))
+    random.shuffle(bodies)
+
+    started = time.perf_counter()
+    for body in bodies:
+        broker.publish(body)
+    consume_task = asyncio.create_task(broker.consume(consumer.handle))
+    await broker.done.wait()
+    elapsed = time.perf_counter() - started
+    consume_task.cancel()
+
+    assert len(applied) == len(set(applied)) == messages, "bir olay birden fazla kez uygulandı"
+    return summarize(broker.latencies, elapsed), consumer.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--duplicates", type=float, default=0.1, help="iki kez teslim edilen mesaj oranı")
+    parser.add_argument("--apply-ms", type=float, default=3.0, help="olay başına taklit edilen G/Ç gecikmesi")
+    parser.add_argument("--configs", nargs="+", default=["1:1", "8:8", "32:16", "128:64"],
+                        help="prefetch:eşzamanlılık")
+    args = parser.parse_args()
+
+    random.seed(3)
+    rows = []
+    for config in args.configs:
+        prefetch, concurrency = (int(value) for value in config.split(":"))
+        summary, stats = asyncio.run(run(args.messages, args.duplicates, prefetch, concurrency, args.apply_ms))
+        rows.append({"name": f"prefetch={prefetch} eşzamanlılık={concurrency}", **summary})
+        print(f"{config}: {stats}")
+    print_table(f"{args.messages} olay (+%{args.duplicates * 100:.0f} tekrar), "
+                f"olay başına {args.apply_ms} ms (kuyruğa girişten onaya gecikme)", rows)
+
+
+if __name__ == "__main__":
+    main()
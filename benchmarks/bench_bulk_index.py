@@ -0,0 +1,100 @@
+"""index_cars.py'nin tam yeniden indeksleme verimini sentetik araçlarla ölçer.
+
+Varsayılan olarak ES yerine, her bulk isteği için sabit + belge başına gecikme
+ekleyen bir yedek (stand-in) istemci kullanılır; böylece eylem üretimi, JSON
+serileştirme, parçalama ve iş parçacığı sayısının etkisi ağdan bağımsız ölçülür.
+Gerçek bir kümeye karşı ölçmek için `--es-url` verin (hedef indeks silinir).
+
+    python benchmarks/bench_bulk_index.py --cars 1000000
+"""
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+from elastic_transport import JsonSerializer
+from elasticsearch import Elasticsearch
+from elasticsearch.helpers import bulk, parallel_bulk
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "car_service"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # shared/
+os.environ.setdefault("DB_URL", "sqlite://")
+
+from index_cars import CARS_MAPPINGS, generate_actions  # noqa: E402
+
+BENCH_INDEX = "cars_bench"
+
+
+class StandInES:
+    """helpers.bulk/parallel_bulk'un kullandığı kadarını taklit eden ES istemcisi."""
+
+    def __init__(self, request_ms, per_doc_us):
+        self.request_s = request_ms / 1000
+        self.per_doc_s = per_doc_us / 1_000_000
+        self.transport = SimpleNamespace(serializers=SimpleNamespace(get_serializer=lambda _: JsonSerializer()))
+
+    def options(self, **kwargs):
+        return self
+
+    def bulk(self, operations, **kwargs):
+        docs = len(operations) // 2
+        time.sleep(self.request_s + docs * self.per_doc_s)
+        return SimpleNamespace(body={"errors": False, "items": [{"index": {"status": 201}} for _ in range(docs)]})
+
+
+def synthetic_cars(count):
+    """yield_per akışı gibi satırları tek tek üretir; bellekte tüm filo tutulmaz."""
+    for car_id in range(1, count + 1):
+        yield SimpleNamespace(
+            id=car_id, company="FERRARI", car_name=f"MODEL {car_id}", engine="V8",
+            total_speed="340 km/h", performance_0_100_kmh="2.5 sec", daily_price=100 + car_id % 3000,
+            fuel_type="Petrol", seats="2", torque="800 Nm", is_available=True,
+        )
+
+
+def run_serial(client, count, chunk_size, threads):
+    success, _ = bulk(client, generate_actions(synthetic_cars(count), index=BENCH_INDEX),
+                      chunk_size=chunk_size, stats_only=True)
+    return success
+
+
+def run_parallel(client, count, chunk_size, threads):
+    success = 0
+    for ok, _ in parallel_bulk(client, generate_actions(synthetic_cars(count), index=BENCH_INDEX),
+                               thread_count=threads, chunk_size=chunk_size):
+        success += ok
+    return success
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cars", type=int, default=1_000_000)
+    parser.add_argument("--request-ms", type=float, default=15.0, help="stand-in: bulk isteği başına gecikme")
+    parser.add_argument("--per-doc-us", type=float, default=20.0, help="stand-in: belge başına gecikme")
+    parser.add_argument("--es-url", help="stand-in yerine gerçek Elasticsearch")
+    parser.add_argument("--configs", nargs="+", default=["serial:500:1", "parallel:2000:1", "parallel:2000:4", "parallel:2000:8"],
+                        help="mod:chunk_size:threads")
+    args = parser.parse_args()
+
+    if args.es_url:
+        client = Elasticsearch([args.es_url])
+    else:
+        client = StandInES(args.request_ms, args.per_doc_us)
+
+    print(f"{'mod':<10}{'chunk':>8}{'thread':>8}{'belge':>10}{'süre (sn)':>12}{'belge/sn':>12}")
+    for config in args.configs:
+        mode, chunk_size, threads = config.split(":")
+        if args.es_url:
+            client.options(ignore_status=404).indices.delete(index=BENCH_INDEX)
+            client.indices.create(index=BENCH_INDEX, mappings=CARS_MAPPINGS,
+                                  settings={"refresh_interval": "-1", "number_of_replicas": 0})
+        runner = run_serial if mode == "serial" else run_parallel
+        started = time.perf_counter()
+        success = runner(client, args.cars, int(chunk_size), int(threads))
+        elapsed = time.perf_counter() - started
+        print(f"{mode:<10}{chunk_size:>8}{threads:>8}{success:>10}{elapsed:>12.1f}{success / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
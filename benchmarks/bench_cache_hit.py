@@ -0,0 +1,111 @@
+"""Önbellek isabetinde yanıt üretme maliyetini önce/sonra karşılaştırır.
+
+Önce: Redis'ten gelen JSON çözülür, FastAPI `response_model` ile her eleman yeniden
+doğrulanır ve tekrar serileştirilir. Sonra: önbellekteki hazır baytlar olduğu gibi
+döndürülür; ıska yolunda ise json yerine orjson kullanılır. Redis ağ turu her iki
+durumda da aynı olduğu için ölçüme dahil edilmez.
+
+    python benchmarks/bench_cache_hit.py --cars 1218
+"""
+import argparse
+import json
+import time
+from typing import List, Optional
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
+
+from common import percentile
+
+
+class Car(BaseModel):
+    id: int
+    car_name: str
+    company: str
+    daily_price: float
+    engine: str
+    fuel_type: str
+    description: Optional[str] = None
+
+
+class CarDetail(BaseModel):
+    id: int
+    company: str
+    car_name: str
+    engine: str
+    total_speed: str
+    performance_0_100_kmh: str
+    daily_price: int
+    fuel_type: str
+    seats: str
+    torque: str
+    is_available: bool
+
+
+def synthetic_cars(count):
+    return [
+        {"id": i, "car_name": f"MODEL {i}", "company": "FERRARI", "daily_price": 100.0 + i,
+         "engine": "V8", "fuel_type": "Petrol", "description": None}
+        for i in range(1, count + 1)
+    ]
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return percentile(samples, 50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cars", type=int, default=1218)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    cars = synthetic_cars(args.cars)
+    list_adapter = TypeAdapter(List[Car])
+    cached_str = json.dumps(cars)
+    cached_bytes = orjson.dumps(cars)
+
+    detail = CarDetail(id=1, company="FERRARI", car_name="SF90", engine="V8", total_speed="340 km/h",
+                       performance_0_100_kmh="2.5 sec", daily_price=2086, fuel_type="hybrid",
+                       seats="2", torque="800 Nm", is_available=True)
+    detail_str = detail.model_dump_json()
+    detail_bytes = orjson.dumps(detail.model_dump())
+
+    def list_hit_before():
+        # json.loads -> response_model doğrulaması -> jsonable çıktı -> json.dumps
+        data = list_adapter.validate_python(json.loads(cached_str))
+        json.dumps(list_adapter.dump_python(data, mode="json")).encode()
+
+    def list_hit_after():
+        bytes(cached_bytes)
+
+    def detail_hit_before():
+        model = CarDetail.model_validate_json(detail_str)
+        json.dumps(CarDetail.model_validate(model).model_dump(mode="json")).encode()
+
+    def detail_hit_after():
+        bytes(detail_bytes)
+
+    def list_miss_json():
+        json.dumps(cars)
+
+    def list_miss_orjson():
+        orjson.dumps(cars)
+
+    rows = [
+        ("GET /cars/ isabet", list_hit_before, list_hit_after),
+        ("GET /cars/{id} isabet", detail_hit_before, detail_hit_after),
+        ("GET /cars/ ıska serileştirme", list_miss_json, list_miss_orjson),
+    ]
+    print(f"{'senaryo':<32}{'önce (ms)':>12}{'sonra (ms)':>12}")
+    for name, before, after in rows:
+        print(f"{name:<32}{timed(before, args.repeat):>12.3f}{timed(after, args.repeat):>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
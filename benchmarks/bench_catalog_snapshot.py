@@ -0,0 +1,159 @@
+"""GET /cars/ filtrelerini katalog anlık görüntüsü (car_service/catalog.py) ile ES yolunda karşılaştırır.
+
+ES yolu: search_cars -> Elasticsearch (benchmarks/standins.py, ağ turu `--es-latency-ms` ile
+taklit edilir) + indeks güncelliği kontrolü; Redis sorgu önbelleği kapalıdır. Anlık görüntü:
+aynı filtreler NumPy maskeleriyle bellekte. Sorgu karışımı: filtresiz, marka (yazım hatalı
+olanlar dahil), fiyat aralığı ve ikisi birlikte. Önce fonksiyon düzeyinde (µs/sorgu), sonra
+httpx ASGITransport ile uç nokta düzeyinde ölçülür. Araçlar car_service/cars.json'dan
+geçici bir SQLite veritabanına yüklenir.
+
+    python benchmarks/bench_catalog_snapshot.py --queries 5000 --es-latency-ms 1
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+CARS_JSON = os.path.join(ROOT, "car_service", "cars.json")
+os.environ["DB_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_catalog.db')}"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+sys.path.insert(0, os.path.join(ROOT, "car_service"))
+sys.path.append(ROOT)  # shared/
+
+import fakeredis.aioredis  # noqa: E402
+import httpx  # noqa: E402
+
+from common import percentile, print_table, summarize  # noqa: E402
+from loadtest import CAR_COLUMNS  # noqa: E402
+from standins import StandInElasticsearch  # noqa: E402
+
+import catalog  # noqa: E402
+import main  # noqa: E402
+import models  # noqa: E402
+from shared import metrics  # noqa: E402
+
+TYPOS = {"mercedes": "mercedez", "toyota": "toyta", "porsche": "porshe", "ferrari": "ferari"}
+
+
+def query_mix(cars, count, seed):
+    rng = random.Random(seed)
+    companies = sorted({" ".join(car["company"].lower().split()) for car in cars})
+    queries = []
+    for _ in range(count):
+        kind = rng.choice(("all", "name", "price", "name_price"))
+        name = rng.choice(companies) if "name" in kind else None
+        if name and name in TYPOS and rng.random() < 0.5:
+            name = TYPOS[name]
+        low = rng.randrange(0, 1000, 50) if "price" in kind else None
+        high = low + rng.randrange(100, 2000, 100) if low is not None else None
+        queries.append({"car_name": name, "min_price": low, "max_price": high})
+    return queries
+
+
+def per_query_us(latencies):
+    us = [value * 1e6 for value in latencies]
+    return f"p50 {percentile(us, 50):9.1f} µs   p99 {percentile(us, 99):9.1f} µs"
+
+
+async def function_level(queries, limit):
+    # İki yol ayrı döngülerde ölçülür; iç içe çalışınca ES yolunun ürettiği çöp (GC) diğerine yansır
+    snapshot_latencies, snapshot_pages = [], []
+    for query in queries:
+        started = time.perf_counter()
+        body, _ = main.car_catalog.search(**query, limit=limit)
+        snapshot_latencies.append(time.perf_counter() - started)
+        snapshot_pages.append(body)
+
+    es_latencies, agree = [], 0
+    async with main.SessionLocal() as db:
+        for query, body in zip(queries, snapshot_pages):
+            started = time.perf_counter()
+            cars, _ = await main.search_cars(db, **query, limit=limit)
+            es_latencies.append(time.perf_counter() - started)
+            if not query["car_name"]:
+                # Marka araması olmadan iki yol da id sırasıyla aynı sayfayı döndürmeli
+                agree += [car["id"] for car in json.loads(body)] == [car["id"] for car in cars]
+
+    unnamed = sum(1 for query in queries if not query["car_name"])
+    print(f"\nfonksiyon düzeyi ({len(queries)} sorgu, limit={limit})")
+    print(f"  katalog anlık görüntüsü   {per_query_us(snapshot_latencies)}")
+    print(f"  search_cars (ES yolu)     {per_query_us(es_latencies)}")
+    print(f"  markasız sorgularda aynı sayfa: {agree}/{unnamed}")
+
+
+async def endpoint_level(queries, limit, concurrency):
+    async def run(name):
+        latencies = []
+        semaphore = asyncio.Semaphore(concurrency)
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://car") as client:
+            async def send(query):
+                params = {key: value for key, value in query.items() if value is not None}
+                async with semaphore:
+                    started = time.perf_counter()
+                    response = await client.get("/cars/", params={**params, "limit": limit})
+                    latencies.append(time.perf_counter() - started)
+                    assert response.status_code == 200, response.text
+
+            started = time.perf_counter()
+            await asyncio.gather(*(send(query) for query in queries))
+            return {"name": name, **summarize(latencies, time.perf_counter() - started)}
+
+    snapshot = main.car_catalog
+    rows = [await run("GET /cars/ anlık görüntü")]
+    main.car_catalog = None
+    rows.append(await run("GET /cars/ ES yolu"))
+    main.car_catalog = snapshot
+    print_table(f"uç nokta düzeyi (eşzamanlılık {concurrency})", rows)
+
+
+async def run(args):
+    with open(CARS_JSON, encoding="utf-8") as f:
+        cars = json.load(f)
+    search = StandInElasticsearch(
+        [{name: car.get(name) for name in main.LIST_SOURCE_FIELDS} for car in cars], args.es_latency_ms
+    )
+    server = fakeredis.FakeServer()
+
+    class BenchRedis(fakeredis.aioredis.FakeRedis):
+        def __init__(self, *a, **kwargs):
+            super().__init__(server=server, decode_responses=kwargs.get("decode_responses", False))
+
+    main.AsyncElasticsearch = lambda *a, **kwargs: search
+    main.TimedRedis = metrics.timed_redis(BenchRedis, "car_service")
+
+    async with main.app.router.lifespan_context(main.app):
+        async with main.SessionLocal() as db:
+            await db.execute(models.Car.__table__.delete())
+            db.add_all([models.Car(**{name: car.get(name) for name in CAR_COLUMNS}) for car in cars])
+            await db.commit()
+        await main.load_catalog()
+        # ES yolu Redis sorgu önbelleği olmadan ölçülür
+        main.redis_client = None
+
+        queries = query_mix(cars, args.queries, args.seed)
+        print(f"{len(main.car_catalog)} araç, ES ağ turu {args.es_latency_ms} ms")
+        await function_level(queries, args.limit)
+        await endpoint_level(queries, args.limit, args.concurrency)
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--es-latency-ms", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    if not catalog.available():
+        sys.exit("NumPy kurulu değil; katalog anlık görüntüsü kullanılamaz.")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,81 @@
+"""Aynı araç ve aynı tarihler için eşzamanlı rezervasyonlarda çift ayırmayı ölçer.
+
+booking_service'in süreç içi AvailabilityIndex'i ve araç başına kilidi, commit
+gecikmesini taklit eden bir bekleme ile kullanılır. "kontrolsüz" senaryo eski
+davranıştır: her istek kaydı doğrudan ekler.
+
+    python benchmarks/bench_double_booking.py --requests 500
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from common import print_table, summarize
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "booking_service"))
+
+from availability import AvailabilityIndex  # noqa: E402
+
+CAR_ID = 1
+BASE_DAY = date(2025, 1, 1)
+
+
+def random_range(days):
+    start = BASE_DAY + timedelta(days=random.randrange(days))
+    return start, start + timedelta(days=random.randint(1, 7))
+
+
+def count_overlaps(bookings):
+    ordered = sorted(bookings)
+    return sum(1 for (_, end), (start, _) in zip(ordered, ordered[1:]) if start < end)
+
+
+async def reserve(index, bookings, start, end, commit_ms, checked):
+    started = time.perf_counter()
+    if checked:
+        async with index.lock_for(CAR_ID):
+            if not index.is_free(CAR_ID, start, end):
+                return time.perf_counter() - started, False
+            await asyncio.sleep(commit_ms / 1000)
+            bookings.append((start, end))
+            index.add(CAR_ID, start, end, len(bookings))
+    else:
+        await asyncio.sleep(commit_ms / 1000)
+        bookings.append((start, end))
+    return time.perf_counter() - started, True
+
+
+async def run(requests, days, commit_ms, checked):
+    random.seed(42)
+    index = AvailabilityIndex()
+    bookings = []
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        reserve(index, bookings, *random_range(days), commit_ms, checked) for _ in range(requests)
+    ))
+    elapsed = time.perf_counter() - started
+    accepted = sum(1 for _, ok in results if ok)
+    return summarize([latency for latency, _ in results], elapsed), accepted, count_overlaps(bookings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--days", type=int, default=60, help="başlangıç günlerinin dağıldığı aralık")
+    parser.add_argument("--commit-ms", type=float, default=2.0, help="taklit edilen commit gecikmesi")
+    args = parser.parse_args()
+
+    rows = []
+    for name, checked in (("kontrolsüz", False), ("indeks + araç kilidi", True)):
+        summary, accepted, overlaps = asyncio.run(run(args.requests, args.days, args.commit_ms, checked))
+        rows.append({"name": name, **summary})
+        print(f"{name}: kabul edilen {accepted}, reddedilen {args.requests - accepted}, çakışan çift {overlaps}")
+    print_table(f"{args.requests} eşzamanlı rezervasyon, tek araç", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""reserve_booking'in olay döngüsünü ne kadar bloke ettiğini eşzamanlı isteklerle ölçer.
+
+Önce: async handler içinde senkron Session (add/commit/refresh) kullanan eski yol,
+bu betikte aynen yeniden kurulur. Sonra: booking_service/main.py'deki AsyncSession +
+INSERT ... RETURNING yolu. İstekler httpx ASGITransport ile süreç içinde gönderilir.
+Veritabanı geçici bir SQLite dosyasıdır; PostgreSQL commit gecikmesi, her INSERT'te
+veritabanı iş parçacığında uyuyan bir tetikleyiciyle taklit edilir. Döngü gecikmesi,
+10 ms'de bir uyanan bir görevin ne kadar geç uyandığıdır.
+
+    python benchmarks/bench_event_loop_lag.py --requests 2000 --db-latency-ms 1
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_loop_lag.db")
+os.environ["DB_URL"] = f"sqlite:///{DB_PATH}"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "booking_service"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # shared/
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
+from sqlalchemy import create_engine, delete, event  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from common import BENCH_JWT_KEY, auth_headers, percentile, summarize  # noqa: E402
+
+os.environ["JWT_SIGNING_KEY"] = BENCH_JWT_KEY
+
+import main  # noqa: E402
+from database import Base, engine  # noqa: E402
+from models import Booking, BookingOutbox  # noqa: E402
+
+DB_LATENCY_S = 0.001
+TICK_S = 0.01
+
+# Eski yolda QueuePool tükenince bağlantı beklemesi olay döngüsünün kendisinde yapılır ve
+# bağlantıları geri verecek teardown'lar da döngüyü beklediği için istekler pool_timeout'a
+# kadar kilitlenir. Ölçüm döngü gecikmesine odaklansın diye eski yol havuzsuz çalışır.
+legacy_engine = create_engine(f"sqlite:///{DB_PATH}", poolclass=NullPool)
+LegacySession = sessionmaker(autocommit=False, autoflush=False, bind=legacy_engine)
+
+
+def db_latency():
+    time.sleep(DB_LATENCY_S)
+    return 0
+
+
+@event.listens_for(legacy_engine, "connect")
+def legacy_connect(dbapi_connection, connection_record):
+    dbapi_connection.execute("PRAGMA busy_timeout=60000")
+    dbapi_connection.create_function("db_latency", 0, db_latency)
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def async_connect(dbapi_connection, connection_record):
+    # aiosqlite: fonksiyon bağlantının kendi iş parçacığında çalışır
+    dbapi_connection.run_async(lambda connection: connection.create_function("db_latency", 0, db_latency))
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA busy_timeout=60000")
+    cursor.close()
+
+
+class LegacyRequest(BaseModel):
+    car_id: int
+    start_date: date
+    end_date: date
+
+
+def get_legacy_db():
+    db = LegacySession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+legacy_app = FastAPI()
+
+
+@legacy_app.post("/api/v1/booking/reserve", status_code=201)
+async def legacy_reserve(booking_request: LegacyRequest, db: Session = Depends(get_legacy_db)):
+    db_booking = Booking(car_id=booking_request.car_id, start_date=booking_request.start_date,
+                         end_date=booking_request.end_date, status="pending")
+    db.add(db_booking)
+    db.commit()
+    db.refresh(db_booking)
+    return {"booking_id": db_booking.id}
+
+
+async def reset_db():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(delete(BookingOutbox))
+        await conn.execute(delete(Booking))
+        await conn.exec_driver_sql(
+            "CREATE TRIGGER IF NOT EXISTS bench_db_latency AFTER INSERT ON bookings "
+            "BEGIN SELECT db_latency(); END"
+        )
+
+
+async def monitor_lag(lags, stop):
+    while not stop.is_set():
+        expected = time.perf_counter() + TICK_S
+        await asyncio.sleep(TICK_S)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def run(app, requests):
+    await reset_db()
+    lags, latencies, stop = [], [], asyncio.Event()
+    monitor = asyncio.create_task(monitor_lag(lags, stop))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://booking", timeout=None,
+                                 headers=auth_headers()) as client:
+        async def reserve(index):
+            start = date(2025, 1, 1) + timedelta(days=index % 300)
+            started = time.perf_counter()
+            try:
+                response = await client.post("/api/v1/booking/reserve", json={
+                    "car_id": index, "start_date": start.isoformat(),
+                    "end_date": (start + timedelta(days=2)).isoformat(),
+                })
+                status = response.status_code
+            except Exception:
+                status = 500
+            latencies.append(time.perf_counter() - started)
+            return status
+
+        started = time.perf_counter()
+        statuses = await asyncio.gather(*(reserve(index) for index in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    stop.set()
+    await monitor
+    await engine.dispose()
+    lag_ms = [lag * 1000 for lag in lags]
+    return summarize(latencies, elapsed), {
+        "lag_p50_ms": round(percentile(lag_ms, 50), 1),
+        "lag_p99_ms": round(percentile(lag_ms, 99), 1),
+        "lag_max_ms": round(max(lag_ms, default=0.0), 1),
+        "errors": sum(1 for code in statuses if code != 201),
+    }
+
+
+def main_():
+    global DB_LATENCY_S
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--db-latency-ms", type=float, default=1.0, help="INSERT başına taklit edilen gecikme")
+    args = parser.parse_args()
+    DB_LATENCY_S = args.db_latency_ms / 1000
+
+    print(f"{args.requests} eşzamanlı rezervasyon, INSERT başına {args.db_latency_ms} ms")
+    print(f"{'senaryo':<32}{'rps':>10}{'p50 ms':>10}{'p99 ms':>10}"
+          f"{'döngü p50':>12}{'döngü p99':>12}{'döngü max':>12}{'hata':>8}")
+    for name, app in (("senkron Session (eski)", legacy_app), ("AsyncSession + RETURNING", main.app)):
+        summary, lag = asyncio.run(run(app, args.requests))
+        print(f"{name:<32}{summary['throughput_rps']:>10}{summary['p50_ms']:>10}{summary['p99_ms']:>10}"
+              f"{lag['lag_p50_ms']:>12}{lag['lag_p99_ms']:>12}{lag['lag_max_ms']:>12}{lag['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main_()
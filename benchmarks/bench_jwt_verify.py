@@ -0,0 +1,80 @@
+"""İstek başına belirteç doğrulama maliyetini ölçer (shared/auth.py).
+
+Belirteçler user_service'in (simplejwt) ürettiği biçimde, HS256 ile imzalanır.
+Senaryolar: her istekte jwt.decode; TokenVerifier ıska (her istek yeni belirteç);
+TokenVerifier isabet (`--users` kullanıcının belirteçleri tekrar tekrar gelir) ve
+FastAPI bağımlılığının (current_user_id) isabet yolundaki toplam maliyeti.
+Karşılaştırma için user_service'e istek başına bir ağ turu (`/api/users/me/`)
+en az bir RTT + bir veritabanı sorgusu demektir; yani milisaniyeler mertebesidir.
+
+    python benchmarks/bench_jwt_verify.py --requests 200000 --users 1000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+from common import BENCH_JWT_KEY, access_token
+
+os.environ["JWT_SIGNING_KEY"] = BENCH_JWT_KEY
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # shared/
+
+import jwt  # noqa: E402
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+
+from shared.auth import TokenVerifier, current_user_id, verifier  # noqa: E402
+
+
+def per_request_us(fn, tokens):
+    started = time.perf_counter()
+    for token in tokens:
+        fn(token)
+    return (time.perf_counter() - started) / len(tokens) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=1000, help="Tekrar eden belirteç sayısı (isabet senaryosu)")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    unique = [access_token(user_id) for user_id in range(args.requests)]
+    pool = [access_token(user_id) for user_id in range(args.users)]
+    repeated = [rng.choice(pool) for _ in range(args.requests)]
+
+    def decode(token):
+        jwt.decode(token, BENCH_JWT_KEY, algorithms=["HS256"])
+
+    cold = TokenVerifier(BENCH_JWT_KEY, cache_size=args.users)
+    warm = TokenVerifier(BENCH_JWT_KEY, cache_size=args.users)
+    for token in pool:
+        warm.verify(token)
+    warm.hits = warm.misses = 0
+
+    async def dependency_loop():
+        started = time.perf_counter()
+        for token in repeated:
+            await current_user_id(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+        return (time.perf_counter() - started) / len(repeated) * 1e6
+
+    for token in pool:
+        verifier.verify(token)
+
+    rows = [
+        ("jwt.decode (önbelleksiz)", per_request_us(decode, repeated)),
+        ("TokenVerifier ıska", per_request_us(cold.verify, unique)),
+        ("TokenVerifier isabet", per_request_us(warm.verify, repeated)),
+        ("current_user_id isabet", asyncio.run(dependency_loop())),
+    ]
+    print(f"\n{args.requests} istek, {args.users} tekrar eden belirteç")
+    print(f"{'senaryo':<32}{'µs/istek':>12}")
+    for name, cost in rows:
+        print(f"{name:<32}{cost:>12.2f}")
+    print(f"\nisabet oranı (TokenVerifier isabet): {warm.hits / (warm.hits + warm.misses):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Rezervasyon olaylarının RabbitMQ'ya aktarımını önce/sonra karşılaştırır.
+
+Önce: her istek commit'ten sonra mesajı kendisi yayınlar ve onayını bekler.
+Sonra: istek olayı outbox'a yazıp döner; OutboxRelay partiler halinde, sınırlı
+sayıda onay bekleyen mesajla yayınlar. Broker yerine, her mesaj onayını sabit bir
+gecikmeyle veren bir yedek (stand-in) exchange kullanılır. Veritabanı geçici bir
+SQLite dosyasıdır.
+
+    python benchmarks/bench_outbox_relay.py --bookings 3000 --configs 1:5 8:5 8:20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from common import print_table, summarize
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_outbox.db")
+os.environ["DB_URL"] = f"sqlite:///{DB_PATH}"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "booking_service"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # shared/
+
+from sqlalchemy import delete, event, func, select  # noqa: E402
+
+from database import Base, SessionLocal, engine  # noqa: E402
+from models import Booking, BookingOutbox  # noqa: E402
+from outbox import OutboxRelay, booking_event, enqueue  # noqa: E402
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def sqlite_wal(dbapi_connection, connection_record):
+    # WAL: okuyucular yazarı beklemez; tek dosyalı SQLite'ı PostgreSQL'e biraz yaklaştırır
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+class StandInExchange:
+    """Her publish'i confirm_ms sonra onaylayan exchange; aynı anda bekleyen en fazla mesajı da ölçer."""
+
+    def __init__(self, confirm_ms):
+        self.confirm_s = confirm_ms / 1000
+        self.pending = 0
+        self.max_pending = 0
+
+    async def publish(self, message, routing_key, timeout=None):
+        self.pending += 1
+        self.max_pending = max(self.max_pending, self.pending)
+        await asyncio.sleep(self.confirm_s)
+        self.pending -= 1
+
+
+async def reset_db():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(delete(BookingOutbox))
+        await conn.execute(delete(Booking))
+
+
+async def insert_booking(index, with_outbox):
+    start = date(2025, 1, 1) + timedelta(days=index * 3)
+    async with SessionLocal() as db:
+        booking = Booking(car_id=index, start_date=start, end_date=start + timedelta(days=2), status="pending")
+        db.add(booking)
+        await db.flush()
+        if with_outbox:
+            enqueue(db, booking)
+        await db.commit()
+        return booking_event(booking)
+
+
+async def run_inline(bookings, concurrency, exchange):
+    """Eski yol: commit + istek içinde yayınla ve onayı bekle."""
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def request(index):
+        async with gate:
+            started = time.perf_counter()
+            await insert_booking(index, False)
+            await exchange.publish(None, routing_key="booking.created")
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request(index) for index in range(bookings)))
+    elapsed = time.perf_counter() - started
+    return summarize(latencies, elapsed), elapsed
+
+
+async def run_outbox(bookings, concurrency, exchange, batch_size, max_in_flight):
+    """Yeni yol: istek outbox'a yazıp döner; aktarıcı arka planda yayınlar."""
+    relay = OutboxRelay(exchange, batch_size=batch_size, max_in_flight=max_in_flight)
+    relay_task = asyncio.create_task(relay.run())
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def request(index):
+        async with gate:
+            started = time.perf_counter()
+            await insert_booking(index, True)
+            relay.notify()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request(index) for index in range(bookings)))
+    # Uçtan uca: tüm olaylar onaylanıp outbox boşalana kadar
+    while relay.published < bookings:
+        await asyncio.sleep(0.005)
+    elapsed = time.perf_counter() - started
+    relay_task.cancel()
+
+    async with SessionLocal() as db:
+        remaining = await db.scalar(select(func.count()).select_from(BookingOutbox))
+    assert remaining == 0, f"outbox'ta {remaining} kayıt kaldı"
+    return summarize(latencies, elapsed), elapsed
+
+
+async def scenario(runner):
+    await reset_db()
+    try:
+        return await runner
+    finally:
+        # Havuzdaki bağlantılar bu olay döngüsüne bağlıdır
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, default=3000)
+    parser.add_argument("--configs", nargs="+", default=["1:5", "8:5", "8:20"],
+                        help="eşzamanlı_istek:onay_ms (stand-in publish onay gecikmesi)")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--max-in-flight", type=int, default=64)
+    args = parser.parse_args()
+
+    for config in args.configs:
+        concurrency, confirm_ms = int(config.split(":")[0]), float(config.split(":")[1])
+        rows = []
+        for name in ("satır içi publish", "outbox + toplu aktarım"):
+            exchange = StandInExchange(confirm_ms)
+            if name == "satır içi publish":
+                runner = run_inline(args.bookings, concurrency, exchange)
+            else:
+                runner = run_outbox(args.bookings, concurrency, exchange, args.batch_size, args.max_in_flight)
+            summary, elapsed = asyncio.run(scenario(runner))
+            rows.append({"name": name, **summary})
+            print(f"{name}: {args.bookings / elapsed:.0f} olay/sn uçtan uca, "
+                  f"en fazla {exchange.max_pending} bekleyen onay")
+        print_table(f"{args.bookings} rezervasyon, {concurrency} eşzamanlı istek, onay {confirm_ms} ms "
+                    f"(API gecikmesi)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Liste yanıtını ES `_source`'tan kurmak ile PostgreSQL'den yeniden okumak arasındaki farkı ölçer.
+
+PostgreSQL yerine bellek içi SQLite, ORM satırı yerine basit bir nesne kullanılır;
+ağ gecikmesi `--db-rtt-ms` ile eklenir. Ölçülen kısım, `_source` yolunun ortadan
+kaldırdığı iştir: ikinci ağ turu, IN sorgusu, satır nesnesi oluşturma ve ES
+sıralamasının yeniden kurulması.
+
+    python benchmarks/bench_source_vs_hydration.py --sizes 1000 100000
+"""
+import argparse
+import json
+import random
+import sqlite3
+import time
+
+from common import percentile
+
+COLUMNS = [
+    "id", "company", "car_name", "engine", "total_speed", "performance_0_100_kmh",
+    "daily_price", "fuel_type", "seats", "torque", "is_available",
+]
+LIST_SOURCE_FIELDS = ["id", "car_name", "company", "daily_price", "engine", "fuel_type"]
+COMPANIES = ["FERRARI", "ROLLS ROYCE", "FORD", "MERCEDES", "BMW", "AUDI", "TOYOTA", "NISSAN"]
+
+
+class CarRow:
+    """SQLAlchemy tarafından oluşturulan ORM nesnesinin yerine geçer."""
+
+    def __init__(self, row):
+        for name, value in zip(COLUMNS, row):
+            setattr(self, name, value)
+
+
+def synthetic_car(car_id):
+    return {
+        "id": car_id,
+        "company": random.choice(COMPANIES),
+        "car_name": f"MODEL {car_id}",
+        "engine": "V8",
+        "total_speed": "250 km/h",
+        "performance_0_100_kmh": "4.5 sec",
+        "daily_price": random.randint(50, 3000),
+        "fuel_type": "Petrol",
+        "seats": "4",
+        "torque": "500 Nm",
+        "is_available": True,
+    }
+
+
+def setup(size):
+    db = sqlite3.connect(":memory:")
+    db.execute(f"CREATE TABLE cars ({', '.join(COLUMNS)}, PRIMARY KEY (id))")
+    cars = [synthetic_car(car_id) for car_id in range(1, size + 1)]
+    db.executemany(
+        f"INSERT INTO cars VALUES ({', '.join('?' for _ in COLUMNS)})",
+        [tuple(car[name] for name in COLUMNS) for car in cars],
+    )
+    # ES yanıtı: karışık sıralı hit'ler, yalnızca gerekli alanları içeren _source ile
+    random.shuffle(cars)
+    response = json.dumps({"hits": {"hits": [
+        {"_id": str(car["id"]), "_source": {name: car[name] for name in LIST_SOURCE_FIELDS}}
+        for car in cars
+    ]}})
+    return db, response
+
+
+def from_source(db, response, rtt):
+    hits = json.loads(response)["hits"]["hits"]
+    return [hit["_source"] for hit in hits]
+
+
+def from_postgres(db, response, rtt):
+    hits = json.loads(response)["hits"]["hits"]
+    car_ids = [hit["_source"]["id"] for hit in hits]
+    time.sleep(rtt)
+    rows = db.execute(
+        "SELECT * FROM cars WHERE id IN (SELECT value FROM json_each(?))", (json.dumps(car_ids),)
+    ).fetchall()
+    cars = [CarRow(row) for row in rows]
+    car_dict = {car.id: car for car in cars}
+    ordered = [car_dict[id] for id in car_ids if id in car_dict]
+    return [{name: getattr(car, name) for name in LIST_SOURCE_FIELDS} for car in ordered]
+
+
+def measure(fn, db, response, rtt, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(db, response, rtt)
+        samples.append((time.perf_counter() - started) * 1000)
+    return percentile(samples, 50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--db-rtt-ms", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'araç':>8}{'ES + PG (ms)':>16}{'_source (ms)':>16}{'kazanç (ms)':>14}")
+    for size in args.sizes:
+        db, response = setup(size)
+        hydrated = measure(from_postgres, db, response, args.db_rtt_ms / 1000, args.repeat)
+        direct = measure(from_source, db, response, args.db_rtt_ms / 1000, args.repeat)
+        print(f"{size:>8}{hydrated:>16.2f}{direct:>16.2f}{hydrated - direct:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Toplu kullanıcı içe aktarımının (users/bulk.py) süreç sayısıyla ölçeklenmesini ölçer.
+
+Eski: satır başına UserSerializer.save() (set_password + tek satırlık INSERT), istek iş
+parçacığında. Yeni: import_users; parolalar `--workers` listesindeki her süreç sayısıyla
+işlem havuzunda hash'lenir, satırlar bulk_create ile yazılır. Veritabanı geçici bir SQLite
+dosyasıdır. PBKDF2 tur sayısı PASSWORD_HASH_ITERATIONS ile verilir (varsayılan burada 100.000);
+satır/s değeri tur sayısıyla ters orantılıdır, süreç sayısıyla oran ise değişmez.
+Hızlanma yalnızca makinedeki çekirdek sayısına kadar beklenir.
+
+    PASSWORD_HASH_ITERATIONS=100000 python benchmarks/bench_user_import.py --users 2000 --workers 1,2,4,8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+os.environ["DJANGO_SETTINGS_MODULE"] = "user_service.settings"
+os.environ["DJANGO_DEBUG"] = "false"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("PASSWORD_HASH_ITERATIONS", "100000")
+os.environ.pop("DB_URL", None)
+sys.path.insert(0, os.path.join(ROOT, "user_service"))
+sys.path.append(ROOT)  # shared/
+
+
+def rows_for(prefix, count):
+    return [{"username": f"{prefix}{i}", "email": f"{prefix}{i}@example.com", "password": f"parola-{i}"}
+            for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--workers", default="1,2,4", help="Virgülle ayrılmış süreç sayıları")
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    # Havuz süreçleri (spawn) bu modülü yeniden içe aktarır; Django yalnızca ana süreçte kurulur
+    import django
+    from django.conf import settings
+
+    django.setup()
+    settings.DATABASES["default"]["NAME"] = os.path.join(tempfile.mkdtemp(), "bench_import.db")
+
+    from django.core.management import call_command
+
+    from users.bulk import import_users, make_pool
+    from users.serializers import UserSerializer
+
+    call_command("migrate", verbosity=0)
+    print(f"{args.users} kullanıcı, PBKDF2 {settings.PASSWORD_HASH_ITERATIONS} tur, {os.cpu_count()} çekirdek")
+    print(f"\n{'senaryo':<36}{'süre s':>10}{'satır/s':>12}{'hızlanma':>10}")
+
+    baseline = None
+    if not args.skip_legacy:
+        started = time.perf_counter()
+        for row in rows_for("legacy", args.users):
+            serializer = UserSerializer(data=row)
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        baseline = time.perf_counter() - started
+        print(f"{'eski: satır başına save()':<36}{baseline:>10.2f}{args.users / baseline:>12.0f}{1.0:>10.2f}")
+
+    for workers in (int(value) for value in args.workers.split(",")):
+        with make_pool(workers) as pool:
+            pool.submit(int).result()  # süreç başlatma maliyeti ölçüme girmesin
+            started = time.perf_counter()
+            report = import_users(rows_for(f"w{workers}-", args.users), pool=pool)
+            elapsed = time.perf_counter() - started
+        assert report["created"] == args.users, report["errors"][:3]
+        baseline = baseline or elapsed
+        print(f"{f'import_users, {workers} süreç':<36}{elapsed:>10.2f}{args.users / elapsed:>12.0f}"
+              f"{baseline / elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""GET /api/users/ maliyetini sentetik bir kullanıcı tablosu üzerinde ölçer (varsayılan 1M satır).
+
+Eski: sayfalamasız `CustomUser.objects.all()` + UserSerializer (bu betikte aynen yeniden kurulur;
+tüm tablo ve parola hash'leri dahil her kolon okunur). Yeni: users/views.py'deki imleçli sayfalama
++ .only() projeksiyonu ve NDJSON dışa aktarımı. İstekler django.test.Client ile tüm middleware
+zincirinden geçer; veritabanı geçici bir SQLite dosyasıdır. Bellek, senaryo başına süreç RSS
+tepe değerinin artışıdır; senaryolar bu yüzden az bellek kullanandan çoğa doğru çalışır.
+
+    python benchmarks/bench_user_listing.py --users 1000000 --pages 200
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from common import percentile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+os.environ["DJANGO_SETTINGS_MODULE"] = "user_service.settings"
+os.environ["DJANGO_DEBUG"] = "false"
+os.environ["DJANGO_ALLOWED_HOSTS"] = "testserver"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.pop("DB_URL", None)
+sys.path.insert(0, os.path.join(ROOT, "user_service"))
+sys.path.append(ROOT)  # shared/
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+django.setup()
+settings.DATABASES["default"]["NAME"] = os.path.join(tempfile.mkdtemp(), "bench_listing.db")
+
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.urls import path  # noqa: E402
+from rest_framework import viewsets  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from user_service.urls import urlpatterns  # noqa: E402
+from users.models import CustomUser  # noqa: E402
+from users.serializers import UserSerializer  # noqa: E402
+
+
+class LegacyUserViewSet(viewsets.ModelViewSet):
+    queryset = CustomUser.objects.all()
+    serializer_class = UserSerializer
+    pagination_class = None
+
+
+urlpatterns.append(path("legacy/users/", LegacyUserViewSet.as_view({"get": "list"})))
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def populate(count):
+    # Gerçekçi bir hash uzunluğu; hepsine aynı değer yazılır (hash'leme burada ölçülmüyor)
+    password = make_password("bench-password-123")
+    # Django imleç sarmalayıcısı satır başına parametre dönüştürdüğü için doğrudan sqlite3 kullanılır
+    connection.ensure_connection()
+    with transaction.atomic():
+        connection.connection.executemany(
+            f"INSERT INTO {CustomUser._meta.db_table} (password, is_superuser, username, first_name, last_name, "
+            "email, is_staff, is_active, date_joined, name, phone_number) "
+            "VALUES (?, 0, ?, '', '', ?, 0, 1, '2025-01-01 00:00:00', ?, ?)",
+            ((password, f"user{i}", f"user{i}@example.com", f"Kullanıcı {i}", f"+90555{i:07d}")
+             for i in range(count)),
+        )
+
+
+def measure(name, fn):
+    rss_before = max_rss_mb()
+    started = time.perf_counter()
+    detail = fn()
+    elapsed = time.perf_counter() - started
+    print(f"{name:<40}{elapsed * 1000:>12.1f}{max_rss_mb() - rss_before:>14.1f}   {detail}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--pages", type=int, default=200, help="İmleçle art arda okunan sayfa sayısı")
+    parser.add_argument("--skip-legacy", action="store_true", help="Sayfalamasız eski listeyi atla")
+    args = parser.parse_args()
+
+    call_command("migrate", verbosity=0)
+    started = time.perf_counter()
+    populate(args.users)
+    admin = CustomUser.objects.create_user(username="bench-admin", email="admin@example.com",
+                                           password="x", is_staff=True)
+    print(f"{args.users} kullanıcı {time.perf_counter() - started:.1f} s'de yazıldı")
+
+    client = Client(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(admin)}")
+
+    def first_page():
+        response = client.get("/api/users/")
+        return f"{len(response.json()['results'])} satır"
+
+    def walk_pages():
+        latencies, url = [], "/api/users/"
+        for _ in range(args.pages):
+            request_started = time.perf_counter()
+            body = client.get(url).json()
+            latencies.append((time.perf_counter() - request_started) * 1000)
+            url = body["next"]
+        return f"{args.pages} sayfa, p50 {percentile(latencies, 50):.2f} ms, p99 {percentile(latencies, 99):.2f} ms"
+
+    def projected_page():
+        response = client.get("/api/users/", {"fields": "email", "page_size": 500})
+        return f"{len(response.json()['results'])} satır, alanlar: {sorted(response.json()['results'][0])}"
+
+    def export():
+        response = client.get("/api/users/export/")
+        lines = size = 0
+        for chunk in response.streaming_content:
+            lines += chunk.count(b"\n")
+            size += len(chunk)
+        return f"{lines} satır, {size / 1e6:.1f} MB"
+
+    def legacy():
+        response = client.get("/legacy/users/")
+        return f"{len(response.content) / 1e6:.1f} MB yanıt"
+
+    print(f"\n{'senaryo':<40}{'süre ms':>12}{'+RSS MB':>14}")
+    measure("ilk sayfa (50)", first_page)
+    measure("imleçle art arda sayfalar (50)", walk_pages)
+    measure("?fields=email&page_size=500", projected_page)
+    measure("NDJSON dışa aktarım (tüm tablo)", export)
+    if not args.skip_legacy:
+        measure("eski: sayfalamasız tüm tablo", legacy)
+
+
+if __name__ == "__main__":
+    main()
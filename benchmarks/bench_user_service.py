@@ -0,0 +1,108 @@
+"""user_service: giriş (token obtain) ve /api/users/me/ maliyetini süreç içinde ölçer.
+
+İstekler django.test.Client ile tüm middleware zincirinden geçer; veritabanı geçici bir
+SQLite dosyasıdır ve DEBUG kapalıdır. Giriş senaryoları farklı PBKDF2 tur sayılarıyla
+(PASSWORD_HASH_ITERATIONS), /me/ senaryoları ise veritabanından okuyan JWTAuthentication ile
+önbellekli CachedJWTAuthentication arasında karşılaştırılır. PostgreSQL'de istek başına
+kazanılan sorgu bir ağ turudur; tabloda istek başına sorgu sayısı da verilir.
+
+    python benchmarks/bench_user_service.py --logins 20 --requests 5000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from common import print_table, summarize
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+os.environ["DJANGO_SETTINGS_MODULE"] = "user_service.settings"
+os.environ["DJANGO_DEBUG"] = "false"
+os.environ["DJANGO_ALLOWED_HOSTS"] = "testserver"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.pop("DB_URL", None)
+sys.path.insert(0, os.path.join(ROOT, "user_service"))
+sys.path.append(ROOT)  # shared/
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+django.setup()
+settings.DATABASES["default"]["NAME"] = os.path.join(tempfile.mkdtemp(), "bench_users.db")
+
+from django.contrib.auth.hashers import get_hasher, make_password  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from rest_framework_simplejwt.authentication import JWTAuthentication  # noqa: E402
+
+from users.authentication import CachedJWTAuthentication  # noqa: E402
+from users.models import CustomUser  # noqa: E402
+from users.views import UserViewSet  # noqa: E402
+
+PASSWORD = "bench-password-123"
+
+
+def timed_requests(send, count):
+    latencies = []
+    started = time.perf_counter()
+    with CaptureQueriesContext(connection) as queries:
+        for _ in range(count):
+            request_started = time.perf_counter()
+            response = send()
+            latencies.append(time.perf_counter() - request_started)
+            assert response.status_code == 200, response.content
+    summary = summarize(latencies, time.perf_counter() - started)
+    summary["queries_per_request"] = round(len(queries.captured_queries) / count, 2)
+    return summary
+
+
+def bench_login(client, iterations, count):
+    # Parola hedef tur sayısıyla saklanır; böylece girişte yeniden hash'leme (must_update) olmaz
+    hasher = get_hasher("default")
+    hasher.iterations = iterations
+    CustomUser.objects.filter(username="bench").update(password=make_password(PASSWORD, hasher="default"))
+    return timed_requests(
+        lambda: client.post("/api/token/", {"username": "bench", "password": PASSWORD}), count)
+
+
+def bench_me(client, authentication_class, token, count):
+    UserViewSet.authentication_classes = [authentication_class]
+    cache.clear()
+    headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+    client.get("/api/users/me/", **headers)  # önbelleği ısıt
+    return timed_requests(lambda: client.get("/api/users/me/", **headers), count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--iterations", default="1000000,260000,100000",
+                        help="Virgülle ayrılmış PBKDF2 tur sayıları")
+    args = parser.parse_args()
+
+    call_command("migrate", verbosity=0)
+    CustomUser.objects.create_user(username="bench", email="bench@example.com", password=PASSWORD)
+    client = Client()
+
+    rows = []
+    for iterations in (int(value) for value in args.iterations.split(",")):
+        rows.append({"name": f"giriş, PBKDF2 {iterations}", **bench_login(client, iterations, args.logins)})
+
+    token = client.post("/api/token/", {"username": "bench", "password": PASSWORD}).json()["access"]
+    for name, authentication_class in (("/me/ JWTAuthentication", JWTAuthentication),
+                                       ("/me/ CachedJWTAuthentication", CachedJWTAuthentication)):
+        rows.append({"name": name, **bench_me(client, authentication_class, token, args.requests)})
+
+    print_table("user_service (süreç içi, tek iş parçacığı)", rows)
+    print()
+    for row in rows:
+        print(f"{row['name']:<32}istek başına sorgu: {row['queries_per_request']}")
+
+
+if __name__ == "__main__":
+    main()
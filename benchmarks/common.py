@@ -0,0 +1,52 @@
+import statistics
+import time
+import uuid
+
+# Kimlik doğrulaması isteyen uç noktalar için: servis JWT_SIGNING_KEY=BENCH_JWT_KEY ile başlatılır
+BENCH_JWT_KEY = "benchmark-signing-key-not-for-production"
+
+
+def percentile(values, pct):
+    """Sıralı olmayan bir listeden yüzdelik değeri döndürür (en yakın sıra yöntemi)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(latencies, elapsed):
+    """Saniye cinsinden gecikmelerden milisaniyelik özet üretir."""
+    ms = [value * 1000 for value in latencies]
+    return {
+        "requests": len(ms),
+        "throughput_rps": round(len(ms) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(ms), 3) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+    }
+
+
+def print_table(title, rows):
+    """Her satırı {"name": ..., <özet alanları>} olan sonuçları tablo olarak basar."""
+    print(f"\n{title}")
+    print(f"{'senaryo':<32}{'istek':>8}{'rps':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for row in rows:
+        print(
+            f"{row['name']:<32}{row['requests']:>8}{row['throughput_rps']:>12}"
+            f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+        )
+
+
+def access_token(user_id=1, key=BENCH_JWT_KEY, lifetime=3600):
+    """user_service'in (simplejwt) ürettiği biçimde bir erişim belirteci."""
+    import jwt
+
+    now = int(time.time())
+    claims = {"token_type": "access", "exp": now + lifetime, "iat": now, "jti": uuid.uuid4().hex, "user_id": user_id}
+    return jwt.encode(claims, key, algorithm="HS256")
+
+
+def auth_headers(user_id=1):
+    return {"Authorization": f"Bearer {access_token(user_id)}"}
@@ -0,0 +1,362 @@
+"""car_service ve booking_service'i yerel yedeklerle ayağa kaldırıp bir istek izini (trace) oynatır.
+
+Redis yerine fakeredis, Elasticsearch yerine bellek içi bir arama yedeği (standins.py),
+RabbitMQ yerine bellek içi bir broker, PostgreSQL yerine geçici bir SQLite dosyası
+kullanılır (`--car-db-url`/`--booking-db-url` ile gerçek veya gömülü bir PostgreSQL
+verilebilir). Her servis kendi alt sürecinde, kendi lifespan'i ve uygulamasıyla
+çalışır; istekler httpx ASGITransport ile süreç içinde gönderilir.
+
+İz, satır başına bir JSON nesnesi olan bir dosyadır (requests.jsonl gibi):
+
+    {"op": "list", "limit": 20}
+    {"op": "filter", "car_name": "bmw", "min_price": 100, "max_price": 900}
+    {"op": "detail", "car_id": 42}
+    {"op": "reserve", "car_id": 42, "start_date": "2030-01-03", "end_date": "2030-01-06"}
+
+`--trace` verilmezse `--seed` ile tekrarlanabilir bir iz üretilir (`--save-trace` ile
+saklanabilir). Sonuçlar commit bilgisiyle JSON olarak benchmarks/results/ altına yazılır
+(dizin .gitignore'dadır, çalışma ağacını kirletmez); `--compare` önceki bir sonuç dosyasıyla
+uç nokta başına farkları gösterir.
+
+    python benchmarks/loadtest.py --requests 5000 --concurrency 32
+    python benchmarks/loadtest.py --compare benchmarks/results/loadtest-<commit>.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta, timezone
+
+from common import BENCH_JWT_KEY, auth_headers, print_table, summarize
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+CARS_JSON = os.path.join(ROOT, "car_service", "cars.json")
+
+SERVICE_OPS = {
+    "car_service": ("list", "filter", "detail"),
+    "booking_service": ("reserve",),
+}
+DEFAULT_MIX = "list=0.3,filter=0.3,detail=0.3,reserve=0.1"
+# Rezervasyon tarihleri bu günden itibaren seçilir; geçmişe düşmesin diye ileri bir tarih
+RESERVE_EPOCH = date(2030, 1, 1)
+CAR_COLUMNS = [
+    "id", "company", "car_name", "engine", "total_speed", "performance_0_100_kmh",
+    "daily_price", "fuel_type", "seats", "torque", "is_available",
+]
+COMPARE_FIELDS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def load_catalog():
+    with open(CARS_JSON, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        op, _, weight = part.partition("=")
+        if op not in {op for ops in SERVICE_OPS.values() for op in ops}:
+            raise ValueError(f"Bilinmeyen işlem: {op}")
+        mix[op] = float(weight)
+    return mix
+
+
+def generate_trace(requests, seed, mix, catalog):
+    """Katalogdaki markalar, fiyatlar ve id'lerle tekrarlanabilir bir iz üretir."""
+    rng = random.Random(seed)
+    companies = sorted({car["company"] for car in catalog})
+    prices = sorted(car["daily_price"] for car in catalog)
+    car_ids = [car["id"] for car in catalog]
+    ops, weights = zip(*mix.items())
+
+    trace = []
+    for op in rng.choices(ops, weights, k=requests):
+        if op == "list":
+            trace.append({"op": op, "limit": 20})
+        elif op == "filter":
+            low = rng.choice(prices)
+            entry = {"op": op, "car_name": rng.choice(companies).lower(), "limit": 20}
+            if rng.random() < 0.5:
+                entry.update(min_price=low, max_price=low + rng.choice([100, 500, 2000]))
+            trace.append(entry)
+        elif op == "detail":
+            trace.append({"op": op, "car_id": rng.choice(car_ids)})
+        else:
+            start = RESERVE_EPOCH + timedelta(days=rng.randrange(180))
+            trace.append({
+                "op": op, "car_id": rng.choice(car_ids), "start_date": start.isoformat(),
+                "end_date": (start + timedelta(days=rng.randint(1, 7))).isoformat(),
+            })
+    return trace
+
+
+def read_trace(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_trace(path, trace):
+    with open(path, "w", encoding="utf-8") as f:
+        for entry in trace:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def build_request(entry):
+    """İz satırını (method, url, params, json) olarak döndürür."""
+    op = entry["op"]
+    if op == "list":
+        return "GET", "/cars/", {"limit": entry.get("limit", 20)}, None
+    if op == "filter":
+        params = {key: entry[key] for key in ("car_name", "min_price", "max_price", "limit") if key in entry}
+        return "GET", "/cars/", params, None
+    if op == "detail":
+        return "GET", f"/cars/{entry['car_id']}", None, None
+    if op == "reserve":
+        body = {key: entry[key] for key in ("car_id", "start_date", "end_date")}
+        return "POST", "/api/v1/booking/reserve", None, body
+    raise ValueError(f"Bilinmeyen işlem: {op}")
+
+
+async def replay(app, entries, concurrency):
+    """İzi `concurrency` eşzamanlı istemciyle sırayla oynatır; işlem başına sonuçları döndürür."""
+    import httpx
+
+    results = defaultdict(lambda: {"latencies": [], "statuses": Counter()})
+    position = iter(entries)
+
+    async def client_loop(client):
+        for entry in position:
+            method, url, params, body = build_request(entry)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, params=params, json=body)
+                status = str(response.status_code)
+            except Exception as e:
+                status = type(e).__name__
+            results[entry["op"]]["latencies"].append(time.perf_counter() - started)
+            results[entry["op"]]["statuses"][status] += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60,
+                                 headers=auth_headers()) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for op, result in sorted(results.items()):
+        statuses = result["statuses"]
+        # 409 (araç dolu) beklenen bir sonuçtur; 5xx ve bağlantı hataları hata sayılır
+        errors = sum(count for status, count in statuses.items() if not status.isdigit() or int(status) >= 500)
+        endpoints[op] = {**summarize(result["latencies"], elapsed), "errors": errors, "statuses": dict(statuses)}
+    return {"elapsed_s": round(elapsed, 3), "endpoints": endpoints}
+
+
+async def run_car_service(entries, args):
+    os.environ["DB_URL"] = args.car_db_url
+    sys.path.insert(0, os.path.join(ROOT, "car_service"))
+    sys.path.append(ROOT)
+
+    import fakeredis.aioredis
+    import main
+    import models
+    from shared import metrics
+    from standins import StandInElasticsearch
+
+    catalog = load_catalog()
+    search = StandInElasticsearch(
+        [{name: car.get(name) for name in main.LIST_SOURCE_FIELDS} for car in catalog], args.es_latency_ms
+    )
+    server = fakeredis.FakeServer()
+
+    class LoadTestRedis(fakeredis.aioredis.FakeRedis):
+        def __init__(self, *a, **kwargs):
+            super().__init__(server=server, decode_responses=kwargs.get("decode_responses", False))
+
+    main.AsyncElasticsearch = lambda *a, **kwargs: search
+    main.TimedRedis = metrics.timed_redis(LoadTestRedis, "car_service")
+
+    async with main.app.router.lifespan_context(main.app):
+        async with main.SessionLocal() as db:
+            await db.execute(models.Car.__table__.delete())
+            db.add_all([models.Car(**{name: car.get(name) for name in CAR_COLUMNS}) for car in catalog])
+            await db.commit()
+        report = await replay(main.app, entries, args.concurrency)
+    report["es_searches"] = search.searches
+    return report
+
+
+async def run_booking_service(entries, args):
+    os.environ["DB_URL"] = args.booking_db_url
+    os.environ["JWT_SIGNING_KEY"] = BENCH_JWT_KEY
+    sys.path.insert(0, os.path.join(ROOT, "booking_service"))
+    sys.path.append(ROOT)
+
+    import main
+    from models import Booking, BookingOutbox
+    from standins import StandInBroker
+
+    broker = StandInBroker(args.amqp_latency_ms)
+    main.connect_robust = broker.connect
+
+    async with main.app.router.lifespan_context(main.app):
+        async with main.SessionLocal() as db:
+            await db.execute(BookingOutbox.__table__.delete())
+            await db.execute(Booking.__table__.delete())
+            await db.commit()
+        main.availability_index.schedules.clear()
+        report = await replay(main.app, entries, args.concurrency)
+        # Aktarıcının kalan olayları yayınlaması beklenir
+        deadline = time.monotonic() + 10
+        while broker.published() < report["endpoints"].get("reserve", {}).get("statuses", {}).get("201", 0):
+            if time.monotonic() > deadline:
+                break
+            await asyncio.sleep(0.05)
+    report["events_published"] = broker.published()
+    return report
+
+
+def run_child(args):
+    """Tek bir servisi bu süreçte çalıştırır; servislerin modül adları (main, models) çakışır."""
+    entries = [entry for entry in read_trace(args.trace) if entry["op"] in SERVICE_OPS[args.child]]
+    runner = run_car_service if args.child == "car_service" else run_booking_service
+    report = asyncio.run(runner(entries, args))
+    with open(args.result_file, "w", encoding="utf-8") as f:
+        json.dump(report, f)
+
+
+def git_info():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+
+def compare(baseline, current, threshold):
+    """Uç nokta başına yüzde farklarını basar; eşiği aşan kötüleşmeleri döndürür."""
+    regressions = []
+    print(f"\nKarşılaştırma: {baseline['meta'].get('commit')} -> {current['meta'].get('commit')}")
+    print(f"{'uç nokta':<32}" + "".join(f"{field:>16}" for field in COMPARE_FIELDS))
+    for service, report in current["services"].items():
+        for op, summary in report["endpoints"].items():
+            before = baseline.get("services", {}).get(service, {}).get("endpoints", {}).get(op)
+            if before is None:
+                continue
+            cells = []
+            for field in COMPARE_FIELDS:
+                change = (summary[field] - before[field]) / before[field] * 100 if before[field] else 0.0
+                cells.append(f"{change:>+15.1f}%")
+                # Verimde düşüş, gecikmede artış kötüleşmedir
+                worse = -change if field == "throughput_rps" else change
+                if worse > threshold:
+                    regressions.append(f"{service}/{op} {field} {change:+.1f}%")
+            print(f"{service + '/' + op:<32}" + "".join(cells))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trace", help="Oynatılacak iz (JSON satırları); verilmezse üretilir")
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Üretilen izde işlem ağırlıkları")
+    parser.add_argument("--save-trace", help="Üretilen izin yazılacağı dosya")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--services", nargs="+", default=list(SERVICE_OPS), choices=list(SERVICE_OPS))
+    parser.add_argument("--car-db-url", help="Varsayılan: geçici SQLite dosyası")
+    parser.add_argument("--booking-db-url", help="Varsayılan: geçici SQLite dosyası")
+    parser.add_argument("--es-latency-ms", type=float, default=1.0, help="Arama yedeğinin ağ turu")
+    parser.add_argument("--amqp-latency-ms", type=float, default=1.0, help="Broker onay gecikmesi")
+    parser.add_argument("--out", help="Sonuç dosyası; varsayılan benchmarks/results/loadtest-<commit>.json")
+    parser.add_argument("--compare", help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Kötüleşme eşiği (%%)")
+    parser.add_argument("--child", choices=list(SERVICE_OPS), help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    workdir = tempfile.mkdtemp(prefix="loadtest-")
+    if args.trace:
+        trace_path, trace = args.trace, read_trace(args.trace)
+    else:
+        trace = generate_trace(args.requests, args.seed, parse_mix(args.mix), load_catalog())
+        trace_path = args.save_trace or os.path.join(workdir, "trace.jsonl")
+        write_trace(trace_path, trace)
+
+    db_urls = {
+        "car_service": args.car_db_url or f"sqlite:///{os.path.join(workdir, 'car.db')}",
+        "booking_service": args.booking_db_url or f"sqlite:///{os.path.join(workdir, 'booking.db')}",
+    }
+    services = {}
+    # Servisler sırayla çalışır; aynı anda çalışıp CPU için yarışmazlar
+    for service in args.services:
+        if not any(entry["op"] in SERVICE_OPS[service] for entry in trace):
+            continue
+        result_file = os.path.join(workdir, f"{service}.json")
+        command = [
+            sys.executable, os.path.abspath(__file__), "--child", service, "--trace", trace_path,
+            "--result-file", result_file, "--concurrency", str(args.concurrency),
+            "--car-db-url", db_urls["car_service"], "--booking-db-url", db_urls["booking_service"],
+            "--es-latency-ms", str(args.es_latency_ms), "--amqp-latency-ms", str(args.amqp_latency_ms),
+        ]
+        env = {**os.environ, "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING")}
+        subprocess.run(command, cwd=HERE, env=env, check=True)
+        with open(result_file, encoding="utf-8") as f:
+            services[service] = json.load(f)
+
+    result = {
+        "meta": {
+            **git_info(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "trace": args.trace or f"generated(seed={args.seed}, mix={args.mix})",
+            "requests": len(trace),
+            "concurrency": args.concurrency,
+            "es_latency_ms": args.es_latency_ms,
+            "amqp_latency_ms": args.amqp_latency_ms,
+        },
+        "services": services,
+    }
+
+    out = args.out or os.path.join(HERE, "results", f"loadtest-{(result['meta']['commit'] or 'nogit')[:10]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+
+    for service, report in services.items():
+        print_table(f"{service} ({report['elapsed_s']} sn)",
+                    [{"name": op, **summary} for op, summary in report["endpoints"].items()])
+        errors = {op: summary["errors"] for op, summary in report["endpoints"].items() if summary["errors"]}
+        if errors:
+            print(f"hatalar: {errors}")
+    print(f"\nSonuçlar: {out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, result, args.threshold)
+        if regressions:
+            print(f"\n%{args.threshold:g} eşiğini aşan kötüleşmeler:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Yük testleri için Elasticsearch ve RabbitMQ yerine geçen bellek içi yedekler (stand-in).
+
+Redis için fakeredis, PostgreSQL için SQLite (veya verilen bir PostgreSQL URL'si)
+kullanılır. Yedekler yalnızca servislerin kullandığı API yüzeyini uygular; ağ turu
+`latency_ms` ile taklit edilir.
+"""
+import asyncio
+import time
+
+from elasticsearch.exceptions import NotFoundError
+
+
+def _tokens(text):
+    return str(text or "").lower().split()
+
+
+def _edit_distance_at_most_one(a, b):
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = j = edits = 0
+    while i < len(a) and j < len(b):
+        if a[i] == b[j]:
+            i += 1
+        else:
+            edits += 1
+            if edits > 1:
+                return False
+            if len(a) == len(b):
+                i += 1
+        j += 1
+    return edits + (len(a) - i) + (len(b) - j) <= 1
+
+
+def _match_score(query, value):
+    """`match` + `fuzziness: AUTO` yaklaşığı: eşleşen kelime sayısı (1 harf hataya izin verilir)."""
+    words = _tokens(value)
+    score = 0.0
+    for token in _tokens(query):
+        for word in words:
+            if word == token:
+                score += 1.0
+                break
+            if len(token) > 2 and _edit_distance_at_most_one(token, word):
+                score += 0.5
+                break
+    return score
+
+
+class StandInElasticsearch:
+    """`cars` indeksi için AsyncElasticsearch.search alt kümesi: match, range, sort, search_after."""
+
+    def __init__(self, documents, latency_ms=0.0):
+        self.documents = sorted(documents, key=lambda doc: doc["id"])
+        self.latency = latency_ms / 1000
+        self.searches = 0
+
+    async def search(self, index, body, size=10):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.run_search(index, body, size)
+
+    def run_search(self, index, body, size):
+        self.searches += 1
+        if index != "cars":
+            raise NotFoundError(404, "index_not_found_exception", {})
+
+        query = body.get("query", {"match_all": {}})
+        must = query.get("bool", {}).get("must", [])
+        filters = query.get("bool", {}).get("filter", [])
+        sort_by_score = any("_score" in field for field in body.get("sort", []))
+
+        hits = []
+        for doc in self.documents:
+            score = 1.0
+            for clause in must:
+                field, spec = next(iter(clause["match"].items()))
+                score = _match_score(spec["query"], doc.get(field))
+                if not score:
+                    break
+            if not score:
+                continue
+            if not all(self._in_range(doc, clause["range"]) for clause in filters):
+                continue
+            hits.append((-score if sort_by_score else 0.0, doc["id"], score, doc))
+
+        hits.sort(key=lambda hit: hit[:2])
+        search_after = body.get("search_after")
+        if search_after:
+            after = (-search_after[0], search_after[1]) if sort_by_score else (0.0, search_after[0])
+            hits = [hit for hit in hits if hit[:2] > after]
+
+        fields = body.get("_source")
+        return {"hits": {"hits": [
+            {
+                "_id": str(doc["id"]),
+                "_score": score,
+                "_source": {name: doc.get(name) for name in fields} if fields else dict(doc),
+                "sort": [score, doc["id"]] if sort_by_score else [doc["id"]],
+            }
+            for _, _, score, doc in hits[:size]
+        ]}}
+
+    @staticmethod
+    def _in_range(doc, clause):
+        field, bounds = next(iter(clause.items()))
+        value = doc.get(field)
+        if value is None:
+            return False
+        return value >= bounds.get("gte", value) and value <= bounds.get("lte", value)
+
+    async def close(self):
+        pass
+
+
+class StandInSyncElasticsearch(StandInElasticsearch):
+    """Elasticsearch (senkron istemci) karşılığı; ağ turu çağıran iş parçacığını bloklar."""
+
+    def search(self, index, body, size=10):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.run_search(index, body, size)
+
+    def close(self):
+        pass
+
+
+class StandInExchange:
+    """Her yayını `latency_ms` sonra onaylayan exchange (publisher confirms)."""
+
+    def __init__(self, name, latency):
+        self.name = name
+        self.latency = latency
+        self.published = []
+
+    async def publish(self, message, routing_key, timeout=None):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.published.append((routing_key, message.body))
+
+
+class StandInQueue:
+    """Tanımlanan kuyruklar; yük testinde servislere mesaj gelmez, yalnızca tüketici kaydı tutulur."""
+
+    def __init__(self, name):
+        self.name = name
+        self.consumers = []
+
+    async def bind(self, exchange, routing_key=None):
+        pass
+
+    async def consume(self, callback, **kwargs):
+        self.consumers.append(callback)
+
+
+class StandInChannel:
+    def __init__(self, broker):
+        self.broker = broker
+
+    async def declare_exchange(self, name, *args, **kwargs):
+        return self.broker.exchanges.setdefault(name, StandInExchange(name, self.broker.latency))
+
+    async def declare_queue(self, name, *args, **kwargs):
+        return self.broker.queues.setdefault(name, StandInQueue(name))
+
+    async def set_qos(self, **kwargs):
+        pass
+
+    async def close(self):
+        pass
+
+
+class StandInBroker:
+    """aio_pika.connect_robust yerine geçer: `connect_robust = broker.connect`."""
+
+    def __init__(self, latency_ms=0.0):
+        self.latency = latency_ms / 1000
+        self.exchanges = {}
+        self.queues = {}
+
+    async def connect(self, url=None, **kwargs):
+        return self
+
+    async def channel(self, **kwargs):
+        return StandInChannel(self)
+
+    async def close(self):
+        pass
+
+    def published(self):
+        return sum(len(exchange.published) for exchange in self.exchanges.values())
@@ -0,0 +1,76 @@
+import asyncio
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+
+class CarSchedule:
+    """Bir aracın çakışmayan [start, end) rezervasyon aralıkları, başlangıca göre sıralı.
+
+    Aralıklar birbirine değmediği için başlangıca göre sıralama bitişe göre de
+    sıralamadır; bu yüzden çakışma kontrolü iki ikili aramayla O(log n)'dir.
+    """
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.booking_ids = []
+
+    def conflicts(self, start, end):
+        """[start, end) ile kesişen rezervasyonları (booking_id, start, end) olarak döndürür."""
+        first = bisect_right(self.ends, start)
+        last = bisect_left(self.starts, end)
+        return [
+            (self.booking_ids[i], self.starts[i], self.ends[i])
+            for i in range(first, last)
+        ]
+
+    def is_free(self, start, end):
+        i = bisect_left(self.starts, end) - 1
+        return i < 0 or self.ends[i] <= start
+
+    def add(self, start, end, booking_id):
+        i = bisect_left(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.booking_ids.insert(i, booking_id)
+
+
+class AvailabilityIndex:
+    """car_id başına rezervasyon takvimi ve aynı araç için kontrol+ekleme kilidi."""
+
+    def __init__(self):
+        self.schedules = defaultdict(CarSchedule)
+        # car_id -> [kilit, kilidi tutan ya da bekleyen sayısı]; son kullanan çıkınca silinir
+        self.locks = {}
+
+    @asynccontextmanager
+    async def lock_for(self, car_id):
+        entry = self.locks.get(car_id)
+        if entry is None:
+            entry = self.locks[car_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self.locks[car_id]
+
+    def is_free(self, car_id, start, end):
+        schedule = self.schedules.get(car_id)
+        return schedule is None or schedule.is_free(start, end)
+
+    def conflicts(self, car_id, start, end):
+        schedule = self.schedules.get(car_id)
+        return schedule.conflicts(start, end) if schedule else []
+
+    def add(self, car_id, start, end, booking_id):
+        self.schedules[car_id].add(start, end, booking_id)
+
+    def load(self, bookings):
+        """Veritabanındaki iptal edilmemiş rezervasyonlarla indeksi doldurur."""
+        self.schedules.clear()
+        for booking in bookings:
+            self.add(booking.car_id, booking.start_date, booking.end_date, booking.id)
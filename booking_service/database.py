@@ -1,6 +1,8 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import declarative_base
+
+from shared.db import async_url, engine_options, instrument_pool, instrument_queries
 
 # Docker Compose'dan gelen ortam değişkenini okuyun
 SQLALCHEMY_DATABASE_URL = os.getenv("DB_URL")
@@ -9,14 +11,16 @@ SQLALCHEMY_DATABASE_URL = os.getenv("DB_URL")
 if not SQLALCHEMY_DATABASE_URL:
     raise RuntimeError("DB_URL environment variable is not set")
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# İstek yolu asenkron çalışır; aynı URL asenkron sürücüyle açılır. Havuz ayarları
+# DB_POOL_* ortam değişkenlerinden okunur (bkz. shared/db.py)
+ASYNC_DATABASE_URL = async_url(SQLALCHEMY_DATABASE_URL)
+engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, "booking_service"))
+instrument_pool(engine, "booking_service")
+instrument_queries(engine, "booking_service")
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
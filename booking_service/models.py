@@ -1,6 +1,8 @@
 # booking_service/models.py
 
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey, DDL, event, func, text, inspect
+from sqlalchemy.schema import AddConstraint
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -10,6 +12,61 @@ class Booking(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer)  # Kullanıcı servisi ile ilişki
     car_id = Column(Integer)    # Araba servisi ile ilişki
-    start_date = Column(String)
-    end_date = Column(String)
-    status = Column(String, default="pending") # Örnek: "pending", "confirmed", "cancelled"
\ No newline at end of file
+    start_date = Column(Date, nullable=False)  # Dahil
+    end_date = Column(Date, nullable=False)    # Hariç: [start_date, end_date)
+    status = Column(String, default="pending") # Örnek: "pending", "confirmed", "cancelled"
+
+    __table_args__ = (
+        # Aynı araç için iptal edilmemiş rezervasyonlar çakışamaz. GiST indeksi
+        # çakışma sorgularını da O(log n) yapar. Yalnızca PostgreSQL'de oluşturulur;
+        # SQLite'ta aynı garantiyi availability.AvailabilityIndex verir.
+        ExcludeConstraint(
+            (car_id, "="),
+            (func.daterange(start_date, end_date, "[)"), "&&"),
+            name="bookings_no_overlap",
+            using="gist",
+            where=text("status <> 'cancelled'"),
+        ).ddl_if(dialect="postgresql"),
+    )
+
+# Tamsayı eşitliğini GiST indeksinde kullanabilmek için gerekli
+event.listen(
+    Booking.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
+
+def upgrade_booking_schema(connection):
+    """create_all mevcut tabloyu değiştirmez; eski kurulumları (metin tarihler, kısıtsız) günceller.
+
+    Her adım yalnızca gerekiyorsa çalışır. Aynı anda açılan worker'lar advisory kilitle sıralanır.
+    Çakışan eski rezervasyonlar varsa kısıt eklenemez ve servis açılmaz; önce bunlar iptal edilmelidir.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    connection.execute(text("SELECT pg_advisory_xact_lock(hashtext('bookings_schema_upgrade'))"))
+    connection.execute(DDL("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+
+    columns = {column["name"]: column for column in inspect(connection).get_columns("bookings")}
+    for name in ("start_date", "end_date"):
+        if not isinstance(columns[name]["type"], Date):
+            connection.execute(text(f"ALTER TABLE bookings ALTER COLUMN {name} TYPE DATE USING {name}::date"))
+        if columns[name]["nullable"]:
+            connection.execute(text(f"ALTER TABLE bookings ALTER COLUMN {name} SET NOT NULL"))
+
+    existing = connection.execute(
+        text("SELECT 1 FROM pg_constraint WHERE conname = 'bookings_no_overlap'")
+    ).first()
+    if existing is None:
+        exclusion = next(c for c in Booking.__table__.constraints if c.name == "bookings_no_overlap")
+        connection.execute(AddConstraint(exclusion))
+
+class BookingOutbox(Base):
+    # Rezervasyon olayları aynı işlemde buraya yazılır; outbox.OutboxRelay RabbitMQ'ya aktarır
+    __tablename__ = "booking_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    booking_id = Column(Integer, nullable=False)
+    payload = Column(Text, nullable=False)  # JSON mesaj gövdesi
+    created_at = Column(DateTime, server_default=func.now())
+    claimed_until = Column(DateTime, nullable=True)  # Bir worker yayınlarken dolu
@@ -0,0 +1,146 @@
+import json
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from aio_pika import Message, DeliveryMode
+from sqlalchemy import select, delete, update, or_
+
+from database import SessionLocal
+from models import BookingOutbox
+from config import settings
+from shared import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def booking_event(booking):
+    """booking_exchange'e yayınlanacak mesaj gövdesi; ORM nesnesi veya RETURNING satırı alır."""
+    return {
+        "booking_id": booking.id,
+        "user_id": booking.user_id,
+        "car_id": booking.car_id,
+        "start_date": booking.start_date.isoformat(),
+        "end_date": booking.end_date.isoformat(),
+        "status": booking.status,
+    }
+
+
+def enqueue(db, booking):
+    """Olayı rezervasyonla aynı işlemde outbox'a ekler; commit'i çağıran yapar."""
+    db.add(BookingOutbox(booking_id=booking.id, payload=json.dumps(booking_event(booking))))
+
+
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def settle_and_claim(published_ids, failed_ids, limit):
+    """Önceki partiyi kapatır ve yenisini talep eder; ikisi tek işlemde yapılır.
+
+    Onaylanan kayıtlar silinir, yayınlanamayanlar serbest bırakılır. Ardından
+    yayınlanmamış ve başka bir worker'ca tutulmayan en eski kayıtlar talep edilir.
+    """
+    async with SessionLocal() as db:
+        if published_ids:
+            await db.execute(delete(BookingOutbox).where(BookingOutbox.id.in_(published_ids)))
+        if failed_ids:
+            await db.execute(
+                update(BookingOutbox)
+                .where(BookingOutbox.id.in_(failed_ids))
+                .values(claimed_until=None)
+            )
+
+        rows = []
+        if limit:
+            now = utcnow()
+            rows = (await db.execute(
+                select(BookingOutbox)
+                .where(or_(BookingOutbox.claimed_until.is_(None), BookingOutbox.claimed_until < now))
+                .where(BookingOutbox.id.notin_(failed_ids))
+                .order_by(BookingOutbox.id)
+                .limit(limit)
+                # Diğer worker'lar kilitli satırları beklemeden atlar
+                .with_for_update(skip_locked=True)
+            )).scalars().all()
+            for row in rows:
+                row.claimed_until = now + timedelta(seconds=settings.OUTBOX_CLAIM_SECONDS)
+        await db.commit()
+        return [(row.id, row.booking_id, row.payload) for row in rows]
+
+
+class OutboxRelay:
+    """Outbox'ı booking_exchange'e publisher confirm ile, partiler halinde aktarır.
+
+    Kayıt ancak broker onayladıktan sonra silinir; bu yüzden teslimat en az bir
+    kezdir ve tüketiciler booking_id üzerinden tekrarları ayıklamalıdır.
+    """
+
+    def __init__(self, exchange, batch_size=None, max_in_flight=None):
+        self.exchange = exchange
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        # Onay bekleyen mesaj sayısını sınırlar
+        self.in_flight = asyncio.Semaphore(max_in_flight or settings.OUTBOX_MAX_IN_FLIGHT)
+        self.wakeup = asyncio.Event()
+        self.published = 0
+
+    def notify(self):
+        """Yeni bir rezervasyon commit edildiğinde aktarıcıyı hemen uyandırır."""
+        self.wakeup.set()
+
+    async def publish(self, outbox_id, booking_id, payload):
+        message = Message(
+            body=payload.encode(),
+            content_type="application/json",
+            delivery_mode=DeliveryMode.PERSISTENT,
+            message_id=str(booking_id),
+        )
+        async with self.in_flight:
+            try:
+                # Kanal publisher_confirms ile açıldığı için broker onaylayınca döner
+                with metrics.timed("booking_service", "rabbitmq", "publish"):
+                    await self.exchange.publish(
+                        message, routing_key="booking.created", timeout=settings.OUTBOX_CONFIRM_TIMEOUT
+                    )
+                return True
+            except Exception as e:
+                logger.warning("Outbox kaydı yayınlanamadı.", extra={"outbox_id": outbox_id, "error": str(e)})
+                return False
+
+    async def relay(self):
+        """Outbox boşalana kadar parti parti yayınlar; yayınlanamayan kayıt varsa hata fırlatır."""
+        published_ids, failed_ids = [], []
+        while True:
+            # Yayınlanamayanlar bu turda yeniden talep edilmez; hata sonrası beklenip denenir
+            limit = 0 if failed_ids else self.batch_size
+            rows = await settle_and_claim(published_ids, failed_ids, limit)
+            self.published += len(published_ids)
+            if failed_ids:
+                raise RuntimeError(f"{len(failed_ids)} mesaj onaylanmadı")
+            if not rows:
+                return
+
+            results = await asyncio.gather(*(self.publish(*row) for row in rows))
+            published_ids = [row[0] for row, ok in zip(rows, results) if ok]
+            failed_ids = [row[0] for row, ok in zip(rows, results) if not ok]
+
+    async def run(self):
+        logger.info("Outbox aktarıcısı başladı.")
+        while True:
+            self.wakeup.clear()
+            try:
+                # Birikmiş kayıtlar dahil, outbox boşalana kadar parti parti aktar
+                await self.relay()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Outbox aktarım hatası; tekrar denenecek.",
+                             extra={"error": str(e), "retry_in": settings.OUTBOX_POLL_INTERVAL})
+                await asyncio.sleep(settings.OUTBOX_POLL_INTERVAL)
+                continue
+
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=settings.OUTBOX_POLL_INTERVAL)
+                # Art arda gelen rezervasyonlar tek partide toplansın
+                await asyncio.sleep(settings.OUTBOX_LINGER_MS / 1000)
+            except asyncio.TimeoutError:
+                pass
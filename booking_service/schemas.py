@@ -1,12 +1,13 @@
 # booking_service/schemas.py
 
+from datetime import date
 from pydantic import BaseModel
 
 class BookingBase(BaseModel):
     user_id: int
     car_id: int
-    start_date: str
-    end_date: str
+    start_date: date
+    end_date: date
 
 class BookingCreate(BookingBase):
     pass
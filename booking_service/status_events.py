@@ -0,0 +1,66 @@
+import json
+import logging
+from aio_pika import ExchangeType
+from sqlalchemy import update
+
+from database import SessionLocal
+from models import Booking
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Diğer servislerin bildirebileceği durumlar -> yalnızca bu durumdaki rezervasyona uygulanır
+ALLOWED_TRANSITIONS = {"confirmed": "pending"}
+
+
+async def apply_status_event(event):
+    """{"booking_id": ..., "status": ...} olayını uygular; aynı olay tekrar gelirse etkisizdir."""
+    new_status = event["status"]
+    if new_status not in ALLOWED_TRANSITIONS:
+        raise ValueError(f"Desteklenmeyen rezervasyon durumu: {new_status}")
+    async with SessionLocal() as db:
+        await db.execute(
+            update(Booking)
+            .where(Booking.id == int(event["booking_id"]))
+            .where(Booking.status == ALLOWED_TRANSITIONS[new_status])
+            .values(status=new_status)
+        )
+        await db.commit()
+
+
+async def handle_status_message(message):
+    """booking_status_exchange tüketicisi; bozuk mesajlar DLQ'ya, geçici hatalar bir kez kuyruğa döner."""
+    try:
+        event = json.loads(message.body)
+        await apply_status_event(event)
+    except (ValueError, KeyError, TypeError) as e:
+        logger.error("Geçersiz durum olayı DLQ'ya gönderildi.", extra={"error": str(e)})
+        await message.reject(requeue=False)
+        return
+    except Exception as e:
+        # İkinci teslimatta da başarısızsa kuyruğun x-dead-letter-exchange ayarı DLQ'ya taşır
+        logger.warning("Durum olayı uygulanamadı.", extra={"error": str(e), "redelivered": message.redelivered})
+        await message.nack(requeue=not message.redelivered)
+        return
+    await message.ack()
+
+
+async def consume_status_events(connection, prefetch=32):
+    """Durum kuyruğunu (DLQ'suyla birlikte) tanımlar ve ayrı bir kanalda tüketmeye başlar."""
+    channel = await connection.channel()
+    await channel.set_qos(prefetch_count=prefetch)
+
+    dead_letter_exchange = await channel.declare_exchange(
+        f"{settings.BOOKING_STATUS_EXCHANGE}.dlx", ExchangeType.FANOUT, durable=True
+    )
+    dead_letter_queue = await channel.declare_queue(settings.BOOKING_STATUS_DLQ, durable=True)
+    await dead_letter_queue.bind(dead_letter_exchange)
+
+    exchange = await channel.declare_exchange(settings.BOOKING_STATUS_EXCHANGE, ExchangeType.FANOUT, durable=True)
+    queue = await channel.declare_queue(
+        settings.BOOKING_STATUS_QUEUE, durable=True,
+        arguments={"x-dead-letter-exchange": dead_letter_exchange.name},
+    )
+    await queue.bind(exchange)
+    await queue.consume(handle_status_message)
+    return channel
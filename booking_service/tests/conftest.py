@@ -0,0 +1,71 @@
+"""booking_service testleri: uygulama süreç içinde, geçici bir SQLite veritabanıyla çalışır.
+
+car_service de `main` modülü kullandığından her servisin testleri ayrı çalıştırılır:
+
+    python -m pytest booking_service/tests
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+import pytest
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+TEST_JWT_KEY = "booking-service-test-signing-key-not-for-production"
+
+os.environ["DB_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'booking_test.db')}"
+os.environ["JWT_SIGNING_KEY"] = TEST_JWT_KEY
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+sys.path.insert(0, SERVICE_DIR)
+sys.path.append(os.path.join(SERVICE_DIR, ".."))  # shared/
+
+import httpx  # noqa: E402
+import jwt  # noqa: E402
+
+import main  # noqa: E402
+from database import Base, engine  # noqa: E402
+
+
+def make_token(user_id=1, lifetime=3600, **claims):
+    """user_service'in (simplejwt) ürettiği biçimde bir belirteç."""
+    now = int(time.time())
+    payload = {"token_type": "access", "exp": now + lifetime, "iat": now, "jti": uuid.uuid4().hex, "user_id": user_id}
+    payload.update(claims)
+    return jwt.encode(payload, TEST_JWT_KEY, algorithm="HS256")
+
+
+@pytest.fixture
+def token():
+    return make_token
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await engine.dispose()
+
+    asyncio.run(create())
+
+
+@pytest.fixture
+def call():
+    """İstekleri uygulamaya gönderir: `call(lambda client: client.post(...))` yanıtı döndürür."""
+    def run(request, token=None):
+        async def send():
+            headers = {"Authorization": f"Bearer {token or make_token()}"}
+            transport = httpx.ASGITransport(app=main.app)
+            try:
+                async with httpx.AsyncClient(transport=transport, base_url="http://booking", headers=headers) as client:
+                    return await request(client)
+            finally:
+                # Her asyncio.run kendi döngüsünü açar; havuzdaki bağlantılar döngüler arasında taşınmaz
+                await engine.dispose()
+
+        return asyncio.run(send())
+
+    return run
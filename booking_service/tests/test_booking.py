@@ -0,0 +1,72 @@
+RESERVE = "/api/v1/booking/reserve"
+RESERVE_BATCH = "/api/v1/booking/reserve:batch"
+
+
+def item(car_id, start, end):
+    return {"car_id": car_id, "start_date": start, "end_date": end}
+
+
+def test_overlapping_booking_is_rejected(call):
+    first = call(lambda client: client.post(RESERVE, json=item(101, "2025-03-01", "2025-03-05")))
+    assert first.status_code == 201, first.text
+
+    overlap = call(lambda client: client.post(RESERVE, json=item(101, "2025-03-04", "2025-03-08")))
+    assert overlap.status_code == 409
+
+    # Bitiş günü hariçtir: teslim günü başlayan rezervasyon çakışmaz
+    adjacent = call(lambda client: client.post(RESERVE, json=item(101, "2025-03-05", "2025-03-08")))
+    assert adjacent.status_code == 201, adjacent.text
+
+
+def test_atomic_batch_reserves_nothing_on_conflict(call):
+    assert call(lambda client: client.post(RESERVE, json=item(201, "2025-04-01", "2025-04-05"))).status_code == 201
+    items = [
+        item(201, "2025-04-03", "2025-04-06"),
+        item(202, "2025-04-03", "2025-04-06"),
+        item(202, "2025-04-05", "2025-04-07"),  # partideki önceki kalemle çakışır
+    ]
+
+    response = call(lambda client: client.post(RESERVE_BATCH, json={"items": items}))
+    assert response.status_code == 409
+    detail = response.json()["detail"]
+    assert detail["created"] == 0
+    assert [result["status"] for result in detail["results"]] == ["conflict", "ok", "conflict"]
+
+    # Reddedilen partinin "ok" kalemi ayrılmadı
+    retry = call(lambda client: client.post(RESERVE, json=item(202, "2025-04-03", "2025-04-06")))
+    assert retry.status_code == 201, retry.text
+
+
+def test_best_effort_batch_reserves_free_items(call):
+    assert call(lambda client: client.post(RESERVE, json=item(301, "2025-05-01", "2025-05-05"))).status_code == 201
+    items = [
+        item(301, "2025-05-02", "2025-05-03"),
+        item(302, "2025-05-02", "2025-05-03"),
+        item(303, "2025-05-03", "2025-05-02"),
+    ]
+
+    response = call(lambda client: client.post(RESERVE_BATCH, json={"items": items, "mode": "best_effort"}))
+    assert response.status_code == 201, response.text
+    body = response.json()
+    assert body["created"] == 1
+    assert [result["status"] for result in body["results"]] == ["conflict", "created", "invalid"]
+    assert body["results"][1]["booking_id"]
+
+
+def test_refresh_token_is_rejected(call, token):
+    refresh = token(token_type="refresh")
+    response = call(lambda client: client.post(RESERVE, json=item(401, "2025-06-01", "2025-06-02")), token=refresh)
+    assert response.status_code == 401
+
+
+def test_expired_token_is_rejected(call, token):
+    expired = token(lifetime=-60)
+    response = call(lambda client: client.post(RESERVE, json=item(402, "2025-06-01", "2025-06-02")), token=expired)
+    assert response.status_code == 401
+
+
+def test_missing_token_is_rejected(call):
+    async def request(client):
+        return await client.post(RESERVE, json=item(403, "2025-06-01", "2025-06-02"), headers={"Authorization": ""})
+
+    assert call(request).status_code == 401
@@ -0,0 +1,81 @@
+import os
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+
+# --- Tarih aralığı müsaitlik ayarları ---
+# Her gün için bir Redis bitmap'i tutulur: avail:booked:<YYYY-MM-DD>, bit ofseti = car_id.
+# 100k araçlık bir filoda bir gün ~12.5 KB'tır; bir yıl ~4.5 MB.
+BOOKED_KEY_PREFIX = "avail:booked:"
+# Tek sorguda taranabilecek en uzun aralık (gün)
+MAX_RANGE_DAYS = int(os.getenv("AVAILABILITY_MAX_DAYS", "365"))
+# Geçmiş günlerin bitmap'leri bu kadar gün sonra Redis'ten düşer
+RETENTION_DAYS = int(os.getenv("AVAILABILITY_RETENTION_DAYS", "7"))
+
+
+def day_key(day):
+    return f"{BOOKED_KEY_PREFIX}{day.isoformat()}"
+
+
+def days_in(start, end):
+    """[start, end) aralığındaki günler; teslim günü dahil değildir."""
+    for offset in range((end - start).days):
+        yield start + timedelta(days=offset)
+
+
+def validate_range(start, end):
+    if end <= start:
+        raise ValueError("end_date, start_date'ten sonra olmalı.")
+    if (end - start).days > MAX_RANGE_DAYS:
+        raise ValueError(f"Tarih aralığı en fazla {MAX_RANGE_DAYS} gün olabilir.")
+
+
+def expire_at(day):
+    return datetime.combine(day + timedelta(days=RETENTION_DAYS + 1), time.min, tzinfo=timezone.utc)
+
+
+async def mark_booked(redis, car_id, start, end, booked=True):
+    """Aracın [start, end) aralığındaki günlerini dolu (veya iptalde boş) işaretler."""
+    pipe = redis.pipeline(transaction=False)
+    for day in days_in(start, end):
+        key = day_key(day)
+        pipe.setbit(key, car_id, 1 if booked else 0)
+        pipe.expireat(key, expire_at(day))
+    await pipe.execute()
+
+
+async def booked_bitmap(redis, start, end):
+    """[start, end) aralığında en az bir gün dolu olan araçların bitmap'ini döndürür.
+
+    Günlük bitmap'ler Redis tarafında BITOP OR ile birleştirilir; istemciye yalnızca
+    filo boyutunda tek bir bitmap döner.
+    """
+    keys = [day_key(day) for day in days_in(start, end)]
+    if len(keys) == 1:
+        return await redis.get(keys[0]) or b""
+
+    # Geçici anahtar aynı MULTI içinde okunup silinir
+    scratch = f"{BOOKED_KEY_PREFIX}tmp:{uuid.uuid4().hex}"
+    pipe = redis.pipeline(transaction=True)
+    pipe.bitop("OR", scratch, *keys)
+    pipe.get(scratch)
+    pipe.delete(scratch)
+    _, bitmap, _ = await pipe.execute()
+    return bitmap or b""
+
+
+def is_booked(bitmap, car_id):
+    """Redis bit sırası: ofset 0, ilk baytın en anlamlı bitidir."""
+    index = car_id >> 3
+    if index >= len(bitmap):
+        return False
+    return bool(bitmap[index] >> (7 - (car_id & 7)) & 1)
+
+
+def parse_event(body):
+    """booking_exchange mesajını (car_id, start, end, booked) olarak çözer."""
+    return (
+        int(body["car_id"]),
+        date.fromisoformat(body["start_date"]),
+        date.fromisoformat(body["end_date"]),
+        body.get("status") != "cancelled",
+    )
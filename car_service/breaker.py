@@ -0,0 +1,90 @@
+import os
+import time
+import logging
+
+from shared.metrics import CIRCUIT_OPEN
+
+logger = logging.getLogger(__name__)
+
+# --- Devre kesici ayarları ---
+# Devrenin açılması için gereken art arda hata sayısı
+FAILURE_THRESHOLD = int(os.getenv("ES_BREAKER_FAILURES", "5"))
+# Devre açıldıktan sonra yeni bir deneme çağrısına izin verilene kadar geçen süre (saniye)
+RESET_TIMEOUT = float(os.getenv("ES_BREAKER_RESET_SECONDS", "30"))
+
+
+class CircuitOpenError(Exception):
+    """Devre açıkken çağrı yapılmadan fırlatılır."""
+
+
+class CircuitBreaker:
+    """Art arda `failure_threshold` hatadan sonra çağrıları `reset_timeout` boyunca keser.
+
+    Süre dolunca tek bir deneme çağrısına izin verilir (yarı açık): başarılıysa devre
+    kapanır, değilse süre yeniden başlar. Devre açıkken istekler bağımlılığın zaman
+    aşımını beklemeden hemen yedek yola düşer.
+    """
+
+    def __init__(self, service, dependency, failure_threshold=FAILURE_THRESHOLD,
+                 reset_timeout=RESET_TIMEOUT, healthy_errors=()):
+        self.dependency = dependency
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        # Bağımlılığın sağlıklı yanıt verdiğini gösteren hatalar (ör. ES NotFoundError)
+        self.healthy_errors = healthy_errors
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.gauge = CIRCUIT_OPEN.labels(service, dependency)
+        self.gauge.set(0)
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+    def allow(self):
+        if self.opened_at is None:
+            return True
+        if self.trial_in_flight or time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+        self.trial_in_flight = True
+        return True
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.warning("Devre kapandı.", extra={"dependency": self.dependency})
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.gauge.set(0)
+
+    def record_failure(self):
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is None and self.failures < self.failure_threshold:
+            return
+        if self.opened_at is None:
+            logger.warning("Devre açıldı; çağrılar yedek yola yönlendiriliyor.",
+                           extra={"dependency": self.dependency, "failures": self.failures,
+                                  "reset_timeout": self.reset_timeout})
+        self.opened_at = time.monotonic()
+        self.gauge.set(1)
+
+    async def call(self, fn):
+        """`fn` coroutine fonksiyonunu devre izin veriyorsa çağırır."""
+        if not self.allow():
+            raise CircuitOpenError(self.dependency)
+        try:
+            result = await fn()
+        except self.healthy_errors:
+            self.record_success()
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            # İptal edilen deneme çağrısının sonucu bilinmez; sıradaki istek yeniden dener
+            self.trial_in_flight = False
+            raise
+        self.record_success()
+        return result
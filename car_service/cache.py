@@ -0,0 +1,314 @@
+import os
+import math
+import time
+import uuid
+import random
+import asyncio
+import hashlib
+import json
+import logging
+from collections import defaultdict, OrderedDict
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# --- Önbellek yeniden oluşturma (stampede koruması) ayarları ---
+# Redis kilidinin (lease) ömrü; sahibi çökerse kilit bu süre sonunda kendiliğinden düşer
+LOCK_TIMEOUT_MS = int(os.getenv("CACHE_LOCK_TIMEOUT_MS", "10000"))
+# Kilidi alamayan isteklerin yeni değeri kontrol etme aralığı
+LOCK_POLL_INTERVAL = float(os.getenv("CACHE_LOCK_POLL_INTERVAL", "0.05"))
+# Mantıksal süresi dolan değerin Redis'te bayat (stale) olarak tutulacağı ek süre
+STALE_GRACE_SECONDS = int(os.getenv("CACHE_STALE_GRACE_SECONDS", "300"))
+# XFetch beta katsayısı; büyüdükçe erken yenileme olasılığı artar
+XFETCH_BETA = float(os.getenv("CACHE_XFETCH_BETA", "1.0"))
+
+# Katalog sürüm sayaçları: yazmalar CATALOG_VERSION_KEY'i artırır, indeksleyici
+# ES'e yansıttığı son sürümü INDEXED_VERSION_KEY'e yazar
+CATALOG_VERSION_KEY = "cars:version"
+INDEXED_VERSION_KEY = "cars:indexed_version"
+
+# --- Liste sorgusu önbelleği ---
+# Filtreli sorguların ömrü sınırlıdır: bulanık (fuzzy) eşleşmeler her etiketle yakalanamaz
+QUERY_CACHE_TTL = int(os.getenv("QUERY_CACHE_TTL", "600"))
+# Filtresiz liste her yazmada temizlendiği için daha uzun tutulabilir
+ALL_CARS_TTL = int(os.getenv("ALL_CARS_TTL", "3600"))
+# Fiyat etiketleri bu genişlikteki kovalara göre verilir
+PRICE_BUCKET_SIZE = int(os.getenv("QUERY_CACHE_PRICE_BUCKET", "500"))
+# Bundan fazla kovaya yayılan (veya açık uçlu) aralıklar tek bir "price:*" etiketi alır
+MAX_PRICE_TAGS = int(os.getenv("QUERY_CACHE_MAX_PRICE_TAGS", "8"))
+
+QUERY_KEY_PREFIX = "cars:q:"
+TAG_KEY_PREFIX = "cars:tag:"
+ALL_TAG = "all"
+ANY_PRICE_TAG = "price:*"
+
+# Etiket başına isabet/ıska sayaçları (worker başına)
+TAG_STATS = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+# --- get_car için worker içi L1 önbellek ---
+L1_CACHE_SIZE = int(os.getenv("L1_CACHE_SIZE", "10000"))
+# Pub/sub mesajı kaçırılsa bile bayatlık bu süreyle sınırlı kalır
+L1_CACHE_TTL = float(os.getenv("L1_CACHE_TTL", "30"))
+# create_car/delete_car bu kanala {"op": ..., "id": ...} yayınlar
+INVALIDATION_CHANNEL = "cars:invalidate"
+
+# Kilidi yalnızca sahibi bırakabilsin diye karşılaştırmalı silme
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Etiket kümelerini okuyup üyeleriyle birlikte tek adımda siler; okuma ile silme arasında
+# etiketlenen bir anahtar geçersizleştirmeden kaçamaz. unpack sınırı için 1000'lik parçalar.
+INVALIDATE_TAGS_SCRIPT = """
+local deleted = 0
+for _, tag_key in ipairs(KEYS) do
+    local members = redis.call('smembers', tag_key)
+    for i = 1, #members, 1000 do
+        deleted = deleted + redis.call('del', unpack(members, i, math.min(i + 999, #members)))
+    end
+    redis.call('del', tag_key)
+end
+return deleted
+"""
+
+
+@dataclass
+class CacheEntry:
+    payload: bytes
+    delta: float    # değeri yeniden oluşturmanın sürdüğü saniye
+    expiry: float   # mantıksal son kullanma zamanı (unix zamanı)
+
+
+def pack_entry(payload, delta, ttl):
+    """Değeri, XFetch için gereken üst veriyle birlikte tek bir Redis değerine paketler."""
+    return b"%.3f %.4f\n" % (time.time() + ttl, delta) + payload
+
+
+def unpack_entry(raw):
+    header, _, payload = raw.partition(b"\n")
+    expiry, _, delta = header.partition(b" ")
+    return CacheEntry(payload=payload, delta=float(delta), expiry=float(expiry))
+
+
+def should_refresh(entry, beta=XFETCH_BETA):
+    """XFetch: süre dolmadan, yeniden oluşturma maliyetiyle orantılı olasılıkla erken yenile."""
+    return time.time() - entry.delta * beta * math.log(1.0 - random.random()) >= entry.expiry
+
+
+class L1Cache:
+    """Worker içi, boyut ve süre sınırlı LRU önbellek."""
+
+    def __init__(self, max_size=L1_CACHE_SIZE, ttl=L1_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+
+    def get(self, key):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._data[key] = (value, time.monotonic() + self.ttl)
+        self._data.move_to_end(key)
+        if len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def pop(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+
+async def publish_invalidation(redis_client, op, car_id):
+    await redis_client.publish(INVALIDATION_CHANNEL, json.dumps({"op": op, "id": car_id}))
+
+
+async def listen_for_invalidations(redis_client, on_message, on_reconnect):
+    """INVALIDATION_CHANNEL'ı dinler; bağlantı koparsa yeniden abone olur.
+
+    Kopukluk sırasında kaçan mesajlar bilinemeyeceği için her yeniden bağlanmada
+    `on_reconnect` çağrılır (ör. L1 önbelleği boşaltmak için).
+    """
+    while True:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            on_reconnect()
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    on_message(json.loads(message["data"]))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Önbellek geçersizleştirme kanalı hatası; yeniden bağlanılıyor.", extra={"error": str(e)})
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.aclose()
+
+
+class SingleFlight:
+    """Aynı anahtar için süreç içindeki eşzamanlı çağrıları tek bir çalıştırmada birleştirir."""
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, fn):
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        # Bekleyen isteklerden biri iptal edilse de ortak çalışma devam etsin
+        return await asyncio.shield(task)
+
+
+_single_flight = SingleFlight()
+
+
+def normalize_name(name):
+    return " ".join(name.lower().split())
+
+
+def query_fingerprint(**params):
+    """Sorgu parametrelerinden normalleştirilmiş, sıradan bağımsız bir önbellek anahtarı üretir."""
+    if params.get("car_name"):
+        params["car_name"] = normalize_name(params["car_name"])
+    normalized = json.dumps({k: v for k, v in params.items() if v is not None}, sort_keys=True)
+    return QUERY_KEY_PREFIX + hashlib.sha1(normalized.encode()).hexdigest()
+
+
+def price_bucket(price):
+    return int(price) // PRICE_BUCKET_SIZE
+
+
+def query_tags(car_name=None, min_price=None, max_price=None):
+    """Sorgunun sonucunu etkileyebilecek yazmaları temsil eden etiketler."""
+    if not car_name and min_price is None and max_price is None:
+        return [ALL_TAG]
+
+    tags = []
+    if car_name:
+        tags.append(f"company:{normalize_name(car_name)}")
+    if min_price is not None or max_price is not None:
+        if min_price is None or max_price is None:
+            tags.append(ANY_PRICE_TAG)
+        else:
+            low, high = price_bucket(min_price), price_bucket(max_price)
+            if high - low + 1 > MAX_PRICE_TAGS:
+                tags.append(ANY_PRICE_TAG)
+            else:
+                tags.extend(f"price:{bucket}" for bucket in range(low, high + 1))
+    return tags
+
+
+def result_tags(cars):
+    """Bulanık eşleşmeleri de kapsamak için sonuçtaki markaları etiket olarak ekler."""
+    companies = {car["company"] for car in cars if car.get("company")}
+    return [f"company:{normalize_name(company)}" for company in companies]
+
+
+def car_tags(company, daily_price):
+    """Bir aracın eklenmesi/silinmesiyle geçersizleşmesi gereken etiketler."""
+    tags = [ALL_TAG, ANY_PRICE_TAG]
+    if company:
+        tags.append(f"company:{normalize_name(company)}")
+    if daily_price is not None:
+        tags.append(f"price:{price_bucket(daily_price)}")
+    return tags
+
+
+async def tag_entry(redis_client, key, tags, ttl):
+    """Önbellek anahtarını etiket kümelerine ekler; kümeler girişlerle birlikte sona erer."""
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for tag in set(tags):
+            pipe.sadd(TAG_KEY_PREFIX + tag, key)
+            pipe.expire(TAG_KEY_PREFIX + tag, ttl + STALE_GRACE_SECONDS)
+        await pipe.execute()
+
+
+async def invalidate_tags(redis_client, tags):
+    """Verilen etiketlerden herhangi birini taşıyan tüm önbellek girişlerini siler."""
+    tag_keys = [TAG_KEY_PREFIX + tag for tag in set(tags)]
+    await redis_client.eval(INVALIDATE_TAGS_SCRIPT, len(tag_keys), *tag_keys)
+
+
+def record_lookup(tags, hit):
+    for tag in tags:
+        TAG_STATS[tag]["hits" if hit else "misses"] += 1
+
+
+def tag_stats():
+    """Etiket başına isabet oranı raporu."""
+    report = {}
+    for tag, counts in sorted(TAG_STATS.items()):
+        total = counts["hits"] + counts["misses"]
+        report[tag] = {**counts, "hit_rate": round(counts["hits"] / total, 4) if total else 0.0}
+    return report
+
+
+async def get_or_rebuild(redis_client, key, ttl, rebuild):
+    """Anahtarı Redis'ten döndürür; eksikse veya yenilenmesi gerekiyorsa tek bir kez yeniden oluşturur.
+
+    `rebuild` bir coroutine fonksiyonudur ve önbelleğe yazılacak baytları döndürür. Yeniden
+    oluşturma hata verirse ve anahtarın bayat değeri (STALE_GRACE_SECONDS içinde) varsa o döner.
+    (değer, taze önbellekten mi geldi) ikilisini döndürür.
+    """
+    raw = await redis_client.get(key)
+    entry = unpack_entry(raw) if raw else None
+    if entry is not None and not should_refresh(entry):
+        return entry.payload, True
+
+    payload = await _single_flight.do(key, lambda: _rebuild(redis_client, key, ttl, rebuild, entry))
+    return payload, False
+
+
+async def _rebuild(redis_client, key, ttl, rebuild, stale):
+    lock_key = f"lock:{key}"
+    token = uuid.uuid4().hex
+
+    if await redis_client.set(lock_key, token, nx=True, px=LOCK_TIMEOUT_MS):
+        try:
+            started = time.monotonic()
+            try:
+                payload = await rebuild()
+            except Exception as e:
+                # Kaynak (ES) yanıt vermiyorsa ek süresi içindeki bayat değer yedek yoldan iyidir
+                if stale is None:
+                    raise
+                # Devre açıkken her istekte yazılmaması için debug; hata ES istemci metriklerinde görünür
+                logger.debug("Önbellek yenilenemedi; bayat değer döndürülüyor.", extra={"key": key, "error": str(e)})
+                return stale.payload
+            delta = time.monotonic() - started
+            await redis_client.set(key, pack_entry(payload, delta, ttl), ex=ttl + STALE_GRACE_SECONDS)
+            logger.debug("Önbellek yeniden oluşturuldu.", extra={"key": key, "rebuild_ms": round(delta * 1000, 1)})
+            return payload
+        finally:
+            await redis_client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+
+    # Başka bir worker yeniden oluşturuyor: varsa bayat değeri döndür
+    if stale is not None:
+        return stale.payload
+
+    # Bayat değer yoksa kilit sahibinin sonucunu bekle
+    deadline = time.monotonic() + LOCK_TIMEOUT_MS / 1000
+    while time.monotonic() < deadline:
+        await asyncio.sleep(LOCK_POLL_INTERVAL)
+        raw = await redis_client.get(key)
+        if raw:
+            return unpack_entry(raw).payload
+        if not await redis_client.exists(lock_key):
+            break
+
+    # Kilit sahibi sonuç yazmadan düştü; isteği kendimiz karşılayalım
+    return await rebuild()
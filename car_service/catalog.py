@@ -0,0 +1,270 @@
+import os
+import re
+import asyncio
+import logging
+
+import orjson
+
+import pagination
+
+try:
+    import numpy as np
+except ImportError:  # katalog motoru isteğe bağlıdır; NumPy yoksa liste istekleri ES'e gider
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# --- Worker içi katalog anlık görüntüsü (GET /cars/, GET /cars/available) ---
+# Açıkken liste filtreleri ES ve PostgreSQL'e gitmeden bellekteki sütun dizileri üzerinde çalışır
+CATALOG_ENABLED = os.getenv("CATALOG_SNAPSHOT", "false").lower() == "true"
+# Pub/sub mesajı kaçırılsa (ör. load_cars.py ile toplu yükleme) bile bayatlık bu süreyle sınırlı kalır
+CATALOG_REFRESH_SECONDS = float(os.getenv("CATALOG_REFRESH_SECONDS", "300"))
+# Marka eşleştirme sonuçlarının tutulacağı en fazla sorgu sayısı
+MATCH_CACHE_SIZE = 1024
+# Silinen satırlar bu orana ulaşınca diziler yeniden kurulur
+COMPACT_RATIO = 0.25
+
+# daily_price boş olan araçlar; fiyat filtresi verildiğinde hiçbir aralığa girmez
+MISSING_PRICE = -(2 ** 63)
+
+# Eşleşme puanları: tam kelime, önek (en az 3 harf), bulanık (ES fuzziness: AUTO)
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.75
+FUZZY_SCORE = 0.5
+
+
+def available():
+    return np is not None
+
+
+def tokenize(text):
+    return tuple(re.findall(r"\w+", (text or "").lower()))
+
+
+def fuzzy_limit(token):
+    """ES `fuzziness: AUTO`: 1-2 harf tam eşleşme, 3-5 harf 1, daha uzunu 2 düzenleme."""
+    if len(token) <= 2:
+        return 0
+    return 1 if len(token) <= 5 else 2
+
+
+def within_distance(a, b, limit):
+    """Damerau-Levenshtein (bitişik yer değiştirme dahil) uzaklığı `limit`'i aşmıyor mu?"""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return False
+        previous2, previous = previous, current
+    return previous[-1] <= limit
+
+
+def token_score(token, words):
+    best = 0.0
+    for word in words:
+        if word == token:
+            return EXACT_SCORE
+        if len(token) >= 3 and word.startswith(token):
+            best = max(best, PREFIX_SCORE)
+        elif best < FUZZY_SCORE and within_distance(token, word, fuzzy_limit(token)):
+            best = FUZZY_SCORE
+    return best
+
+
+class CompanyMatcher:
+    """Marka adlarını tamsayı kodlara çevirir (intern) ve `car_name` sorgusunu kodlara eşler.
+
+    Marka sözlüğü küçük olduğu için (cars.json: 37 yazım, normalleştirilince 31 marka) sorgu
+    her markayla bir kez karşılaştırılır; sonuç kod başına puan dizisi olarak önbelleğe alınır.
+    """
+
+    def __init__(self):
+        self.codes = {}
+        self.words = []
+        self._matches = {}
+
+    def intern(self, company):
+        words = tokenize(company)
+        code = self.codes.get(words)
+        if code is None:
+            code = self.codes[words] = len(self.words)
+            self.words.append(words)
+            self._matches.clear()
+        return code
+
+    def match(self, query):
+        words = tokenize(query)
+        scores = self._matches.get(words)
+        if scores is None:
+            scores = np.array([sum(token_score(token, company) for token in words) for company in self.words])
+            if len(self._matches) >= MATCH_CACHE_SIZE:
+                self._matches.clear()
+            self._matches[words] = scores
+        return scores
+
+
+class CatalogSnapshot:
+    """Araç kataloğunun sütun yönelimli kopyası: id, fiyat ve marka kodu NumPy dizilerinde tutulur.
+
+    Filtreler maskelerle, marka araması önceden hesaplanmış marka -> satır indeksiyle yapılır.
+    Satırlar id sırasındadır; yanıtlar önceden serileştirilmiş JSON parçalarından birleştirilir.
+    Yazmalar tek tek uygulanır (upsert/remove); silinen satırlar `live` maskesiyle gizlenir.
+    """
+
+    def __init__(self, cars):
+        self._build(sorted(cars, key=lambda car: car["id"]))
+
+    def _build(self, cars):
+        self.matcher = CompanyMatcher()
+        self.rows = list(cars)
+        self.bodies = [orjson.dumps(car) for car in cars]
+        self.ids = np.array([car["id"] for car in cars], dtype=np.int64)
+        self.prices = np.array([self._price(car) for car in cars], dtype=np.int64)
+        self.company_codes = np.array([self.matcher.intern(car["company"]) for car in cars], dtype=np.int32)
+        self.live = np.ones(len(cars), dtype=bool)
+        self.position = {car["id"]: index for index, car in enumerate(cars)}
+        self._company_rows = None
+
+    @staticmethod
+    def _price(car):
+        price = car.get("daily_price")
+        return MISSING_PRICE if price is None else int(price)
+
+    def __len__(self):
+        return len(self.position)
+
+    def live_rows(self):
+        return [self.rows[index] for index in np.flatnonzero(self.live)]
+
+    def upsert(self, car):
+        """Yeni ya da değişmiş aracı uygular; yeni bir id sıranın ortasına düşerse diziler yeniden kurulur."""
+        index = self.position.get(car["id"])
+        if index is not None:
+            code = self.matcher.intern(car["company"])
+            if code != self.company_codes[index]:
+                self.company_codes[index] = code
+                self._company_rows = None
+            self.rows[index] = car
+            self.bodies[index] = orjson.dumps(car)
+            self.prices[index] = self._price(car)
+            return
+        if len(self.ids) and car["id"] < self.ids[-1]:
+            cars = self.live_rows()
+            cars.append(car)
+            self._build(sorted(cars, key=lambda row: row["id"]))
+            return
+
+        self.position[car["id"]] = len(self.rows)
+        self.rows.append(car)
+        self.bodies.append(orjson.dumps(car))
+        self.ids = np.append(self.ids, car["id"])
+        self.prices = np.append(self.prices, self._price(car))
+        self.company_codes = np.append(self.company_codes, np.int32(self.matcher.intern(car["company"])))
+        self.live = np.append(self.live, True)
+        self._company_rows = None
+        self._compact_if_needed()
+
+    def remove(self, car_id):
+        index = self.position.pop(car_id, None)
+        if index is not None:
+            self.live[index] = False
+            self._compact_if_needed()
+
+    def _compact_if_needed(self):
+        if len(self.rows) - len(self.position) > COMPACT_RATIO * max(len(self.rows), 1):
+            self._build(self.live_rows())
+
+    def company_rows(self):
+        """Marka kodu -> satır konumları (id sırasıyla); yazmadan sonraki ilk aramada yeniden kurulur."""
+        if self._company_rows is None:
+            order = np.argsort(self.company_codes, kind="stable")
+            bounds = np.searchsorted(self.company_codes[order], np.arange(len(self.matcher.words) + 1))
+            self._company_rows = [order[bounds[code]:bounds[code + 1]] for code in range(len(self.matcher.words))]
+        return self._company_rows
+
+    def booked_mask(self, bitmap):
+        """Redis doluluk bitmap'ini (ofset = car_id, en anlamlı bit önce) satır maskesine çevirir."""
+        bits = np.unpackbits(np.frombuffer(bitmap, dtype=np.uint8))
+        mask = np.zeros(len(self.ids), dtype=bool)
+        in_range = self.ids < len(bits)
+        mask[in_range] = bits[self.ids[in_range]].astype(bool)
+        return mask
+
+    def search(self, car_name=None, min_price=None, max_price=None, limit=pagination.DEFAULT_PAGE_SIZE,
+               search_after=None, fields=None, booked=None):
+        """search_cars ile aynı filtreler ve sayfalama; (JSON gövdesi, sonraki imleç) döndürür.
+
+        `car_name` verilirse sıralama puan (azalan) ve id'dir, imleç [puan, id] taşır; yoksa
+        id sırası ve [id] imleci kullanılır. `booked` bir Redis doluluk bitmap'idir.
+        """
+        if car_name:
+            code_scores = self.matcher.match(car_name)
+            matched = np.flatnonzero(code_scores)
+            if not len(matched):
+                return b"[]", None
+            company_rows = self.company_rows()
+            # Yalnızca eşleşen markaların satırları üzerinde çalışılır
+            positions = np.concatenate([company_rows[code] for code in matched])
+            keep = self.live[positions]
+            prices = self.prices[positions]
+        else:
+            # Filtre tüm sütunlar üzerinde maskeyle uygulanır; konumlar zaten id sırasındadır
+            positions = None
+            keep = self.live.copy()
+            prices = self.prices
+
+        if min_price is not None:
+            keep &= prices >= min_price
+        if max_price is not None:
+            keep &= (prices <= max_price) & (prices != MISSING_PRICE)
+        if booked:
+            booked_rows = self.booked_mask(booked)
+            keep &= ~(booked_rows if positions is None else booked_rows[positions])
+
+        if car_name:
+            positions = positions[keep]
+            ids = self.ids[positions]
+            scores = code_scores[self.company_codes[positions]]
+            if search_after:
+                after_id = search_after[-1]
+                if len(search_after) > 1:
+                    after_score = search_after[0]
+                    later = (scores < after_score) | ((scores == after_score) & (ids > after_id))
+                else:
+                    later = ids > after_id
+                positions, ids, scores = positions[later], ids[later], scores[later]
+            order = np.lexsort((ids, -scores))[:limit]
+            positions = positions[order].tolist()
+            last = [float(scores[order[-1]]), int(ids[order[-1]])] if len(order) else None
+        else:
+            if search_after:
+                keep[:np.searchsorted(self.ids, search_after[-1], side="right")] = False
+            positions = np.flatnonzero(keep)[:limit].tolist()
+            last = [int(self.ids[positions[-1]])] if positions else None
+
+        next_cursor = pagination.encode_cursor(last) if len(positions) == limit else None
+        return self.render(positions, fields), next_cursor
+
+    def render(self, positions, fields=None):
+        if fields:
+            return orjson.dumps([{name: self.rows[index].get(name) for name in fields} for index in positions])
+        return b"[" + b",".join(self.bodies[index] for index in positions) + b"]"
+
+
+async def refresh_periodically(load, interval=CATALOG_REFRESH_SECONDS):
+    """Anlık görüntüyü belirli aralıklarla veritabanından yeniden kurar."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await load()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Katalog yenilenemedi; eski anlık görüntü kullanılmaya devam ediyor.", extra={"error": str(e)})
@@ -1,10 +1,13 @@
 import os
-from sqlalchemy import create_engine
+import time
+import argparse
+from sqlalchemy import create_engine, select, func, update
 from sqlalchemy.orm import sessionmaker
 from elasticsearch import Elasticsearch
-from elasticsearch.helpers import bulk
+from elasticsearch.helpers import bulk, parallel_bulk, scan
+import redis
 
-import models
+import models, cache
 
 # PostgreSQL veritabanı bağlantısı
 DB_URL = os.getenv("DB_URL")
@@ -19,6 +22,48 @@ ES_CLIENT = Elasticsearch(
     basic_auth=('elastic', 'elastic_pass')
 )
 
+# Redis bağlantısı (katalog sürüm sayaçları için)
+REDIS_HOST = os.getenv("REDIS_HOST", "redis")
+REDIS_PORT = os.getenv("REDIS_PORT", "6379")
+redis_client = redis.StrictRedis(host=REDIS_HOST, port=REDIS_PORT, db=0, decode_responses=True)
+
+# Artık veritabanında olmayan belgeler taranırken bir kaydırma (scroll) sayfası / silme partisi boyutu
+CLEANUP_BATCH_SIZE = int(os.getenv("INDEX_CLEANUP_BATCH_SIZE", "1000"))
+
+# --- Sıfırdan yeniden indeksleme (rebuild) ayarları ---
+CARS_ALIAS = 'cars'
+REBUILD_CHUNK_SIZE = int(os.getenv("REBUILD_CHUNK_SIZE", "2000"))
+REBUILD_THREADS = int(os.getenv("REBUILD_THREADS", "4"))
+REBUILD_REPLICAS = int(os.getenv("REBUILD_REPLICAS", "1"))
+
+# Sürümlü indekslerin açık eşlemeleri. company, liste uç noktasının bulanık
+# `match` sorgusu için analiz edilen metin olarak kalır; tam eşleşme ve
+# gruplamalar için company.keyword alt alanı kullanılır.
+CARS_MAPPINGS = {
+    "dynamic": "strict",
+    "properties": {
+        "id": {"type": "integer"},
+        "company": {"type": "text", "fields": {"keyword": {"type": "keyword"}}},
+        "car_name": {"type": "text", "fields": {"keyword": {"type": "keyword"}}},
+        "engine": {"type": "keyword"},
+        "total_speed": {"type": "keyword"},
+        "performance_0_100_kmh": {"type": "keyword"},
+        "daily_price": {"type": "integer"},
+        "fuel_type": {"type": "keyword"},
+        "seats": {"type": "keyword"},
+        "torque": {"type": "keyword"},
+        "is_available": {"type": "boolean"},
+    },
+}
+
+def get_catalog_version():
+    """İndekslemeden önceki katalog sürümünü okur; Redis yoksa None döner."""
+    try:
+        return int(redis_client.get(cache.CATALOG_VERSION_KEY) or 0)
+    except redis.exceptions.ConnectionError as e:
+        print(f"Redis bağlantı hatası: {e}. Katalog sürümü kaydedilmeyecek.")
+        return None
+
 def get_cars_from_db():
     db = SessionLocal()
     try:
@@ -27,11 +72,11 @@ def get_cars_from_db():
     finally:
         db.close()
 
-def generate_actions(cars):
+def generate_actions(cars, index='cars'):
     """Her araç için Elasticsearch'e gönderilecek eylem (action) oluşturur."""
     for car in cars:
         doc = {
-            '_index': 'cars',
+            '_index': index,
             '_id': car.id,
             '_source': {
                 'id': car.id,
@@ -49,7 +94,24 @@ def generate_actions(cars):
         }
         yield doc
 
+def delete_stale_documents(car_ids):
+    """İndeksteki id'leri kaydırmalı arama ile tarar; `car_ids` içinde olmayanları parti parti siler.
+
+    Okumadan sonra eklenen araçlar silinmesin diye yalnızca okunan en büyük id'ye kadar bakılır.
+    (silinen, başarısız) sayılarını döndürür.
+    """
+    query = {"range": {"id": {"lte": max(car_ids)}}} if car_ids else {"match_all": {}}
+    hits = scan(ES_CLIENT, index='cars', query={"query": query, "_source": False}, size=CLEANUP_BATCH_SIZE)
+    actions = (
+        {'_op_type': 'delete', '_index': hit['_index'], '_id': hit['_id']}
+        for hit in hits if int(hit['_id']) not in car_ids
+    )
+    return bulk(ES_CLIENT, actions, chunk_size=CLEANUP_BATCH_SIZE, stats_only=True, raise_on_error=False)
+
 def main():
+    # Sürümü veritabanını okumadan önce al; bu andan sonraki yazmalar indekste olmayabilir
+    version = get_catalog_version()
+
     print("PostgreSQL'den araçlar çekiliyor...")
     cars = get_cars_from_db()
 
@@ -64,8 +126,126 @@ def main():
     try:
         success, failed = bulk(ES_CLIENT, generate_actions(cars), stats_only=True)
         print(f"İndeksleme tamamlandı. Başarılı: {success}, Başarısız: {failed}")
+        # Veritabanından silinmiş araçların belgelerini de indeksten kaldır
+        deleted, _ = delete_stale_documents({car.id for car in cars})
+        print(f"Veritabanında olmayan {deleted} belge silindi.")
+        # car_service liste uç noktası bu sürüme kadar ES _source'a güvenebilir
+        if version is not None and not failed:
+            redis_client.set(cache.INDEXED_VERSION_KEY, version)
+            print(f"İndekslenen katalog sürümü: {version}")
     except Exception as e:
         print(f"Hata oluştu: {e}")
 
+def stream_cars(db, chunk_size):
+    """Araçları sunucu taraflı imleçle, bellekte en fazla `chunk_size` satır tutarak okur."""
+    return db.execute(
+        select(models.Car).order_by(models.Car.id).execution_options(yield_per=chunk_size)
+    ).scalars()
+
+def swap_alias(new_index):
+    """`cars` takma adını tek bir atomik istekle yeni indekse taşır."""
+    actions = [{"add": {"index": new_index, "alias": CARS_ALIAS}}]
+    if ES_CLIENT.indices.exists_alias(name=CARS_ALIAS):
+        for old_index in ES_CLIENT.indices.get_alias(name=CARS_ALIAS):
+            actions.append({"remove": {"index": old_index, "alias": CARS_ALIAS}})
+    elif ES_CLIENT.indices.exists(index=CARS_ALIAS):
+        # İlk geçiş: yerinde oluşturulmuş eski `cars` indeksi takma adla aynı anda kaldırılır
+        actions.append({"remove_index": {"index": CARS_ALIAS}})
+    ES_CLIENT.indices.update_aliases(actions=actions)
+
+def delete_old_indices(keep):
+    """Geri dönüş için en yeni `keep` sürümlü indeksi bırakır, gerisini siler."""
+    indices = sorted(ES_CLIENT.indices.get(index=f"{CARS_ALIAS}_v*"))
+    for old_index in indices[:-keep]:
+        ES_CLIENT.indices.delete(index=old_index)
+        print(f"Eski indeks silindi: {old_index}")
+
+def rewind_indexer_watermark(db, outbox_id):
+    """Yeniden indeksleme sırasında gelen yazmaların yeni indekse de uygulanmasını sağlar.
+
+    Artımlı indeksleyici bu sırada eski indekse yazmış olabilir; watermark'ı
+    okuma anındaki son outbox kaydına geri çekmek onları yeniden oynatır.
+    """
+    db.execute(
+        update(models.IndexerWatermark)
+        .where(models.IndexerWatermark.last_outbox_id > outbox_id)
+        .values(last_outbox_id=outbox_id)
+    )
+    db.commit()
+
+def load_and_swap(db, new_index, chunk_size, threads):
+    """Belgeleri yeni indekse akıtır; hepsi yazıldıysa indeksi açar ve takma adı ona çevirir."""
+    started = time.perf_counter()
+    success = failed = 0
+    for ok, info in parallel_bulk(
+        ES_CLIENT,
+        generate_actions(stream_cars(db, chunk_size), index=new_index),
+        thread_count=threads,
+        chunk_size=chunk_size,
+        raise_on_error=False,
+    ):
+        if ok:
+            success += 1
+        else:
+            failed += 1
+            if failed <= 5:
+                print(f"İndekslenemedi: {info}")
+    elapsed = time.perf_counter() - started
+    print(f"{success} belge {elapsed:.1f} sn'de yüklendi ({success / elapsed:.0f} belge/sn), başarısız: {failed}")
+
+    if failed:
+        raise RuntimeError(f"{failed} belge indekslenemedi")
+
+    ES_CLIENT.indices.put_settings(
+        index=new_index,
+        settings={"refresh_interval": "1s", "number_of_replicas": REBUILD_REPLICAS},
+    )
+    ES_CLIENT.indices.refresh(index=new_index)
+    swap_alias(new_index)
+    print(f"'{CARS_ALIAS}' takma adı {new_index} indeksine taşındı.")
+
+def rebuild(chunk_size=REBUILD_CHUNK_SIZE, threads=REBUILD_THREADS, keep=2):
+    """Sürümlü yeni bir indeksi akış halinde doldurur ve `cars` takma adını ona çevirir."""
+    version = get_catalog_version()
+    new_index = f"{CARS_ALIAS}_v{int(time.time())}"
+
+    # Yükleme sırasında yenileme ve replika kapalı: segmentler yalnızca bir kez yazılır
+    ES_CLIENT.indices.create(
+        index=new_index,
+        mappings=CARS_MAPPINGS,
+        settings={"refresh_interval": "-1", "number_of_replicas": 0},
+    )
+    print(f"Yeni indeks oluşturuldu: {new_index}")
+
+    db = SessionLocal()
+    try:
+        try:
+            # Okumaya başlamadan önceki son outbox kaydı; sonrasındakiler yeni indekse yeniden uygulanır
+            outbox_id = db.execute(select(func.coalesce(func.max(models.CarOutbox.id), 0))).scalar()
+            load_and_swap(db, new_index, chunk_size, threads)
+        except BaseException:
+            # Yarım kalan indeks takma ada hiç bağlanmadı; başarısız denemeler yetim indeks bırakmasın
+            ES_CLIENT.options(ignore_status=404).indices.delete(index=new_index)
+            print(f"Yeniden oluşturma başarısız; {new_index} silindi, takma ad değişmedi.")
+            raise
+
+        rewind_indexer_watermark(db, outbox_id)
+    finally:
+        db.close()
+
+    if version is not None:
+        redis_client.set(cache.INDEXED_VERSION_KEY, version)
+    delete_old_indices(keep)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Araçları PostgreSQL'den Elasticsearch'e indeksler.")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Sürümlü yeni bir indeks oluştur ve 'cars' takma adını kesintisiz ona taşı")
+    parser.add_argument("--chunk-size", type=int, default=REBUILD_CHUNK_SIZE)
+    parser.add_argument("--threads", type=int, default=REBUILD_THREADS)
+    args = parser.parse_args()
+
+    if args.rebuild:
+        rebuild(chunk_size=args.chunk_size, threads=args.threads)
+    else:
+        main()
\ No newline at end of file
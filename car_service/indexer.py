@@ -0,0 +1,190 @@
+import os
+import time
+import logging
+from datetime import timedelta
+import redis
+from sqlalchemy import select, delete, func
+from elasticsearch.helpers import bulk
+
+import models, cache
+from index_cars import ES_CLIENT, SessionLocal, engine, redis_client, generate_actions
+from shared.logs import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# --- Artımlı indeksleyici ayarları ---
+# Tek bir bulk isteğinde ES'e gönderilecek en fazla outbox kaydı
+BATCH_SIZE = int(os.getenv("INDEXER_BATCH_SIZE", "500"))
+# Yeni yazma bildirimi gelmese bile outbox'ın kontrol edileceği en uzun aralık (saniye)
+FLUSH_INTERVAL = float(os.getenv("INDEXER_FLUSH_INTERVAL", "1.0"))
+# ES'e yansıtılmış outbox kayıtlarının silinmeden önce tutulacağı süre
+OUTBOX_RETENTION_HOURS = int(os.getenv("INDEXER_OUTBOX_RETENTION_HOURS", "24"))
+# Outbox id'lerindeki bir boşluğun geri alınmış bir işleme ait sayılması için beklenecek süre
+GAP_TIMEOUT = float(os.getenv("INDEXER_GAP_TIMEOUT", "5.0"))
+# Redis bağlantısı koptuğunda yeniden abone olmadan önce beklenecek en uzun süre (üstel artar)
+RESUBSCRIBE_MAX_BACKOFF = float(os.getenv("INDEXER_RESUBSCRIBE_MAX_BACKOFF", "30"))
+
+WATERMARK_NAME = "cars_index"
+
+# Boşluğun başladığı id -> ilk görüldüğü an
+_gaps = {}
+
+
+def get_watermark(db):
+    # Satır kilidi: index_cars.py --rebuild watermark'ı geri çekerken parti ortasında ezilmesin
+    watermark = db.get(models.IndexerWatermark, WATERMARK_NAME, with_for_update=True)
+    if watermark is None:
+        watermark = models.IndexerWatermark(name=WATERMARK_NAME, last_outbox_id=0)
+        db.add(watermark)
+        db.flush()
+    return watermark
+
+
+def contiguous_prefix(rows, last_id):
+    """Id boşluğunda durur: daha küçük id'li bir kayıt henüz commit edilmemiş olabilir.
+
+    Geri alınan işlemler sıra numarasında kalıcı boşluk bırakır; GAP_TIMEOUT'tan
+    uzun süredir dolmayan boşluklar atlanır.
+    """
+    expected = last_id + 1
+    for index, row in enumerate(rows):
+        if row.id != expected:
+            first_seen = _gaps.setdefault(expected, time.monotonic())
+            if time.monotonic() - first_seen < GAP_TIMEOUT:
+                return rows[:index]
+        _gaps.pop(expected, None)
+        expected = row.id + 1
+    return rows
+
+
+def build_actions(db, changes):
+    """Araç başına son işlemi ES bulk eylemlerine çevirir."""
+    upsert_ids = [car_id for car_id, op in changes.items() if op == "upsert"]
+    cars = db.execute(select(models.Car).where(models.Car.id.in_(upsert_ids))).scalars().all() if upsert_ids else []
+    actions = list(generate_actions(cars))
+
+    # Upsert kaydı olup satırı artık bulunmayan araçlar da silinmiş sayılır
+    found = {car.id for car in cars}
+    for car_id, op in changes.items():
+        if op == "delete" or car_id not in found:
+            actions.append({'_op_type': 'delete', '_index': 'cars', '_id': car_id})
+    return actions
+
+
+def process_batch():
+    """Watermark'tan sonraki en fazla BATCH_SIZE outbox kaydını ES'e uygular; işlenen kayıt sayısını döndürür."""
+    # Sürümü outbox'ı okumadan önce al; bu sürüme kadarki yazmaların kayıtları okunacak sorguda görünür.
+    # Redis yoksa outbox yine uygulanır, yalnızca indekslenen sürüm güncellenmez.
+    try:
+        version = redis_client.get(cache.CATALOG_VERSION_KEY)
+    except redis.RedisError as e:
+        logger.warning("Katalog sürümü okunamadı; indekslenen sürüm güncellenmeyecek.", extra={"error": str(e)})
+        version = None
+
+    db = SessionLocal()
+    try:
+        watermark = get_watermark(db)
+        fetched = db.execute(
+            select(models.CarOutbox)
+            .where(models.CarOutbox.id > watermark.last_outbox_id)
+            .order_by(models.CarOutbox.id)
+            .limit(BATCH_SIZE)
+        ).scalars().all()
+        rows = contiguous_prefix(fetched, watermark.last_outbox_id)
+
+        if rows:
+            # Aynı araç için birden fazla kayıt varsa yalnızca sonuncusu önemlidir
+            changes = {}
+            for row in rows:
+                changes[row.car_id] = row.op
+
+            success, errors = bulk(ES_CLIENT, build_actions(db, changes), raise_on_error=False, refresh=False)
+            # Zaten silinmiş belgeler için dönen 404'ler hata sayılmaz
+            errors = [e for e in errors if e.get('delete', {}).get('status') != 404]
+            if errors:
+                raise RuntimeError(f"{len(errors)} belge indekslenemedi: {errors[:3]}")
+
+            watermark.last_outbox_id = rows[-1].id
+            logger.info("Outbox kayıtları ES'e yansıtıldı.",
+                        extra={"rows": len(rows), "cars": len(changes), "watermark": rows[-1].id})
+        db.commit()
+    finally:
+        db.close()
+
+    # Outbox tamamen tüketildiyse liste uç noktası bu sürüme kadar ES _source'a güvenebilir
+    if len(fetched) < BATCH_SIZE and len(rows) == len(fetched) and version is not None:
+        try:
+            redis_client.set(cache.INDEXED_VERSION_KEY, version)
+        except redis.RedisError as e:
+            logger.warning("İndekslenen katalog sürümü kaydedilemedi.", extra={"error": str(e)})
+    return len(rows)
+
+
+def prune_outbox():
+    """ES'e yansıtılmış ve saklama süresini doldurmuş outbox kayıtlarını siler."""
+    db = SessionLocal()
+    try:
+        watermark = get_watermark(db)
+        db.execute(
+            delete(models.CarOutbox)
+            .where(models.CarOutbox.id <= watermark.last_outbox_id)
+            .where(models.CarOutbox.created_at < func.now() - timedelta(hours=OUTBOX_RETENTION_HOURS))
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def subscribe():
+    pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(cache.INVALIDATION_CHANNEL)
+    return pubsub
+
+
+def wait_for_writes(pubsub):
+    """Yeni yazma bildirimi veya en fazla FLUSH_INTERVAL kadar bekler."""
+    if pubsub is None:
+        time.sleep(FLUSH_INTERVAL)
+    else:
+        pubsub.get_message(timeout=FLUSH_INTERVAL)
+
+
+def main():
+    configure_logging("car_indexer")
+    models.Base.metadata.create_all(bind=engine)
+    logger.info("Artımlı indeksleyici başladı; watermark'tan itibaren yetişiliyor.")
+
+    # create_car/delete_car'ın yayınladığı bildirimler indeksleyiciyi hemen uyandırır. Redis yokken
+    # outbox yine FLUSH_INTERVAL aralığıyla işlenir; abonelik geri gelene kadar yeniden denenir.
+    pubsub, backoff, resubscribe_at = None, FLUSH_INTERVAL, 0.0
+    last_prune = 0.0
+    while True:
+        try:
+            # Kesinti sonrası birikmiş kayıtlar dahil, outbox boşalana kadar parti parti işle
+            while process_batch() == BATCH_SIZE:
+                pass
+            if time.monotonic() - last_prune > 3600:
+                prune_outbox()
+                last_prune = time.monotonic()
+        except Exception as e:
+            logger.error("İndeksleme hatası; tekrar denenecek.", extra={"error": str(e), "retry_in": FLUSH_INTERVAL})
+            time.sleep(FLUSH_INTERVAL)
+
+        try:
+            if pubsub is None and time.monotonic() >= resubscribe_at:
+                pubsub = subscribe()
+            wait_for_writes(pubsub)
+            if pubsub is not None:
+                backoff = FLUSH_INTERVAL
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            logger.warning("Bildirim kanalı koptu; yeniden abone olunacak.",
+                           extra={"error": str(e), "retry_in": backoff})
+            if pubsub is not None:
+                pubsub.close()
+            pubsub, resubscribe_at = None, time.monotonic() + backoff
+            backoff = min(backoff * 2, RESUBSCRIBE_MAX_BACKOFF)
+            time.sleep(FLUSH_INTERVAL)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,23 @@
+import os
+import io
+import csv
 import json
+import time
+import argparse
 import psycopg2
-import os
 
 # Scriptin bulunduğu klasörden cars.json'u oku
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 json_path = os.path.join(BASE_DIR, "cars.json")
 
-with open(json_path, "r", encoding="utf-8") as f:
-    cars = json.load(f)
-
-# Postgre bağlantısı
-conn = psycopg2.connect(
-    dbname="car_db",
-    user="car_db_user",
-    password="car_db_password",
-    host="localhost",   # Windows hostundan bağlanıyoruz
-    port=5433           # çünkü compose'ta 5433:5432 yaptın
-)
-cur = conn.cursor()
-
-# Tabloyu sıfırla
-cur.execute("""
-DROP TABLE IF EXISTS cars;
-CREATE TABLE cars (
+COLUMNS = [
+    "id", "company", "car_name", "engine", "total_speed", "performance_0_100_kmh",
+    "daily_price", "fuel_type", "seats", "torque", "is_available",
+]
+BATCH_SIZE = int(os.getenv("LOAD_BATCH_SIZE", "10000"))
+
+CREATE_TABLE_SQL = """
+CREATE TABLE {if_not_exists} cars (
     id INT PRIMARY KEY,
     company VARCHAR(100),
     car_name VARCHAR(100),
@@ -35,29 +30,121 @@ CREATE TABLE cars (
     torque VARCHAR(50),
     is_available BOOLEAN
 );
-""")
-
-# Verileri ekle
-for car in cars:
-    cur.execute("""
-        INSERT INTO cars (id, company, car_name, engine, total_speed, performance_0_100_kmh, daily_price, fuel_type, seats, torque, is_available)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """, (
-        car["id"],
-        car["company"],
-        car["car_name"],
-        car["engine"],
-        car["total_speed"],
-        car["performance_0_100_kmh"],
-        car["daily_price"],
-        car["fuel_type"],
-        car["seats"],
-        car["torque"],
-        car["is_available"]
-    ))
-
-conn.commit()
-cur.close()
-conn.close()
-
-print("✅ JSON verileri başarıyla cars tablosuna yüklendi.")
+"""
+
+# NULL'u boş metinden ayırmak için \N kullanılır
+COPY_OPTIONS = "(FORMAT csv, NULL '\\N')"
+
+UPSERT_SQL = f"""
+INSERT INTO cars ({", ".join(COLUMNS)})
+SELECT DISTINCT ON (id) {", ".join(COLUMNS)} FROM cars_staging ORDER BY id
+ON CONFLICT (id) DO UPDATE SET
+    {", ".join(f"{column} = EXCLUDED.{column}" for column in COLUMNS if column != "id")}
+"""
+
+
+def iter_cars(path):
+    """Araçları dosyayı belleğe almadan tek tek okur.
+
+    .ndjson/.jsonl dosyaları satır satır, JSON dizileri ijson ile akış halinde okunur.
+    """
+    if path.endswith((".ndjson", ".jsonl")):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+
+    try:
+        import ijson
+    except ImportError:
+        print("ijson kurulu değil; JSON dizisi tamamen belleğe okunacak. Büyük dosyalar için NDJSON kullanın.")
+        with open(path, "r", encoding="utf-8") as f:
+            yield from json.load(f)
+        return
+
+    with open(path, "rb") as f:
+        # use_float: fiyatlar Decimal yerine sayı olarak gelsin
+        yield from ijson.items(f, "item", use_float=True)
+
+
+def iter_batches(cars, batch_size):
+    """Her parti için COPY'ye verilecek CSV tamponunu üretir; bellekte en fazla bir parti tutulur."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    count = 0
+    for car in cars:
+        writer.writerow(["\\N" if car.get(column) is None else car[column] for column in COLUMNS])
+        count += 1
+        if count == batch_size:
+            buffer.seek(0)
+            yield buffer, count
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            count = 0
+    if count:
+        buffer.seek(0)
+        yield buffer, count
+
+
+def load(conn, path, mode="replace", batch_size=BATCH_SIZE):
+    """Araçları COPY FROM STDIN ile parti parti yükler; yüklenen satır sayısını döndürür.
+
+    replace: tabloyu sıfırlar ve tek bir işlemde yükler.
+    upsert:  her partiyi geçici bir tabloya kopyalayıp ON CONFLICT ile birleştirir;
+             aynı dosya tekrar yüklenebilir.
+    """
+    cur = conn.cursor()
+    if mode == "replace":
+        # Tabloyu sıfırla
+        cur.execute("DROP TABLE IF EXISTS cars;" + CREATE_TABLE_SQL.format(if_not_exists=""))
+        copy_sql = f"COPY cars ({', '.join(COLUMNS)}) FROM STDIN WITH {COPY_OPTIONS}"
+    else:
+        cur.execute(CREATE_TABLE_SQL.format(if_not_exists="IF NOT EXISTS"))
+        cur.execute("CREATE TEMP TABLE cars_staging (LIKE cars INCLUDING DEFAULTS) ON COMMIT DELETE ROWS")
+        conn.commit()
+        copy_sql = f"COPY cars_staging ({', '.join(COLUMNS)}) FROM STDIN WITH {COPY_OPTIONS}"
+
+    total = 0
+    started = time.perf_counter()
+    for buffer, count in iter_batches(iter_cars(path), batch_size):
+        cur.copy_expert(copy_sql, buffer)
+        if mode == "upsert":
+            cur.execute(UPSERT_SQL)
+            conn.commit()
+        total += count
+        elapsed = time.perf_counter() - started
+        print(f"{total} satır yüklendi ({total / elapsed:.0f} satır/sn)")
+
+    conn.commit()
+    cur.close()
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="cars.json (veya NDJSON) dosyasını cars tablosuna yükler.")
+    parser.add_argument("path", nargs="?", default=json_path)
+    parser.add_argument("--mode", choices=["replace", "upsert"], default="replace")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    # Postgre bağlantısı
+    conn = psycopg2.connect(
+        dbname=os.getenv("CAR_DB_NAME", "car_db"),
+        user=os.getenv("CAR_DB_USER", "car_db_user"),
+        password=os.getenv("CAR_DB_PASSWORD", "car_db_password"),
+        host=os.getenv("CAR_DB_HOST", "localhost"),   # Windows hostundan bağlanıyoruz
+        port=int(os.getenv("CAR_DB_PORT", "5433"))    # çünkü compose'ta 5433:5432 yaptın
+    )
+    try:
+        started = time.perf_counter()
+        total = load(conn, args.path, mode=args.mode, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - started
+    finally:
+        conn.close()
+
+    print(f"✅ {total} araç {elapsed:.2f} sn'de cars tablosuna yüklendi ({total / elapsed:.0f} satır/sn).")
+
+
+if __name__ == "__main__":
+    main()
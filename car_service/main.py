@@ -1,15 +1,23 @@
 import os
-from fastapi import FastAPI, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, or_
 from typing import List, Optional
-from pydantic import BaseModel
+from datetime import date
+from pydantic import BaseModel, TypeAdapter
 import redis
-import json
+import redis.asyncio as aioredis
+import orjson
 
-import models, schemas, database
+import models, schemas, database, cache, pagination, availability, breaker, catalog
+from shared import metrics
+from shared.logs import configure_logging
+from shared.auth import current_user_id
 from fastapi.middleware.cors import CORSMiddleware
-from elasticsearch import Elasticsearch
+from elasticsearch import AsyncElasticsearch
 from elasticsearch.exceptions import NotFoundError
 
 # --- Redis ve Elasticsearch Bağlantıları için Çevre Değişkenleri ---
@@ -17,6 +25,18 @@ ELASTIC_SEARCH_HOST = os.getenv("ELASTIC_SEARCH_HOST", "elasticsearch")
 ELASTIC_SEARCH_PORT = os.getenv("ELASTIC_SEARCH_PORT", "9200")
 REDIS_HOST = os.getenv("REDIS_HOST", "redis")
 REDIS_PORT = os.getenv("REDIS_PORT", "6379")
+# ES sağlıksızken isteklerin bekleyeceği en uzun süre; devre kesici açılana kadar geçerlidir
+ES_REQUEST_TIMEOUT = float(os.getenv("ES_REQUEST_TIMEOUT", "2"))
+ES_MAX_RETRIES = int(os.getenv("ES_MAX_RETRIES", "1"))
+
+SERVICE = "car_service"
+configure_logging(SERVICE)
+logger = logging.getLogger(__name__)
+# elastic_transport her isteği INFO seviyesinde yazar; süreler zaten /metrics'te
+logging.getLogger("elastic_transport").setLevel(logging.WARNING)
+
+# Komut süreleri /metrics'te dependency_call_seconds{dependency="redis"} olarak görünür
+TimedRedis = metrics.timed_redis(aioredis.StrictRedis, SERVICE)
 
 # --- Veritabanı ve Elasticsearch Bağlantıları ---
 DB_URL = os.getenv("DB_URL")
@@ -25,22 +45,119 @@ if not DB_URL:
 engine = database.engine
 SessionLocal = database.SessionLocal
 
-# Elasticsearch bağlantısı
-ES_CLIENT = Elasticsearch(
-    [f'http://{ELASTIC_SEARCH_HOST}:{ELASTIC_SEARCH_PORT}'],
-    basic_auth=('elastic', 'elastic_pass')
-)
+# İstemciler import anında değil, lifespan içinde oluşturulur
+ES_CLIENT = None
+redis_client = None
+
+# ES art arda hata verdiğinde aramalar bir süre ES'e hiç gitmeden veritabanına düşer.
+# NotFoundError (indeks yok) ES'in sağlıklı olduğunu gösterir.
+es_breaker = breaker.CircuitBreaker(SERVICE, "elasticsearch", healthy_errors=(NotFoundError,))
+
+# get_car için worker içi önbellek; pub/sub ile diğer worker'lardaki yazmalardan haberdar olur
+car_l1 = cache.L1Cache()
+invalidation_task = None
+
+# Liste uç noktaları için worker içi katalog anlık görüntüsü (CATALOG_SNAPSHOT=true ve NumPy gerekir)
+car_catalog = None
+catalog_task = None
+# Çalışırken referansı tutulması gereken arka plan görevleri
+background_tasks = set()
+
+def run_in_background(coro):
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+async def load_catalog():
+    """Katalog anlık görüntüsünü veritabanından (yeniden) kurar."""
+    global car_catalog
+    columns = [getattr(models.Car, name) for name in projected_names(None)]
+    async with SessionLocal() as session:
+        rows = (await session.execute(select(*columns).order_by(models.Car.id))).mappings().all()
+    car_catalog = catalog.CatalogSnapshot([shape_car(dict(row)) for row in rows])
+    logger.debug("Katalog anlık görüntüsü yüklendi.", extra={"cars": len(car_catalog)})
+
+async def refresh_catalog_car(car_id):
+    """Başka bir worker'ın yazdığı aracı anlık görüntüye uygular."""
+    async with SessionLocal() as session:
+        car = await session.get(models.Car, car_id)
+    if car_catalog is None:
+        return
+    if car is None:
+        car_catalog.remove(car_id)
+    else:
+        car_catalog.upsert(shape_car(car))
+
+def on_car_invalidated(message):
+    car_l1.pop(message["id"])
+    if car_catalog is not None:
+        if message["op"] == "delete":
+            car_catalog.remove(message["id"])
+        else:
+            run_in_background(refresh_catalog_car(message["id"]))
+
+def on_invalidations_reconnected():
+    # Kopukluk sırasında kaçan yazmalar bilinemez
+    car_l1.clear()
+    if car_catalog is not None:
+        run_in_background(load_catalog())
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global ES_CLIENT, redis_client, invalidation_task, catalog_task
+
+    # Elasticsearch bağlantısı
+    ES_CLIENT = AsyncElasticsearch(
+        [f'http://{ELASTIC_SEARCH_HOST}:{ELASTIC_SEARCH_PORT}'],
+        basic_auth=('elastic', 'elastic_pass'),
+        request_timeout=ES_REQUEST_TIMEOUT,
+        max_retries=ES_MAX_RETRIES,
+        retry_on_timeout=False,
+    )
 
-# Redis bağlantısı
-try:
-    redis_client = redis.StrictRedis(host=REDIS_HOST, port=REDIS_PORT, db=0, decode_responses=True)
-    redis_client.ping()
-    print("Redis'e başarıyla bağlanıldı.")
-except redis.exceptions.ConnectionError as e:
-    print(f"Redis bağlantı hatası: {e}. Uygulama Redis önbelleği olmadan çalışacak.")
-    redis_client = None
+    # Redis bağlantısı; önbellekteki yanıtlar hazır JSON baytları olarak tutulur
+    try:
+        redis_client = TimedRedis(host=REDIS_HOST, port=REDIS_PORT, db=0, decode_responses=False)
+        await redis_client.ping()
+        logger.info("Redis'e başarıyla bağlanıldı.")
+    except redis.exceptions.ConnectionError as e:
+        logger.warning("Redis bağlantı hatası; uygulama Redis önbelleği olmadan çalışacak.", extra={"error": str(e)})
+        redis_client = None
+
+    # Veritabanı tablolarını oluştur
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+        await conn.run_sync(models.create_search_indexes)
 
-app = FastAPI()
+    if catalog.CATALOG_ENABLED:
+        if catalog.available():
+            await load_catalog()
+            catalog_task = asyncio.create_task(catalog.refresh_periodically(load_catalog))
+        else:
+            logger.warning("CATALOG_SNAPSHOT açık ama NumPy kurulu değil; liste istekleri ES'e gidecek.")
+
+    if redis_client:
+        invalidation_task = asyncio.create_task(
+            cache.listen_for_invalidations(redis_client, on_car_invalidated, on_invalidations_reconnected)
+        )
+
+    try:
+        yield
+    finally:
+        # Uygulama kapandığında bağlantıları kapat
+        if invalidation_task:
+            invalidation_task.cancel()
+        if catalog_task:
+            catalog_task.cancel()
+        await ES_CLIENT.close()
+        if redis_client:
+            await redis_client.aclose()
+        await engine.dispose()
+
+app = FastAPI(lifespan=lifespan)
+
+# Route başına istek süreleri
+app.add_middleware(metrics.MetricsMiddleware, service=SERVICE)
 
 # CORS ayarları
 origins = [
@@ -55,11 +172,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[pagination.NEXT_CURSOR_HEADER],
 )
 
-# Veritabanı tablolarını oluştur
-models.Base.metadata.create_all(bind=engine)
-
 # Pydantic modeli
 class Car(BaseModel):
     id: int
@@ -73,138 +188,434 @@ class Car(BaseModel):
     class Config:
         from_attributes = True
 
+# Projeksiyonlu satırlar da Car alan tipleriyle doğrulanır (ör. NUMERIC -> Decimal, float'a çevrilir)
+CAR_FIELD_TYPES = {name: TypeAdapter(field.annotation) for name, field in Car.model_fields.items()}
+
+# Liste yanıtı için Elasticsearch `_source` alanından okunacak alanlar
+LIST_SOURCE_FIELDS = ["id", "car_name", "company", "daily_price", "engine", "fuel_type"]
+
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Welcome to the Car Service API"}
 
-# Araç ekleme uç noktası (CREATE)
+# Araç ekleme uç noktası (CREATE); yazma işlemleri user_service belirteci ister
 @app.post("/cars/", response_model=schemas.Car)
-def create_car(car: schemas.CarCreate, db: Session = Depends(database.get_db)):
+async def create_car(car: schemas.CarCreate, db: AsyncSession = Depends(database.get_db),
+                     user_id: int = Depends(current_user_id)):
     db_car = models.Car(**car.model_dump())
     db.add(db_car)
-    db.commit()
-    db.refresh(db_car)
+    await db.flush()
+    # ES güncellemesi aynı işlemde outbox'a yazılır; indexer.py tarafından uygulanır
+    db.add(models.CarOutbox(car_id=db_car.id, op="upsert"))
+    await db.commit()
+    await db.refresh(db_car)
+    if car_catalog is not None:
+        car_catalog.upsert(shape_car(db_car))
     
-    # Yeni araba eklendiğinde önbelleği temizle
+    # Yeni araba eklendiğinde önbelleği temizle ve katalog sürümünü artır
     if redis_client:
-        redis_client.delete("all_cars")
+        await cache.invalidate_tags(redis_client, cache.car_tags(db_car.company, db_car.daily_price))
+        await redis_client.incr(cache.CATALOG_VERSION_KEY)
+        await cache.publish_invalidation(redis_client, "create", db_car.id)
 
     return db_car
 
+def build_search_query(car_name, min_price, max_price):
+    query_body = {
+        "query": {
+            "bool": {
+                "must": [],
+                "filter": []
+            }
+        }
+    }
+    
+    if car_name:
+        query_body["query"]["bool"]["must"].append({
+            "match": {
+                "company": {
+                    "query": car_name,
+                    "fuzziness": "AUTO"
+                }
+            }
+        })
+        
+    price_range = {}
+    if min_price is not None:
+        price_range["gte"] = min_price
+    if max_price is not None:
+        price_range["lte"] = max_price
+
+    if price_range:
+        query_body["query"]["bool"]["filter"].append({
+            "range": {
+                "daily_price": price_range
+            }
+        }
+    )
+
+    # Eğer hiçbir filtre yoksa, tüm verileri getir
+    if not car_name and not min_price and not max_price:
+        query_body["query"] = {"match_all": {}}
+
+    return query_body
+
+async def index_is_fresh():
+    """ES indeksinin son yazmaları içerip içermediğini Redis'teki sürüm sayaçlarıyla kontrol eder."""
+    if not redis_client:
+        return True
+    version, indexed_version = await redis_client.mget(cache.CATALOG_VERSION_KEY, cache.INDEXED_VERSION_KEY)
+    return int(version or 0) <= int(indexed_version or 0)
+
+async def es_search(query_body, size):
+    async def search():
+        with metrics.timed(SERVICE, "elasticsearch", "search"):
+            return await ES_CLIENT.search(index="cars", body=query_body, size=size)
+
+    return await es_breaker.call(search)
+
+def shape_car(car, fields=None):
+    """Bir ORM nesnesini veya `_source` sözlüğünü liste yanıtındaki biçime getirir."""
+    if not isinstance(car, dict):
+        car = {name: getattr(car, name, None) for name in Car.model_fields}
+    if fields:
+        # Satır yalnızca istenen kolonları taşır; tam Car yerine her alan kendi tipiyle doğrulanır
+        return {name: CAR_FIELD_TYPES[name].validate_python(car.get(name)) for name in fields}
+    return Car.model_validate(car).model_dump()
+
+async def search_cars(db: AsyncSession, car_name=None, min_price=None, max_price=None,
+                      limit=pagination.DEFAULT_PAGE_SIZE, search_after=None, fields=None):
+    """Elasticsearch'te bir sayfa arar; (araçlar, sonraki imleç) döndürür.
+
+    İndeks güncelse yanıt doğrudan hit'lerin `_source` alanından kurulur; indeks son
+    yazmaların gerisindeyse araç bilgileri PostgreSQL'den okunur.
+    """
+    query_body = build_search_query(car_name, min_price, max_price)
+    # Yalnızca yanıtın ihtiyaç duyduğu alanları iste
+    query_body["_source"] = sorted(set(fields or LIST_SOURCE_FIELDS) & set(LIST_SOURCE_FIELDS) | {"id"})
+    # search_after için belirleyici bir sıralama gerekir; eşit skorlarda id kullanılır
+    query_body["sort"] = ([{"_score": "desc"}] if car_name else []) + [{"id": "asc"}]
+    if search_after:
+        query_body["search_after"] = search_after
+
+    res, fresh = await asyncio.gather(es_search(query_body, limit), index_is_fresh())
+    hits = res['hits']['hits']
+    next_cursor = pagination.encode_cursor(hits[-1]['sort']) if len(hits) == limit else None
+    return await cars_from_sources(db, [hit['_source'] for hit in hits], fields, fresh), next_cursor
+
+async def cars_from_sources(db: AsyncSession, sources, fields, fresh):
+    """Hit'lerin `_source` alanlarını yanıta çevirir; indeks gerideyse PostgreSQL'den okur."""
+    if fresh:
+        return [shape_car(source, fields) for source in sources]
+
+    car_ids = [source['id'] for source in sources]
+    
+    # PostgreSQL'den orijinal verileri çek
+    result = await db.execute(select(models.Car).where(models.Car.id.in_(car_ids)))
+    cars = result.scalars().all()
+    metrics.record_fallback(SERVICE, "stale_index", "index_behind", len(cars))
+    
+    # Elasticsearch'teki sıralamayı koru
+    car_dict = {car.id: car for car in cars}
+    return [shape_car(car_dict[id], fields) for id in car_ids if id in car_dict]
+
+async def search_available_cars(db: AsyncSession, start_date, end_date, car_name=None, min_price=None,
+                                max_price=None, limit=pagination.DEFAULT_PAGE_SIZE, search_after=None, fields=None):
+    """[start_date, end_date) aralığında boş olan araçları ES filtreleriyle birlikte arar.
+
+    Aralığın dolu araç bitmap'i tek seferde Redis'ten alınır; ES sonuçları sayfa sayfa
+    taranıp dolu araçlar elenir. İmleç, yanıta giren son aracın `sort` değeridir.
+    """
+    # is_available yalnızca bugünkü durumu gösterir; tarih aralığı bitmap'lerle kontrol edilir
+    query_body = build_search_query(car_name, min_price, max_price)
+    query_body["_source"] = sorted(set(fields or LIST_SOURCE_FIELDS) & set(LIST_SOURCE_FIELDS) | {"id"})
+    query_body["sort"] = ([{"_score": "desc"}] if car_name else []) + [{"id": "asc"}]
+
+    bitmap, fresh = await asyncio.gather(
+        availability.booked_bitmap(redis_client, start_date, end_date),
+        index_is_fresh(),
+    )
+    # Doluluk oranı yüksekse tek sayfayı doldurmak için daha fazla hit gerekir
+    scan_size = min(limit * 2, 10000)
+    sources = []
+    while True:
+        if search_after:
+            query_body["search_after"] = search_after
+        res = await es_search(query_body, scan_size)
+        hits = res['hits']['hits']
+        for hit in hits:
+            if availability.is_booked(bitmap, hit['_source']['id']):
+                continue
+            sources.append(hit['_source'])
+            if len(sources) == limit:
+                next_cursor = pagination.encode_cursor(hit['sort'])
+                return await cars_from_sources(db, sources, fields, fresh), next_cursor
+        if len(hits) < scan_size:
+            return await cars_from_sources(db, sources, fields, fresh), None
+        search_after = hits[-1]['sort']
+
+def escape_like(value):
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+def filter_cars(query, car_name=None, min_price=None, max_price=None):
+    """build_search_query'deki filtrelerin SQL karşılığı; ES'e ulaşılamadığında kullanılır."""
+    if car_name:
+        name = cache.normalize_name(car_name)
+        match = models.Car.company.ilike(f"%{escape_like(name)}%", escape="/")
+        if engine.dialect.name == "postgresql":
+            # pg_trgm benzerliği ES'teki fuzziness'a yaklaşır (ör. "mercedez" -> "MERCEDES")
+            match = or_(match, models.Car.company.op("%")(name))
+        query = query.where(match)
+    if min_price is not None:
+        query = query.where(models.Car.daily_price >= min_price)
+    if max_price is not None:
+        query = query.where(models.Car.daily_price <= max_price)
+    return query
+
+def projected_names(fields):
+    return [name for name in (fields or Car.model_fields) if hasattr(models.Car, name)]
+
+async def fetch_car_rows(db: AsyncSession, names, car_name=None, min_price=None, max_price=None,
+                         limit=pagination.DEFAULT_PAGE_SIZE, after_id=None):
+    """Filtreleri veritabanına indirir; id üzerinden keyset sayfalamayla sözlük satırlar döndürür."""
+    columns = [getattr(models.Car, name) for name in dict.fromkeys(["id", *names])]
+    query = filter_cars(select(*columns), car_name, min_price, max_price).order_by(models.Car.id).limit(limit)
+    if after_id is not None:
+        query = query.where(models.Car.id > after_id)
+    return [dict(row) for row in (await db.execute(query)).mappings().all()]
+
+async def list_cars_from_db(db: AsyncSession, car_name=None, min_price=None, max_price=None,
+                            limit=pagination.DEFAULT_PAGE_SIZE, after_id=None, fields=None):
+    """Elasticsearch'e ulaşılamadığında aynı filtrelerle PostgreSQL'den okur.
+
+    Sonuçlar alaka yerine id sırasıyla döner; imleç yalnızca id taşır.
+    """
+    rows = await fetch_car_rows(db, projected_names(fields), car_name, min_price, max_price, limit, after_id)
+    next_cursor = pagination.encode_cursor([rows[-1]["id"]]) if len(rows) == limit else None
+    return [shape_car(row, fields) for row in rows], next_cursor
+
+async def list_available_cars_from_db(db: AsyncSession, bitmap, car_name=None, min_price=None, max_price=None,
+                                      limit=pagination.DEFAULT_PAGE_SIZE, after_id=None, fields=None):
+    """search_available_cars'ın yedeği: veritabanı sayfa sayfa taranır, dolu araçlar bitmap ile elenir."""
+    names = projected_names(fields)
+    scan_size = min(limit * 2, 10000)
+    cars = []
+    while True:
+        rows = await fetch_car_rows(db, names, car_name, min_price, max_price, scan_size, after_id)
+        for row in rows:
+            if availability.is_booked(bitmap, row["id"]):
+                continue
+            cars.append(shape_car(row, fields))
+            if len(cars) == limit:
+                return cars, pagination.encode_cursor([row["id"]])
+        if len(rows) < scan_size:
+            return cars, None
+        after_id = rows[-1]["id"]
+
+def search_failed(e):
+    """Yedek yola düşüşü loglar ve metrik nedenini döndürür; devre açıkken uyarı yazılmaz."""
+    if isinstance(e, breaker.CircuitOpenError):
+        logger.debug("ES devresi açık; araçlar veritabanından listeleniyor.")
+        return "circuit_open"
+    logger.warning("Arama hatası; araçlar veritabanından listeleniyor.", extra={"error": str(e)})
+    return type(e).__name__
+
+def json_response(body, headers=None):
+    """Önceden kodlanmış JSON baytlarını yeniden doğrulamadan/serileştirmeden döndürür."""
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def page_response(body, next_cursor):
+    headers = {pagination.NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return json_response(body, headers)
+
 # Araçları listeleme ve filtreleme uç noktası (Elasticsearch ile güncellendi)
 @app.get("/cars/", response_model=List[Car])
-def get_filtered_cars(
-    db: Session = Depends(database.get_db),
+async def get_filtered_cars(
+    db: AsyncSession = Depends(database.get_db),
     car_name: Optional[str] = Query(None),
     min_price: Optional[int] = None,
-    max_price: Optional[int] = None
+    max_price: Optional[int] = None,
+    limit: int = Query(pagination.DEFAULT_PAGE_SIZE, ge=1, le=pagination.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
 ):
-    # Önbellek anahtarını belirle
-    cache_key = "all_cars"
-    
-    # Eğer sorguda filtre yoksa doğrudan Redis'ten veriyi kontrol et
-    if redis_client and not any([car_name, min_price, max_price]):
-        cached_data = redis_client.get(cache_key)
-        if cached_data:
-            print("Veri Redis önbelleğinden döndürüldü.")
-            return json.loads(cached_data)
+    try:
+        search_after = pagination.decode_cursor(cursor, scored=bool(car_name)) if cursor else None
+        projection = pagination.parse_fields(fields, Car.model_fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Anlık görüntü açıksa filtreler bellekte uygulanır; ES, Redis ve veritabanına gidilmez
+    if car_catalog is not None:
+        return page_response(*car_catalog.search(
+            car_name, min_price, max_price, limit=limit, search_after=search_after, fields=projection,
+        ))
+
+    # Veritabanı yedeğinin [id] imleci puan sıralı ES sorgusunu sürdüremez; sayfalama veritabanında sürer
+    if car_name and search_after and len(search_after) == 1:
+        cars, next_cursor = await list_cars_from_db(
+            db, car_name, min_price, max_price, limit=limit, after_id=search_after[0], fields=projection
+        )
+        metrics.record_fallback(SERVICE, "cars_db", "id_cursor", len(cars))
+        return page_response(orjson.dumps(cars), next_cursor)
 
     try:
-        query_body = {
-            "query": {
-                "bool": {
-                    "must": [],
-                    "filter": []
-                }
-            }
-        }
-        
-        if car_name:
-            query_body["query"]["bool"]["must"].append({
-                "match": {
-                    "company": {
-                        "query": car_name,
-                        "fuzziness": "AUTO"
-                    }
-                }
-            })
-            
-        price_range = {}
-        if min_price is not None:
-            price_range["gte"] = min_price
-        if max_price is not None:
-            price_range["lte"] = max_price
-
-        if price_range:
-            query_body["query"]["bool"]["filter"].append({
-                "range": {
-                    "daily_price": price_range
-                }
-            }
+        # Her sorgu normalleştirilmiş parmak iziyle önbelleğe alınır; anahtar yoksa tek bir istek yeniden oluşturur
+        if redis_client:
+            cache_key = cache.query_fingerprint(
+                car_name=car_name, min_price=min_price, max_price=max_price,
+                limit=limit, cursor=cursor, fields=projection,
+            )
+            tags = cache.query_tags(car_name, min_price, max_price)
+            ttl = cache.ALL_CARS_TTL if tags == [cache.ALL_TAG] else cache.QUERY_CACHE_TTL
+
+            async def rebuild_page():
+                # Eşzamanlı isteklerce paylaşıldığı için kendi oturumunu açar
+                async with SessionLocal() as session:
+                    cars, next_cursor = await search_cars(
+                        session, car_name, min_price, max_price,
+                        limit=limit, search_after=search_after, fields=projection,
+                    )
+                await cache.tag_entry(redis_client, cache_key, tags + cache.result_tags(cars), ttl)
+                return pagination.pack_page(orjson.dumps(cars), next_cursor)
+
+            cached_page, hit = await cache.get_or_rebuild(redis_client, cache_key, ttl, rebuild_page)
+            cache.record_lookup(tags, hit)
+            metrics.record_cache(SERVICE, "all_cars" if tags == [cache.ALL_TAG] else "cars_query", hit)
+            return page_response(*pagination.unpack_page(cached_page))
+
+        cars, next_cursor = await search_cars(
+            db, car_name, min_price, max_price, limit=limit, search_after=search_after, fields=projection
         )
+        return page_response(orjson.dumps(cars), next_cursor)
 
-        # Eğer hiçbir filtre yoksa, tüm verileri getir
-        if not car_name and not min_price and not max_price:
-            query_body["query"] = {"match_all": {}}
-        
-        res = ES_CLIENT.search(index="cars", body=query_body, size=10000)
-        
-        car_ids = [hit['_source']['id'] for hit in res['hits']['hits']]
-        
-        # PostgreSQL'den orijinal verileri çek
-        cars = db.query(models.Car).filter(models.Car.id.in_(car_ids)).all()
-        
-        # Elasticsearch'teki sıralamayı koru
-        car_dict = {car.id: car for car in cars}
-        ordered_cars = [car_dict[id] for id in car_ids if id in car_dict]
-
-        # Eğer sorguda filtre yoksa veriyi Redis'e yaz
-        if redis_client and not any([car_name, min_price, max_price]):
-            redis_client.setex(cache_key, 3600, json.dumps([Car.from_orm(car).model_dump() for car in ordered_cars]))
-            print("Veri Redis önbelleğine yazıldı.")
-        
-        return ordered_cars
+    except NotFoundError:
+        return page_response(b"[]", None)
+    except Exception as e:
+        reason = search_failed(e)
+        # ES'e ulaşılamıyorsa (veya devre açıksa) filtreler veritabanında uygulanır
+        after_id = search_after[-1] if search_after else None
+        cars, next_cursor = await list_cars_from_db(
+            db, car_name, min_price, max_price, limit=limit, after_id=after_id, fields=projection
+        )
+        metrics.record_fallback(SERVICE, "cars_db", reason, len(cars))
+        return page_response(orjson.dumps(cars), next_cursor)
+
+# Prometheus metrikleri (istek süreleri, önbellek, bağımlılık çağrıları, bağlantı havuzu)
+@app.get("/metrics")
+async def get_metrics():
+    body, content_type = metrics.metrics_response()
+    return Response(content=body, media_type=content_type)
+
+# Sorgu önbelleğinin etiket başına isabet oranları
+@app.get("/cache/stats")
+async def get_cache_stats():
+    return cache.tag_stats()
+
+# Tarih aralığında boş araçları arama uç noktası
+@app.get("/cars/available", response_model=List[Car])
+async def get_available_cars(
+    start_date: date,
+    end_date: date,
+    db: AsyncSession = Depends(database.get_db),
+    car_name: Optional[str] = Query(None),
+    min_price: Optional[int] = None,
+    max_price: Optional[int] = None,
+    limit: int = Query(pagination.DEFAULT_PAGE_SIZE, ge=1, le=pagination.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    try:
+        availability.validate_range(start_date, end_date)
+        search_after = pagination.decode_cursor(cursor, scored=bool(car_name)) if cursor else None
+        projection = pagination.parse_fields(fields, Car.model_fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+    # Doluluk bilgisi yalnızca Redis bitmap'lerinde tutulur
+    if not redis_client:
+        raise HTTPException(status_code=503, detail="Müsaitlik bilgisi şu anda kullanılamıyor.")
+
+    if car_catalog is not None:
+        bitmap = await availability.booked_bitmap(redis_client, start_date, end_date)
+        return page_response(*car_catalog.search(
+            car_name, min_price, max_price, limit=limit, search_after=search_after, fields=projection, booked=bitmap,
+        ))
+
+    if car_name and search_after and len(search_after) == 1:
+        bitmap = await availability.booked_bitmap(redis_client, start_date, end_date)
+        cars, next_cursor = await list_available_cars_from_db(
+            db, bitmap, car_name, min_price, max_price, limit=limit, after_id=search_after[0], fields=projection
+        )
+        metrics.record_fallback(SERVICE, "available_db", "id_cursor", len(cars))
+        return page_response(orjson.dumps(cars), next_cursor)
+
+    try:
+        cars, next_cursor = await search_available_cars(
+            db, start_date, end_date, car_name, min_price, max_price,
+            limit=limit, search_after=search_after, fields=projection,
+        )
     except NotFoundError:
-        return []
+        return page_response(b"[]", None)
     except Exception as e:
-        print(f"Arama hatası: {e}")
-        # Hata durumunda Elasticsearch'e bağlanmadan direkt veritabanından çekme
-        cars = db.query(models.Car).all()
-        return cars
+        reason = search_failed(e)
+        bitmap = await availability.booked_bitmap(redis_client, start_date, end_date)
+        after_id = search_after[-1] if search_after else None
+        cars, next_cursor = await list_available_cars_from_db(
+            db, bitmap, car_name, min_price, max_price, limit=limit, after_id=after_id, fields=projection
+        )
+        metrics.record_fallback(SERVICE, "available_db", reason, len(cars))
+    return page_response(orjson.dumps(cars), next_cursor)
 
 # Belirli bir aracı getirme uç noktası (READ)
 @app.get("/cars/{car_id}", response_model=schemas.Car)
-def get_car(car_id: int, db: Session = Depends(database.get_db)):
+async def get_car(car_id: int, db: AsyncSession = Depends(database.get_db)):
+    # Önbellekte hazır JSON baytları tutulur; isabetlerde response_model doğrulaması atlanır
     cache_key = f"car:{car_id}"
     if redis_client:
-        cached_data = redis_client.get(cache_key)
-        if cached_data:
-            print("Veri Redis önbelleğinden döndürüldü.")
-            return Car.model_validate_json(cached_data)
+        # Önce worker içi önbellek: Redis'e gitmeden döner
+        cached_body = car_l1.get(car_id)
+        metrics.record_cache(SERVICE, "car_l1", cached_body is not None)
+        if cached_body is not None:
+            return json_response(cached_body)
+
+        cached_body = await redis_client.get(cache_key)
+        metrics.record_cache(SERVICE, "car", bool(cached_body))
+        if cached_body:
+            car_l1.set(car_id, cached_body)
+            return json_response(cached_body)
 
-    db_car = db.query(models.Car).filter(models.Car.id == car_id).first()
+    db_car = await db.get(models.Car, car_id)
     if db_car is None:
         raise HTTPException(status_code=404, detail="Car not found")
-        
+
+    body = orjson.dumps(schemas.Car.model_validate(db_car, from_attributes=True).model_dump())
     if redis_client:
-        redis_client.setex(cache_key, 3600, Car.from_orm(db_car).model_dump_json())
+        await redis_client.setex(cache_key, 3600, body)
+        car_l1.set(car_id, body)
     
-    return db_car
+    return json_response(body)
 
 # Araç silme uç noktası (DELETE)
 @app.delete("/cars/{car_id}", response_model=schemas.Car)
-def delete_car(car_id: int, db: Session = Depends(database.get_db)):
-    db_car = db.query(models.Car).filter(models.Car.id == car_id).first()
+async def delete_car(car_id: int, db: AsyncSession = Depends(database.get_db),
+                     user_id: int = Depends(current_user_id)):
+    db_car = await db.get(models.Car, car_id)
     if db_car is None:
         raise HTTPException(status_code=404, detail="Car not found")
     
-    db.delete(db_car)
-    db.commit()
+    await db.delete(db_car)
+    db.add(models.CarOutbox(car_id=car_id, op="delete"))
+    await db.commit()
+    if car_catalog is not None:
+        car_catalog.remove(car_id)
 
     # Silme işleminden sonra ilgili önbellekleri temizle
     if redis_client:
-        redis_client.delete(f"car:{car_id}")
-        redis_client.delete("all_cars")
+        car_l1.pop(car_id)
+        await redis_client.delete(f"car:{car_id}")
+        await cache.invalidate_tags(redis_client, cache.car_tags(db_car.company, db_car.daily_price))
+        await redis_client.incr(cache.CATALOG_VERSION_KEY)
+        await cache.publish_invalidation(redis_client, "delete", car_id)
 
-    return db_car
\ No newline at end of file
+    return db_car
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, Float
+from sqlalchemy import Column, Integer, String, Boolean, Float, DateTime, Index, DDL, event, func
+from sqlalchemy.schema import CreateIndex
 from database import Base
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -18,6 +19,43 @@ class Car(Base):
     torque = Column(String)
     is_available = Column(Boolean, default=True)
 
+# ES'e ulaşılamadığında liste filtreleri PostgreSQL'e indirilir (main.fetch_car_rows):
+# fiyat aralığı B-tree, marka araması (ILIKE ve benzerlik) trigram GIN indeksiyle karşılanır
+CAR_PRICE_INDEX = Index("ix_cars_daily_price", Car.daily_price)
+CAR_COMPANY_TRGM_INDEX = Index(
+    "ix_cars_company_trgm", Car.company,
+    postgresql_using="gin", postgresql_ops={"company": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+event.listen(
+    Car.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+def create_search_indexes(connection):
+    """create_all mevcut tablolara indeks eklemez; eski kurulumlarda eksik indeksleri oluşturur."""
+    indexes = [CAR_PRICE_INDEX]
+    if connection.dialect.name == "postgresql":
+        connection.execute(DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        indexes.append(CAR_COMPANY_TRGM_INDEX)
+    for index in indexes:
+        connection.execute(CreateIndex(index, if_not_exists=True))
+
+class CarOutbox(Base):
+    # Araç yazmaları aynı işlemde buraya da kaydedilir; indexer.py bu tabloyu ES'e yansıtır
+    __tablename__ = "car_outbox"
+    id = Column(Integer, primary_key=True, index=True)
+    car_id = Column(Integer, nullable=False)
+    op = Column(String, nullable=False)  # "upsert" veya "delete"
+    created_at = Column(DateTime, server_default=func.now())
+
+class IndexerWatermark(Base):
+    # İndeksleyicinin ES'e yansıttığı son outbox kaydı; kesintiden sonra buradan devam edilir
+    __tablename__ = "indexer_watermark"
+    name = Column(String, primary_key=True)
+    last_outbox_id = Column(Integer, nullable=False, default=0)
+
 class Booking(Base):
     __tablename__ = "bookings"
     id = Column(Integer, primary_key=True, index=True)
@@ -0,0 +1,60 @@
+import os
+import json
+import base64
+
+# --- Liste uç noktası sayfalama ayarları ---
+DEFAULT_PAGE_SIZE = int(os.getenv("CARS_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("CARS_MAX_PAGE_SIZE", "1000"))
+
+# Sonraki sayfanın imleci bu başlıkta döner; yanıt gövdesi araç listesi olarak kalır
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_values):
+    """ES `sort` değerlerini (ya da SQL yolundaki son id'yi) opak bir imlece çevirir."""
+    raw = json.dumps(sort_values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, scored=False):
+    """İmleci çözer ve sorgunun sıralamasına uyduğunu doğrular.
+
+    `scored` (car_name verildi) ise ES imleci [puan, id] olur; SQL yedeğinin imleci her zaman [id]'dir.
+    Uyumsuz imleç ES'e gönderilirse 400 döner ve devre kesiciye hata olarak yazılır.
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except ValueError:
+        raise ValueError("Geçersiz imleç")
+    # Son eleman her iki yolda da aracın id'sidir
+    if not isinstance(values, list) or not values or not isinstance(values[-1], int):
+        raise ValueError("Geçersiz imleç")
+    if len(values) > 2 or (len(values) == 2 and not (scored and is_score(values[0]))):
+        raise ValueError("İmleç bu sorgunun sıralamasıyla uyumlu değil")
+    return values
+
+
+def is_score(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def parse_fields(fields, allowed):
+    """`fields=company,daily_price` parametresini doğrular; projeksiyon yoksa None döner."""
+    if not fields:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise ValueError(f"Bilinmeyen alan(lar): {', '.join(unknown)}")
+    return list(dict.fromkeys(requested))
+
+
+def pack_page(body, next_cursor):
+    """Önbelleğe yazılacak sayfa: ilk satır sonraki imleç, ardından hazır JSON gövde (bayt)."""
+    return (next_cursor or "").encode() + b"\n" + body
+
+
+def unpack_page(payload):
+    next_cursor, _, body = payload.partition(b"\n")
+    return body, next_cursor.decode() or None
@@ -0,0 +1,101 @@
+"""car_service testleri: uygulama lifespan'iyle süreç içinde çalışır.
+
+Elasticsearch yerine benchmarks/standins.py, Redis yerine fakeredis, PostgreSQL yerine geçici
+bir SQLite dosyası kullanılır. booking_service de `main` modülü kullandığından her servisin
+testleri ayrı çalıştırılır:
+
+    python -m pytest car_service/tests
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+import pytest
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+ROOT = os.path.join(SERVICE_DIR, "..")
+TEST_JWT_KEY = "car-service-test-signing-key-not-for-production"
+
+os.environ["DB_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'car_test.db')}"
+os.environ["JWT_SIGNING_KEY"] = TEST_JWT_KEY
+os.environ["CATALOG_SNAPSHOT"] = "false"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+sys.path.insert(0, SERVICE_DIR)
+sys.path.append(ROOT)  # shared/
+sys.path.append(os.path.join(ROOT, "benchmarks"))  # standins
+
+import fakeredis.aioredis  # noqa: E402
+import httpx  # noqa: E402
+import jwt  # noqa: E402
+
+import main  # noqa: E402
+import models  # noqa: E402
+from shared import metrics  # noqa: E402
+from standins import StandInElasticsearch  # noqa: E402
+
+CAR_COLUMNS = [column.name for column in models.Car.__table__.columns]
+
+
+def load_cars(count=200):
+    with open(os.path.join(SERVICE_DIR, "cars.json"), encoding="utf-8") as f:
+        return json.load(f)[:count]
+
+
+def make_auth_headers(user_id=1):
+    now = int(time.time())
+    claims = {"token_type": "access", "exp": now + 3600, "iat": now, "jti": uuid.uuid4().hex, "user_id": user_id}
+    return {"Authorization": f"Bearer {jwt.encode(claims, TEST_JWT_KEY, algorithm='HS256')}"}
+
+
+class Service:
+    """Bir test senaryosunun çalıştığı uygulama: HTTP istemcisi ve ES yedeği (arama sayacıyla)."""
+
+    def __init__(self, client, search):
+        self.client = client
+        self.search = search
+
+
+@pytest.fixture
+def auth_headers():
+    return make_auth_headers()
+
+
+@pytest.fixture
+def cars():
+    return load_cars()
+
+
+@pytest.fixture
+def run_service(cars):
+    """`run_service(scenario)`: `await scenario(service)` uygulama ayaktayken çalıştırılır."""
+    def run(scenario):
+        documents = [{name: car.get(name) for name in main.LIST_SOURCE_FIELDS} for car in cars]
+        search = StandInElasticsearch(documents)
+        server = fakeredis.FakeServer()
+
+        class TestRedis(fakeredis.aioredis.FakeRedis):
+            def __init__(self, *args, **kwargs):
+                super().__init__(server=server, decode_responses=kwargs.get("decode_responses", False))
+
+        main.AsyncElasticsearch = lambda *args, **kwargs: search
+        main.TimedRedis = metrics.timed_redis(TestRedis, "car_service")
+        main.car_l1.clear()
+
+        async def start():
+            async with main.app.router.lifespan_context(main.app):
+                async with main.SessionLocal() as db:
+                    await db.execute(models.CarOutbox.__table__.delete())
+                    await db.execute(models.Car.__table__.delete())
+                    db.add_all([models.Car(**{name: car.get(name) for name in CAR_COLUMNS}) for car in cars])
+                    await db.commit()
+                transport = httpx.ASGITransport(app=main.app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://car") as client:
+                    return await scenario(Service(client, search))
+
+        return asyncio.run(start())
+
+    return run
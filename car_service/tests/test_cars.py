@@ -0,0 +1,143 @@
+import asyncio
+import time
+from collections import Counter
+
+import fakeredis.aioredis
+
+import cache
+import pagination
+
+
+def busiest_company(cars):
+    return Counter(car["company"] for car in cars).most_common(1)[0][0]
+
+
+async def walk_pages(client, **params):
+    """İmleç başlığını izleyerek tüm sayfaları okur."""
+    pages, cursor = [], None
+    while True:
+        response = await client.get("/cars/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get(pagination.NEXT_CURSOR_HEADER)
+        if not cursor:
+            return pages
+
+
+def test_cursor_pagination_visits_every_car_once(run_service, cars):
+    async def scenario(service):
+        return await walk_pages(service.client, limit=30)
+
+    pages = run_service(scenario)
+    ids = [car["id"] for page in pages for car in page]
+    assert ids == sorted(car["id"] for car in cars)
+    assert all(len(page) == 30 for page in pages[:-1])
+
+
+def test_cursor_pagination_by_relevance_matches_single_page(run_service, cars):
+    company = busiest_company(cars)
+
+    async def scenario(service):
+        everything = (await service.client.get("/cars/", params={"car_name": company, "limit": 1000})).json()
+        return everything, await walk_pages(service.client, car_name=company, limit=3)
+
+    everything, pages = run_service(scenario)
+    assert len(everything) > 3
+    assert [car["id"] for page in pages for car in page] == [car["id"] for car in everything]
+
+
+def test_mismatched_cursor_is_rejected_before_search(run_service):
+    async def scenario(service):
+        scored_cursor = pagination.encode_cursor([1.5, 10])
+        response = await service.client.get("/cars/", params={"cursor": scored_cursor})
+        return response, service.search.searches
+
+    response, searches = run_service(scenario)
+    assert response.status_code == 400
+    assert searches == 0
+
+
+def test_id_cursor_with_car_name_continues_in_database(run_service, cars):
+    company = busiest_company(cars)
+    first_id = min(car["id"] for car in cars if car["company"] == company)
+
+    async def scenario(service):
+        response = await service.client.get("/cars/", params={
+            "car_name": company, "limit": 2, "cursor": pagination.encode_cursor([first_id]),
+        })
+        return response, service.search.searches
+
+    response, searches = run_service(scenario)
+    assert response.status_code == 200, response.text
+    assert searches == 0
+    assert all(car["id"] > first_id and car["company"] == company for car in response.json())
+
+
+def test_fields_projection(run_service):
+    async def scenario(service):
+        projected = await service.client.get("/cars/", params={"fields": "company,daily_price", "limit": 5})
+        unknown = await service.client.get("/cars/", params={"fields": "company,owner"})
+        return projected, unknown
+
+    projected, unknown = run_service(scenario)
+    assert projected.status_code == 200
+    assert projected.json() and all(set(car) == {"company", "daily_price"} for car in projected.json())
+    assert unknown.status_code == 400
+
+
+def test_create_and_delete_invalidate_matching_queries(run_service, cars, auth_headers):
+    company = busiest_company(cars)
+    other = next(car["company"] for car in cars if cache.normalize_name(car["company"]) != cache.normalize_name(company))
+    new_car = {
+        "company": company, "car_name": "Test", "engine": "V8", "total_speed": "300 km/h",
+        "performance_0_100_kmh": "3.5 sec", "daily_price": 500, "fuel_type": "Petrol",
+        "seats": "2", "torque": "700 Nm", "is_available": True,
+    }
+
+    async def scenario(service):
+        client, search = service.client, service.search
+
+        async def searches_for(name):
+            before = search.searches
+            assert (await client.get("/cars/", params={"car_name": name})).status_code == 200
+            return search.searches - before
+
+        # İlk istekler önbelleği doldurur, tekrarları ES'e gitmez
+        assert await searches_for(company) == 1 and await searches_for(other) == 1
+        assert await searches_for(company) == 0
+
+        created = await client.post("/cars/", json=new_car, headers=auth_headers)
+        assert created.status_code == 200, created.text
+        after_create = (await searches_for(company), await searches_for(other))
+
+        deleted = await client.delete(f"/cars/{created.json()['id']}", headers=auth_headers)
+        assert deleted.status_code == 200, deleted.text
+        after_delete = (await searches_for(company), await searches_for(other))
+        return after_create, after_delete
+
+    after_create, after_delete = run_service(scenario)
+    # Yalnızca yazılan aracın markasına ait sorgu yeniden oluşturulur
+    assert after_create == (1, 0)
+    assert after_delete == (1, 0)
+
+
+def test_stale_entry_served_when_rebuild_fails():
+    async def scenario():
+        redis_client = fakeredis.aioredis.FakeRedis()
+        # Mantıksal süresi dolmuş (yenilenmesi gereken) bir giriş
+        await redis_client.set("cars:q", b"%.3f 0.0100\n" % (time.time() - 1) + b"stale")
+
+        async def failing_rebuild():
+            raise ConnectionError("ES kapalı")
+
+        payload, hit = await cache.get_or_rebuild(redis_client, "cars:q", 60, failing_rebuild)
+        await redis_client.delete("cars:q")
+        try:
+            await cache.get_or_rebuild(redis_client, "cars:q", 60, failing_rebuild)
+        except ConnectionError:
+            missing_raises = True
+        else:
+            missing_raises = False
+        return payload, hit, missing_raises
+
+    assert asyncio.run(scenario()) == (b"stale", False, True)
@@ -0,0 +1,5 @@
+"""Servisler arasında paylaşılan yardımcılar (bağlantı havuzu, metrikler, loglama).
+
+Docker imajları depo kökünden derlenir ve bu paket her servisin /app dizinine
+kopyalanır; yerelde servis dizininden çalıştırırken PYTHONPATH=.. verin.
+"""
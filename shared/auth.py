@@ -0,0 +1,97 @@
+import os
+import time
+from collections import OrderedDict
+
+import jwt
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+# --- user_service (simplejwt) erişim belirteçlerinin yerel doğrulaması ---
+# simplejwt'nin SIGNING_KEY'i; user_service'te varsayılan olarak Django SECRET_KEY'dir
+JWT_SIGNING_KEY = os.getenv("JWT_SIGNING_KEY")
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+JWT_USER_ID_CLAIM = os.getenv("JWT_USER_ID_CLAIM", "user_id")
+# Saat farkı toleransı (saniye)
+JWT_LEEWAY = int(os.getenv("JWT_LEEWAY", "0"))
+# Doğrulanmış belirteçlerin tutulacağı en fazla kayıt (worker başına)
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+
+
+class AuthError(Exception):
+    pass
+
+
+class TokenVerifier:
+    """simplejwt erişim belirteçlerini ağ çağrısı yapmadan doğrular.
+
+    İmza anahtarı bir kez hazırlanır. Doğrulanan belirteçlerin claim'leri süreleri
+    dolana kadar küçük bir LRU'da tutulur; aynı belirteçle gelen sonraki istekler
+    imza doğrulamasını atlar.
+    """
+
+    def __init__(self, key, algorithm=JWT_ALGORITHM, cache_size=JWT_CACHE_SIZE, leeway=JWT_LEEWAY):
+        self.algorithm = algorithm
+        self.leeway = leeway
+        self.cache_size = cache_size
+        self._key = jwt.get_algorithm_by_name(algorithm).prepare_key(key) if key else None
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def verify(self, token):
+        """Belirtecin claim'lerini döndürür; geçersizse AuthError fırlatır."""
+        cached = self._cache.get(token)
+        if cached is not None:
+            claims, expires_at = cached
+            if time.time() < expires_at:
+                self._cache.move_to_end(token)
+                self.hits += 1
+                return claims
+            del self._cache[token]
+
+        self.misses += 1
+        claims = self._decode(token)
+        self._cache[token] = (claims, claims["exp"] + self.leeway)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return claims
+
+    def _decode(self, token):
+        if self._key is None:
+            raise AuthError("JWT_SIGNING_KEY ayarlanmamış.")
+        try:
+            claims = jwt.decode(
+                token, self._key, algorithms=[self.algorithm], leeway=self.leeway,
+                options={"require": ["exp", JWT_USER_ID_CLAIM]},
+            )
+        except jwt.InvalidTokenError as e:
+            raise AuthError(str(e))
+        # Yenileme (refresh) belirteçleri API çağrılarında kabul edilmez
+        if claims.get("token_type", "access") != "access":
+            raise AuthError("Erişim belirteci bekleniyordu.")
+        return claims
+
+
+verifier = TokenVerifier(JWT_SIGNING_KEY)
+bearer = HTTPBearer(auto_error=False)
+
+
+def user_id_from(claims):
+    # simplejwt sürümüne göre user_id sayı ya da metin olarak yazılır
+    return int(claims[JWT_USER_ID_CLAIM])
+
+
+async def current_user_id(credentials: HTTPAuthorizationCredentials = Depends(bearer)):
+    """FastAPI bağımlılığı: Authorization: Bearer <access token> başlığından kullanıcı id'si."""
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Kimlik doğrulama gerekli.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    try:
+        return user_id_from(verifier.verify(credentials.credentials))
+    except (AuthError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail=f"Geçersiz belirteç: {e}",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
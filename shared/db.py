@@ -0,0 +1,129 @@
+import os
+import time
+import uuid
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from prometheus_client import Gauge, Histogram
+
+from shared.metrics import DEPENDENCY_SECONDS
+
+# --- Veritabanı bağlantı havuzu ayarları (car_service ve booking_service ortak) ---
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+# Havuz doluyken açılabilecek ek bağlantılar
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+# Boş bağlantı beklenecek en uzun süre (saniye)
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+# Bu süreden eski bağlantılar yeniden açılır (saniye)
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Bağlantı havuzdan alınırken kopmuşsa istekten önce yenilenir
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# asyncpg'nin bağlantı başına hazırlanmış ifade önbelleği
+STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+# PgBouncer (transaction pooling) arkasında: havuzu PgBouncer tutar, hazırlanmış ifadeler kapatılır
+PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds", "Havuzdan bağlantı almak için beklenen süre", ["service"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+POOL_IN_USE = Gauge("db_pool_in_use", "Şu an kullanımdaki bağlantılar", ["service"])
+POOL_OVERFLOW = Gauge("db_pool_overflow", "pool_size üstünde açılmış bağlantılar (negatif: açılmamış kapasite)", ["service"])
+POOL_SIZE_GAUGE = Gauge("db_pool_size", "Yapılandırılmış havuz boyutu", ["service"])
+
+
+def async_url(url):
+    """Senkron URL'yi asenkron sürücüye çevirir (postgresql -> asyncpg, sqlite -> aiosqlite)."""
+    url = make_url(url)
+    drivername = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    url = url.set(drivername=drivername)
+    if drivername == "postgresql+asyncpg":
+        cache_size = 0 if PGBOUNCER else STATEMENT_CACHE_SIZE
+        url = url.update_query_dict({"prepared_statement_cache_size": str(cache_size)})
+    return url
+
+
+def timed_pool(base, service):
+    """Bağlantı alma süresini db_pool_checkout_seconds'a yazan havuz sınıfı.
+
+    QueuePool'da bu, boş bağlantı bekleme süresidir; PgBouncer modundaki NullPool'da
+    her alımda yeni bağlantı açıldığından bağlanma süresidir. Servis adı sınıfta
+    tutulur; engine.dispose() havuzu yeniden oluşturduğunda da korunur.
+    """
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return base._do_get(self)
+        finally:
+            checkout_seconds.observe(time.perf_counter() - started)
+
+    checkout_seconds = POOL_CHECKOUT_SECONDS.labels(service)
+    return type(f"Timed{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def engine_options(url, service):
+    """create_async_engine için havuz ayarları; metrikler `service` etiketiyle yazılır."""
+    if url.get_backend_name() != "postgresql":
+        return {}
+    if PGBOUNCER:
+        return {
+            "poolclass": timed_pool(NullPool, service),
+            "connect_args": {
+                # PgBouncer aynı istemciye farklı sunucu bağlantıları verebilir; asyncpg'nin
+                # kendi ifade önbelleği kapatılır ve isimler çakışmasın diye benzersiz yapılır
+                "statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            },
+        }
+    return {
+        "poolclass": timed_pool(AsyncAdaptedQueuePool, service),
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_pre_ping": POOL_PRE_PING,
+    }
+
+
+def instrument_pool(engine, service):
+    """Havuzun kullanım, taşma ve boyut göstergelerini /metrics'e bağlar."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    in_use = POOL_IN_USE.labels(service)
+
+    # Motor düzeyindeki dinleyiciler dispose() sonrası yeni havuza da uygulanır
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        in_use.inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        in_use.dec()
+
+    if hasattr(sync_engine.pool, "overflow"):
+        POOL_OVERFLOW.labels(service).set_function(lambda: sync_engine.pool.overflow())
+        POOL_SIZE_GAUGE.labels(service).set_function(lambda: sync_engine.pool.size())
+
+
+def instrument_queries(engine, service):
+    """Her SQL ifadesinin süresini ifade türüyle (SELECT, INSERT...) dependency_call_seconds'a yazar."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    # Bağımlılık etiketi lehçedir: postgresql (SQLite yedeğinde sqlite)
+    dependency = sync_engine.dialect.name
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+        DEPENDENCY_SECONDS.labels(service, dependency, operation).observe(time.perf_counter() - started)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def on_error(context):
+        # Hata veren ifadenin başlangıç zamanı yığında kalmasın
+        if context.connection is not None and context.connection.info.get("query_started"):
+            context.connection.info["query_started"].pop()
@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import random
+import logging
+from logging.handlers import QueueHandler, QueueListener
+
+# --- Yapılandırılmış log ayarları ---
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# DEBUG/INFO kayıtlarının yazılma oranı (0-1); uyarı ve hatalar her zaman yazılır
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+
+# Kayıt sözlüğünde her zaman bulunan alanlar; bunların dışındakiler `extra` ile gelmiştir
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Her kaydı tek satırlık JSON olarak yazar; `extra` alanları da eklenir."""
+
+    def __init__(self, service):
+        super().__init__()
+        self.service = service
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "service": self.service,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update({k: v for k, v in vars(record).items() if k not in _RESERVED})
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """DEBUG/INFO kayıtlarını `rate` oranında örnekler."""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or self.rate >= 1 or random.random() < self.rate
+
+
+def configure_logging(service):
+    """Kök logger'ı JSON biçimine ve LOG_LEVEL seviyesine ayarlar.
+
+    Kayıtlar bir kuyruğa bırakılır ve stdout'a arka plandaki bir iş parçacığı yazar;
+    istek yolu yazma işlemini beklemez. Birden çok çağrıda yalnızca ilki etkilidir.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter(service))
+    records = queue.SimpleQueue()
+    _listener = QueueListener(records, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    handler = QueueHandler(records)
+    handler.addFilter(SamplingFilter(LOG_SAMPLE_RATE))
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(LOG_LEVEL)
@@ -0,0 +1,130 @@
+import time
+from contextlib import contextmanager
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# --- Servisler arası ortak metrikler ---
+# Tüm metrikler `service` etiketi taşır; aynı kütüphane üç serviste de kullanılır
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Route başına istek süresi",
+    ["service", "method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+DEPENDENCY_SECONDS = Histogram(
+    "dependency_call_seconds", "Dış bağımlılık (ES, Postgres, Redis, RabbitMQ) çağrı süresi",
+    ["service", "dependency", "operation"], buckets=LATENCY_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total", "Önbellek isabet/ıska sayıları", ["service", "cache", "result"],
+)
+FALLBACK_REQUESTS = Counter(
+    "fallback_requests_total", "Yedek yola düşen istekler", ["service", "path", "reason"],
+)
+FALLBACK_ROWS = Histogram(
+    "fallback_rows", "Yedek yoldan okunan satır sayısı", ["service", "path"],
+    buckets=(0, 1, 5, 10, 20, 50, 100, 250, 500, 1000),
+)
+CIRCUIT_OPEN = Gauge(
+    "circuit_breaker_open", "Devre kesici açık mı (1) kapalı mı (0)", ["service", "dependency"],
+)
+
+# Eşleşmeyen yollar (404) route etiketini şişirmesin diye tek değerde toplanır
+UNMATCHED_ROUTE = "unmatched"
+
+
+def metrics_response():
+    """/metrics uç noktaları için Prometheus metin biçimi: (gövde, content-type)."""
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+@contextmanager
+def timed(service, dependency, operation):
+    """Bloğun süresini dependency_call_seconds'a yazar; `await` içeren bloklarda da kullanılır."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        DEPENDENCY_SECONDS.labels(service, dependency, operation).observe(time.perf_counter() - started)
+
+
+def record_cache(service, cache, hit):
+    CACHE_LOOKUPS.labels(service, cache, "hit" if hit else "miss").inc()
+
+
+def record_fallback(service, path, reason, rows):
+    FALLBACK_REQUESTS.labels(service, path, reason).inc()
+    FALLBACK_ROWS.labels(service, path).observe(rows)
+
+
+def timed_redis(base, service):
+    """Her komutun süresini komut adıyla dependency_call_seconds'a yazan Redis istemci sınıfı.
+
+    Pipeline'lar tek bir `pipeline` işlemi olarak ölçülür.
+    """
+    async def execute_command(self, *args, **options):
+        with timed(service, "redis", str(args[0]).lower()):
+            return await base.execute_command(self, *args, **options)
+
+    def pipeline(self, *args, **kwargs):
+        pipe = base.pipeline(self, *args, **kwargs)
+        execute = pipe.execute
+
+        async def timed_execute(*exec_args, **exec_kwargs):
+            with timed(service, "redis", "pipeline"):
+                return await execute(*exec_args, **exec_kwargs)
+
+        pipe.execute = timed_execute
+        return pipe
+
+    return type(f"Timed{base.__name__}", (base,), {"execute_command": execute_command, "pipeline": pipeline})
+
+
+class MetricsMiddleware:
+    """FastAPI/Starlette için ASGI ara katmanı; süreleri route şablonuyla (/cars/{car_id}) yazar."""
+
+    def __init__(self, app, service):
+        self.app = app
+        self.service = service
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Router eşleşen route'u scope'a yazar
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            HTTP_REQUEST_SECONDS.labels(self.service, scope["method"], route, status).observe(
+                time.perf_counter() - started
+            )
+
+
+class DjangoMetricsMiddleware:
+    """Django için aynı istek süresi metriği; MIDDLEWARE listesinin başına eklenir."""
+
+    service = "user_service"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        match = getattr(request, "resolver_match", None)
+        # DRF router'ları regex desen kullanır: ^users/(?P<pk>[^/.]+)/$ -> /users/(?P<pk>[^/.]+)/
+        route = "/" + match.route.replace("^", "").replace("$", "") if match and match.route else UNMATCHED_ROUTE
+        HTTP_REQUEST_SECONDS.labels(self.service, request.method, route, response.status_code).observe(
+            time.perf_counter() - started
+        )
+        return response
@@ -0,0 +1,10 @@
+#!/bin/sh
+set -e
+
+# Veritabanı geçişleri imaj derlenirken değil, servis başlarken uygulanır.
+# Birden çok kopya çalışıyorsa geçişleri tek bir iş ile yapıp RUN_MIGRATIONS=false verin.
+if [ "${RUN_MIGRATIONS:-true}" = "true" ]; then
+    python manage.py migrate --noinput
+fi
+
+exec "$@"
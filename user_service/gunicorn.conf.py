@@ -0,0 +1,25 @@
+# Üretim sunucusu: gunicorn -c gunicorn.conf.py
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+
+# Varsayılan: wsgi.py üzerinde iş parçacıklı worker'lar. DRF görünümleri senkron olduğu için
+# ASGI altında her istek sync_to_async ile ayrı bir iş parçacığına taşınır ve CONN_MAX_AGE
+# bağlantıları istekler arasında yeniden kullanılamaz. GUNICORN_WORKER_CLASS=
+# uvicorn.workers.UvicornWorker ile asgi.py sunulur (bu durumda DB_CONN_MAX_AGE=0 önerilir).
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+wsgi_app = 'user_service.asgi:application' if 'uvicorn' in worker_class.lower() else 'user_service.wsgi:application'
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+# Bellek sızıntılarına karşı worker'ları belirli istek sayısından sonra yeniden başlat
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '10000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '1000'))
+
+# Uygulama logları shared/logs.py ile JSON olarak yazılır; gunicorn erişim logu kapalı
+accesslog = None
+errorlog = '-'
+loglevel = os.getenv('LOG_LEVEL', 'info').lower()
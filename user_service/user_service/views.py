@@ -0,0 +1,9 @@
+from django.http import HttpResponse
+
+from shared.metrics import metrics_response
+
+
+def metrics(request):
+    """Prometheus metrikleri (istek süreleri); kimlik doğrulama istemez."""
+    body, content_type = metrics_response()
+    return HttpResponse(body, content_type=content_type)
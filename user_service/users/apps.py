@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        # Kullanıcı önbelleğini geçersiz kılan sinyaller
+        from . import signals  # noqa: F401
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+# Önbellekte tutulan, yetkilendirmenin ihtiyaç duyduğu alanlar. Parola hash'i ve profil
+# bilgileri önbelleğe yazılmaz; gerekirse (ör. /me/) veritabanından okunur.
+AUTH_USER_FIELDS = ('id', 'username', 'is_active', 'is_staff', 'is_superuser')
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def auth_user(values):
+    """Önbellekteki alanlardan hafif bir kullanıcı kurar; diğer alanlar ertelenmiştir (deferred)."""
+    model = get_user_model()
+    # from_db değerleri modelin kolon sırasıyla bekler
+    names = [field.attname for field in model._meta.concrete_fields if field.attname in values]
+    return model.from_db(DEFAULT_DB_ALIAS, names, [values[name] for name in names])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """Kullanıcıyı her istekte veritabanından okumak yerine önbellekten alan JWTAuthentication.
+
+    Önbellekte yalnızca simplejwt kontrollerinden geçmiş kullanıcıların AUTH_USER_FIELDS
+    değerleri tutulur; kayıt USER_CACHE_SECONDS sonra ya da kullanıcı kaydedilince/silinince
+    düşer. CHECK_REVOKE_TOKEN açıksa parola hash'i gerektiği için önbellek kullanılmaz.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None or api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+
+        key = user_cache_key(user_id)
+        values = cache.get(key)
+        if values is None:
+            user = super().get_user(validated_token)
+            cache.set(key, {name: getattr(user, name) for name in AUTH_USER_FIELDS}, settings.USER_CACHE_SECONDS)
+            return user
+
+        user = auth_user(values)
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return user
@@ -0,0 +1,141 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import IntegrityError, transaction
+from rest_framework.validators import UniqueValidator
+
+from .hashers import hash_passwords
+from .models import CustomUser
+from .serializers import UserSerializer
+
+logger = logging.getLogger(__name__)
+
+# `manage.py import_users` için parola hash'leme süreç sayısı; PBKDF2 CPU'ya bağlı olduğundan
+# varsayılan çekirdek sayısıdır
+IMPORT_WORKERS = int(os.getenv('USERS_IMPORT_WORKERS', os.cpu_count() or 1))
+# API yolunda gunicorn worker'ı başına havuz boyutu. Her worker kendi havuzunu açtığından
+# sunucudaki süreç sayısı worker sayısıyla çarpılır; büyük içe aktarımlar komutla yapılmalı.
+BULK_IMPORT_WORKERS = int(os.getenv('USERS_BULK_IMPORT_WORKERS', '1'))
+# Tek bulk_create ile yazılan satır sayısı
+IMPORT_CHUNK_SIZE = int(os.getenv('USERS_IMPORT_CHUNK_SIZE', '1000'))
+# Havuza tek görevde gönderilen parola sayısı (IPC maliyetini dağıtır)
+HASH_BATCH_SIZE = int(os.getenv('USERS_IMPORT_HASH_BATCH', '50'))
+
+# API üzerinden kullanılan, worker süreci başına tek havuz (ilk içe aktarımda BULK_IMPORT_WORKERS
+# süreçle oluşturulur)
+_pool = None
+
+
+class BulkUserSerializer(UserSerializer):
+    """Satır doğrulaması; benzersizlik kontrolleri satır başına değil parça başına tek sorguyla yapılır."""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in ('username', 'email'):
+            fields[name].validators = [
+                validator for validator in fields[name].validators if not isinstance(validator, UniqueValidator)
+            ]
+        return fields
+
+
+def make_pool(workers=IMPORT_WORKERS):
+    # fork yerine spawn: gunicorn iş parçacıklarının ve açık veritabanı bağlantılarının kopyalanmasını önler
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def shared_pool():
+    global _pool
+    if _pool is None:
+        _pool = make_pool(BULK_IMPORT_WORKERS)
+    return _pool
+
+
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def validate_rows(rows, errors):
+    """Geçerli satırları (indeks, veri) olarak döndürür; hataları `errors` listesine ekler."""
+    valid = []
+    for index, row in enumerate(rows):
+        serializer = BulkUserSerializer(data=row)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append({'index': index, 'errors': serializer.errors})
+    return valid
+
+
+def drop_conflicts(valid, errors, chunk_size):
+    """Aynı dosyada tekrar eden ya da veritabanında zaten olan kullanıcı adı/e-postaları eler."""
+    seen_usernames, seen_emails, accepted = set(), set(), []
+    for chunk in chunked(valid, chunk_size):
+        usernames = {data['username'] for _, data in chunk}
+        emails = {data['email'] for _, data in chunk}
+        taken_usernames = set(CustomUser.objects.filter(username__in=usernames).values_list('username', flat=True))
+        taken_emails = set(CustomUser.objects.filter(email__in=emails).values_list('email', flat=True))
+        for index, data in chunk:
+            row_errors = {}
+            if data['username'] in taken_usernames or data['username'] in seen_usernames:
+                row_errors['username'] = ['Bu kullanıcı adı zaten kayıtlı.']
+            if data['email'] in taken_emails or data['email'] in seen_emails:
+                row_errors['email'] = ['Bu e-posta zaten kayıtlı.']
+            seen_usernames.add(data['username'])
+            seen_emails.add(data['email'])
+            if row_errors:
+                errors.append({'index': index, 'errors': row_errors})
+            else:
+                accepted.append((index, data))
+    return accepted
+
+
+def insert_chunk(chunk, errors):
+    """Parçayı tek INSERT ile yazar. Kontrolden sonra araya başka bir kayıt girdiyse (yarış)
+    parça satır satır yeniden denenir ve yalnızca çakışan satırlar hata olarak raporlanır."""
+    users = [CustomUser(**data) for _, data in chunk]
+    try:
+        with transaction.atomic():
+            CustomUser.objects.bulk_create(users)
+        return len(users)
+    except IntegrityError:
+        pass
+
+    created = 0
+    for (index, _), user in zip(chunk, users):
+        user.pk = None
+        try:
+            with transaction.atomic():
+                user.save(force_insert=True)
+            created += 1
+        except IntegrityError as e:
+            errors.append({'index': index, 'errors': {'non_field_errors': [str(e)]}})
+    return created
+
+
+def import_users(rows, pool=None, chunk_size=IMPORT_CHUNK_SIZE):
+    """Kullanıcıları toplu oluşturur; hatalı satırlar işlemi durdurmaz.
+
+    Parolalar işlem havuzunda hash'lenir. Havuz sonraki parçaları hash'lerken hazır olan parça
+    bulk_create ile yazılır. Dönen rapor: {'created', 'failed', 'errors': [{'index', 'errors'}]};
+    `index` satırın girişteki sırasıdır (0'dan başlar).
+    """
+    pool = pool or shared_pool()
+    errors = []
+    accepted = drop_conflicts(validate_rows(rows, errors), errors, chunk_size)
+
+    passwords = [data.pop('password') for _, data in accepted]
+    hashed = (password for batch in pool.map(hash_passwords, chunked(passwords, HASH_BATCH_SIZE))
+              for password in batch)
+
+    created = 0
+    for chunk in chunked(accepted, chunk_size):
+        for _, data in chunk:
+            data['password'] = next(hashed)
+        created += insert_chunk(chunk, errors)
+
+    errors.sort(key=lambda error: error['index'])
+    logger.info('Toplu kullanıcı içe aktarımı tamamlandı', extra={'created_count': created, 'failed_count': len(errors)})
+    return {'created': created, 'failed': len(errors), 'errors': errors}
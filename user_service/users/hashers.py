@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, make_password
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """Tur sayısı PASSWORD_HASH_ITERATIONS ile ayarlanan PBKDF2-SHA256.
+
+    Algoritma adı aynı kaldığı için mevcut "pbkdf2_sha256$..." parolaları doğrulanmaya devam eder.
+    """
+    iterations = settings.PASSWORD_HASH_ITERATIONS
+
+
+def hash_passwords(passwords):
+    """Toplu içe aktarımda işlem havuzunda çalışır (users/bulk.py).
+
+    Bu modül model içe aktarmadığı için `spawn` ile başlayan süreçlerde django.setup() gerekmez.
+    """
+    return [make_password(password) for password in passwords]
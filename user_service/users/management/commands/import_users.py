@@ -0,0 +1,51 @@
+import csv
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.bulk import IMPORT_CHUNK_SIZE, IMPORT_WORKERS, import_users, make_pool
+
+
+def read_rows(path):
+    """.csv (başlık satırlı), .json (liste) ya da NDJSON (satır başına bir nesne) dosyası okur."""
+    with open(path, encoding='utf-8', newline='') as f:
+        if path.endswith('.csv'):
+            return list(csv.DictReader(f))
+        if path.endswith('.json'):
+            return json.load(f)
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class Command(BaseCommand):
+    help = 'Kullanıcıları dosyadan toplu içe aktarır; parolalar işlem havuzunda hash\'lenir.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='.csv, .json ya da .ndjson dosyası')
+        parser.add_argument('--workers', type=int, default=IMPORT_WORKERS, help='Parola hash\'leme süreç sayısı')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE, help='bulk_create parça boyutu')
+        parser.add_argument('--errors', help='Hatalı satırların NDJSON olarak yazılacağı dosya')
+
+    def handle(self, *args, **options):
+        try:
+            rows = read_rows(options['path'])
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Dosya okunamadı: {e}')
+
+        started = time.perf_counter()
+        with make_pool(options['workers']) as pool:
+            report = import_users(rows, pool=pool, chunk_size=options['chunk_size'])
+        elapsed = time.perf_counter() - started
+
+        if options['errors']:
+            with open(options['errors'], 'w', encoding='utf-8') as f:
+                for error in report['errors']:
+                    f.write(json.dumps(error, ensure_ascii=False) + '\n')
+        else:
+            for error in report['errors'][:20]:
+                self.stderr.write(f"satır {error['index']}: {json.dumps(error['errors'], ensure_ascii=False)}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['created']} kullanıcı oluşturuldu, {report['failed']} satır hatalı "
+            f"({elapsed:.1f} s, {len(rows) / elapsed:.0f} satır/s, {options['workers']} süreç)"
+        ))
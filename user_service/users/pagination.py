@@ -0,0 +1,14 @@
+import os
+
+from rest_framework.pagination import CursorPagination
+
+# Sayfa boyutu REST_FRAMEWORK['PAGE_SIZE'] ile ayarlanır; istemci ?page_size= ile bu sınıra kadar büyütebilir
+MAX_PAGE_SIZE = int(os.getenv('USERS_MAX_PAGE_SIZE', '500'))
+
+
+class UserCursorPagination(CursorPagination):
+    """id üzerinde imleçli sayfalama: her sayfa `WHERE id > ? ORDER BY id LIMIT n` sorgusudur,
+    OFFSET kullanılmadığı için derin sayfalar da ilk sayfa kadar ucuzdur."""
+    ordering = 'id'
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
@@ -8,6 +8,13 @@ class UserSerializer(serializers.ModelSerializer):
         model = CustomUser
         fields = ['id', 'username', 'email', 'name', 'phone_number', 'password']
 
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # ?fields= projeksiyonu: yalnızca istenen alanlar serileştirilir
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     def create(self, validated_data):
         password = validated_data.pop('password')
         user = CustomUser(**validated_data)
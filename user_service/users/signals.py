@@ -0,0 +1,17 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import user_cache_key
+from .models import CustomUser
+
+
+def invalidate_users(user_ids):
+    """Sinyal üretmeyen toplu yazmalardan (QuerySet.update, bulk_update) sonra çağrılmalıdır."""
+    cache.delete_many([user_cache_key(user_id) for user_id in user_ids])
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_user(sender, instance, **kwargs):
+    invalidate_users([instance.pk])
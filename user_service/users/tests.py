@@ -1,3 +1,117 @@
-from django.test import TestCase
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from .bulk import import_users
+from .models import CustomUser
+from .views import export_lines
+
+# Testlerde PBKDF2 turları yerine hızlı bir hasher yeterli
+FAST_HASHERS = override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+
+
+def user_row(number, **overrides):
+    row = {
+        'username': f'user{number}',
+        'email': f'user{number}@example.com',
+        'password': 'Parola123!',
+        'name': 'Ad Soyad',
+    }
+    row.update(overrides)
+    return row
+
+
+@FAST_HASHERS
+class ImportUsersTests(TestCase):
+    def setUp(self):
+        # Testlerde spawn süreçleri yerine iş parçacığı havuzu yeterli
+        self.pool = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.pool.shutdown)
+
+    def test_import_logs_summary_at_info(self):
+        # INFO seviyesinde özet logu yazılırken içe aktarım hata vermemeli
+        with self.assertLogs('users.bulk', 'INFO') as logs:
+            report = import_users([user_row(1), user_row(2)], pool=self.pool, chunk_size=1)
+
+        self.assertEqual(report, {'created': 2, 'failed': 0, 'errors': []})
+        self.assertEqual(logs.records[-1].created_count, 2)
+        self.assertEqual(logs.records[-1].failed_count, 0)
+
+    def test_import_reports_invalid_and_duplicate_rows(self):
+        CustomUser.objects.create_user(username='user1', email='taken@example.com', password='x')
+        rows = [user_row(1), user_row(2), user_row(3, email='user2@example.com'), user_row(4, email='bozuk')]
+
+        report = import_users(rows, pool=self.pool)
+
+        self.assertEqual(report['created'], 1)
+        self.assertEqual([error['index'] for error in report['errors']], [0, 2, 3])
+        user = CustomUser.objects.get(username='user2')
+        self.assertTrue(user.check_password('Parola123!'))
+
+
+@FAST_HASHERS
+class TokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(username='ayse', email='ayse@example.com', password='x')
+
+    def get_me(self, token):
+        return self.client.get('/api/users/me/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_access_token_is_accepted(self):
+        token = AccessToken.for_user(self.user)
+        self.assertEqual(self.get_me(token).json()['username'], 'ayse')
+        # İkinci istek kullanıcıyı önbellekten alır
+        self.assertEqual(self.get_me(token).status_code, 200)
+
+    def test_refresh_token_is_rejected(self):
+        self.assertEqual(self.get_me(RefreshToken.for_user(self.user)).status_code, 401)
+
+    def test_expired_token_is_rejected(self):
+        token = AccessToken.for_user(self.user)
+        token.set_exp(lifetime=-timedelta(minutes=1))
+        self.assertEqual(self.get_me(token).status_code, 401)
+
+    def test_deactivated_user_is_rejected_from_cache(self):
+        token = AccessToken.for_user(self.user)
+        self.assertEqual(self.get_me(token).status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get_me(token).status_code, 401)
+
+
+@FAST_HASHERS
+class ExportTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = CustomUser.objects.create_superuser(username='admin', email='admin@example.com', password='x')
+        for number in range(5):
+            CustomUser.objects.create_user(username=f'user{number}', email=f'user{number}@example.com', password='x')
+
+    def export(self, user, params=''):
+        self.client.force_authenticate(user)
+        return self.client.get(f'/api/users/export/{params}')
+
+    def test_export_streams_ndjson(self):
+        response = self.export(self.admin, '?fields=email')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row['id'] for row in rows], sorted(CustomUser.objects.values_list('id', flat=True)))
+        self.assertEqual(set(rows[0]), {'id', 'email'})
+
+    def test_export_lines_reads_in_chunks(self):
+        chunks = list(export_lines(CustomUser.objects.all(), ['id', 'username'], chunk_size=2))
+
+        self.assertEqual(len(chunks), 3)
+        usernames = [json.loads(line)['username'] for chunk in chunks for line in chunk.splitlines()]
+        self.assertEqual(usernames, list(CustomUser.objects.order_by('id').values_list('username', flat=True)))
+
+    def test_export_requires_admin(self):
+        self.assertEqual(self.export(CustomUser.objects.get(username='user0')).status_code, 403)
@@ -1,17 +1,94 @@
+import json
+import os
+
+from django.http import StreamingHttpResponse
 from django.shortcuts import render
 from rest_framework import viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from .bulk import import_users
 from .models import CustomUser
 from .serializers import UserSerializer
 
-# Create your views here.
+# Yanıtta dönen (write_only olmayan) alanlar. Serializer alan adları model alanlarıyla
+# aynı olduğu için .only() ile doğrudan kullanılır; parola hash'i gibi kolonlar okunmaz.
+USER_FIELDS = [name for name, field in UserSerializer().fields.items() if not field.write_only]
+
+# NDJSON dışa aktarımında tek sorguda okunan satır sayısı
+EXPORT_CHUNK_SIZE = int(os.getenv('USERS_EXPORT_CHUNK_SIZE', '2000'))
+# API ile tek istekte içe aktarılabilecek en fazla kullanıcı; daha büyük dosyalar için
+# `manage.py import_users` kullanılır (her satır bir PBKDF2 hesabı demektir)
+IMPORT_MAX_ROWS = int(os.getenv('USERS_IMPORT_MAX_ROWS', '1000'))
+
+
+def export_lines(queryset, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """Kullanıcıları id sırasıyla parça parça okuyup NDJSON satırları üretir.
+
+    Her parça `WHERE id > son_id ORDER BY id LIMIT n` sorgusudur; bellek kullanımı tablo
+    boyutundan bağımsızdır ve sunucu taraflı imleç gerekmez (PgBouncer ile de çalışır).
+    `fields` listesinin ilk elemanı id olmalıdır.
+    """
+    last_id = 0
+    while True:
+        rows = list(queryset.filter(id__gt=last_id).order_by('id').values_list(*fields)[:chunk_size])
+        if not rows:
+            return
+        yield ''.join(json.dumps(dict(zip(fields, row)), ensure_ascii=False) + '\n' for row in rows)
+        last_id = rows[-1][0]
+
 
 class UserViewSet(viewsets.ModelViewSet):
     queryset = CustomUser.objects.all()
     serializer_class = UserSerializer
 
-    @action(detail=False, methods=['get'], url_path='me')
+    def requested_fields(self):
+        """?fields=email,name projeksiyonu; id her zaman döner."""
+        fields = self.request.query_params.get('fields')
+        if not fields:
+            return USER_FIELDS
+        requested = [name.strip() for name in fields.split(',') if name.strip()]
+        unknown = [name for name in requested if name not in USER_FIELDS]
+        if unknown:
+            raise ValidationError({'fields': f"Bilinmeyen alan(lar): {', '.join(unknown)}"})
+        return list(dict.fromkeys(['id', *requested]))
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve', 'me'):
+            queryset = queryset.only(*self.requested_fields())
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action in ('list', 'retrieve', 'me'):
+            kwargs['fields'] = self.requested_fields()
+        return super().get_serializer(*args, **kwargs)
+
+    @action(detail=False, methods=['get'], url_path='me', permission_classes=[IsAuthenticated])
     def me(self, request):
-        serializer = self.get_serializer(request.user)
+        # request.user önbellekten gelen hafif bir kullanıcıdır; profil alanları tek sorguda okunur
+        serializer = self.get_serializer(self.get_queryset().get(pk=request.user.pk))
         return Response(serializer.data)
+
+    @action(detail=False, methods=['get'], url_path='export', permission_classes=[IsAdminUser])
+    def export(self, request):
+        """Tüm kullanıcılar, satır başına bir JSON nesnesi (application/x-ndjson).
+
+        Yanıt akıtılarak gönderilir; WSGI worker'larında (gunicorn.conf.py varsayılanı) bellek
+        sabit kalır. ASGI altında Django senkron üreticileri tamamen tüketerek gönderir.
+        """
+        lines = export_lines(CustomUser.objects.all(), self.requested_fields())
+        response = StreamingHttpResponse(lines, content_type='application/x-ndjson')
+        response['Content-Disposition'] = 'attachment; filename="users.ndjson"'
+        return response
+
+    @action(detail=False, methods=['post'], url_path='import', permission_classes=[IsAdminUser])
+    def bulk_import(self, request):
+        """Kullanıcı nesnelerinden oluşan bir JSON listesini toplu oluşturur; satır hataları raporlanır."""
+        rows = request.data
+        if not isinstance(rows, list):
+            raise ValidationError({'detail': 'Kullanıcı nesnelerinden oluşan bir liste bekleniyordu.'})
+        if len(rows) > IMPORT_MAX_ROWS:
+            raise ValidationError({'detail': f'Tek istekte en fazla {IMPORT_MAX_ROWS} kullanıcı içe aktarılabilir.'})
+        return Response(import_users(rows))